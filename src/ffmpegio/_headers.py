@@ -0,0 +1,856 @@
+"""pure-Python container header parsers for the basic probe functions
+
+The parsers read only the container headers of local WAV, FLAC, MP4/MOV,
+Matroska/WebM, and YUV4MPEG2 files via :py:mod:`mmap` and mimic ffprobe's
+JSON output (before numeric conversion) of the format and stream fields.
+
+A field is included only if its value is known to match ffprobe's. The
+value is None if ffprobe reports N/A for the field. A field which cannot be
+derived from the headers (e.g., ``pix_fmt`` of compressed video) is left
+out, so the caller falls back to ffprobe.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from fractions import Fraction
+from math import floor
+from typing import Any, Callable
+
+Info = dict[str, Any]  # {"format": {...}, "streams": [{...}, ...]}
+
+
+def _time(value: Fraction | float) -> str:
+    """format seconds as ffprobe does (rounded to microseconds)"""
+    return f"{floor(value * 1000000 + Fraction(1, 2)) / 1000000:f}"
+
+
+def _ratio(r: Fraction, sep: str = "/") -> str:
+    return f"{r.numerator}{sep}{r.denominator}"
+
+
+def _aspect_ratios(width: int, height: int, sar: Fraction) -> dict[str, str]:
+    return {
+        "sample_aspect_ratio": _ratio(sar, ":"),
+        "display_aspect_ratio": _ratio(sar * width / height, ":"),
+    }
+
+
+# WAVEFORMATEXTENSIBLE channel masks of FFmpeg's named channel layouts
+_channel_masks = {
+    0x4: "mono",
+    0x3: "stereo",
+    0xB: "2.1",
+    0x7: "3.0",
+    0x103: "3.0(back)",
+    0x107: "4.0",
+    0x33: "quad",
+    0x603: "quad(side)",
+    0xF: "3.1",
+    0x37: "5.0",
+    0x607: "5.0(side)",
+    0x10F: "4.1",
+    0x3F: "5.1",
+    0x60F: "5.1(side)",
+    0x63F: "7.1",
+}
+
+# default layouts of the decoders which assign the layout by the channel count
+_default_layouts = {1: "mono", 2: "stereo"}
+
+# sample formats of FFmpeg's native decoders of the compressed audio codecs
+_planar_float_codecs = {"aac", "ac3", "eac3", "mp3", "opus", "vorbis"}
+
+
+def _audio_fields(codec: str, sample_rate: int, channels: int) -> dict[str, Any]:
+    """common fields of a compressed audio stream"""
+    return {
+        "codec_name": codec,
+        "codec_type": "audio",
+        "sample_fmt": "fltp" if codec in _planar_float_codecs else ...,
+        "sample_rate": str(sample_rate),
+        "channels": str(channels),
+        "channel_layout": _default_layouts.get(channels, ...),
+    }
+
+
+def _finalize(info: Info) -> Info:
+    """add stream indices and drop the unknown fields (marked by ``...``)"""
+    for i, st in enumerate(info["streams"]):
+        st["index"] = str(i)
+    for d in (info["format"], *info["streams"]):
+        for k in [k for k, v in d.items() if v is ...]:
+            del d[k]
+    return info
+
+
+###############################################################################
+# WAV
+
+
+_wav_codecs = {
+    (1, 8): ("pcm_u8", "u8"),
+    (1, 16): ("pcm_s16le", "s16"),
+    (1, 24): ("pcm_s24le", "s32"),
+    (1, 32): ("pcm_s32le", "s32"),
+    (3, 32): ("pcm_f32le", "flt"),
+    (3, 64): ("pcm_f64le", "dbl"),
+    (6, 8): ("pcm_alaw", "s16"),
+    (7, 8): ("pcm_mulaw", "s16"),
+}
+
+
+def _parse_wav(m: mmap.mmap) -> Info | None:
+    size = len(m)
+    pos = 12
+    fmt = None
+    while pos + 8 <= size:
+        cid = m[pos : pos + 4]
+        (csize,) = struct.unpack_from("<I", m, pos + 4)
+        if cid == b"fmt ":
+            fmt = (pos + 8, csize)
+        elif cid == b"data":
+            break
+        pos += 8 + csize + (csize & 1)
+    else:
+        return None
+    if fmt is None:
+        return None
+
+    fpos, fsize = fmt
+    tag, channels, sample_rate, _, block_align, bits = struct.unpack_from(
+        "<HHIIHH", m, fpos
+    )
+    layout = None
+    if tag == 0xFFFE and fsize >= 40:
+        (mask,) = struct.unpack_from("<I", m, fpos + 20)
+        (tag,) = struct.unpack_from("<H", m, fpos + 24)
+        layout = _channel_masks.get(mask, ...)
+
+    try:
+        codec, sample_fmt = _wav_codecs[tag, bits]
+    except KeyError:
+        return None
+
+    data_size = struct.unpack_from("<I", m, pos + 4)[0]
+    if not (block_align and sample_rate) or pos + 8 + data_size > size:
+        return None  # streamed or truncated: FFmpeg estimates from the file size
+    nb_samples = data_size // block_align
+
+    return _finalize(
+        {
+            "format": {
+                "nb_streams": "1",
+                "format_name": "wav",
+                "start_time": None,
+                "duration": _time(Fraction(nb_samples, sample_rate)),
+            },
+            "streams": [
+                {
+                    "codec_name": codec,
+                    "codec_type": "audio",
+                    "sample_fmt": sample_fmt,
+                    "sample_rate": str(sample_rate),
+                    "channels": str(channels),
+                    "channel_layout": layout,
+                    "time_base": f"1/{sample_rate}",
+                    "start_pts": None,
+                    "duration_ts": str(nb_samples),
+                    "nb_frames": None,
+                }
+            ],
+        }
+    )
+
+
+###############################################################################
+# FLAC
+
+_flac_layouts = {1: "mono", 2: "stereo", 3: "3.0", 4: "quad", 5: "5.0", 6: "5.1"}
+
+
+def _parse_flac(m: mmap.mmap) -> Info | None:
+    pos = 4
+    streaminfo = None
+    while True:
+        header, length = m[pos], int.from_bytes(m[pos + 1 : pos + 4], "big")
+        btype = header & 0x7F
+        if btype == 0:
+            streaminfo = pos + 4
+        elif btype == 4 and b"WAVEFORMATEXTENSIBLE_CHANNEL_MASK" in m[
+            pos + 4 : pos + 4 + length
+        ].upper():
+            return None  # layout overridden by the vorbis comment
+        pos += 4 + length
+        if header & 0x80:
+            break
+    if streaminfo is None:
+        return None
+
+    # 20 bits sample rate, 3 bits channels-1, 5 bits bps-1, 36 bits total samples
+    (bits,) = struct.unpack_from(">Q", m, streaminfo + 10)
+    sample_rate = bits >> 44
+    channels = ((bits >> 41) & 0x7) + 1
+    bps = ((bits >> 36) & 0x1F) + 1
+    nb_samples = bits & 0xFFFFFFFFF
+    if not (nb_samples and sample_rate):
+        return None
+
+    return _finalize(
+        {
+            "format": {
+                "nb_streams": "1",
+                "format_name": "flac",
+                "start_time": _time(0),
+                "duration": _time(Fraction(nb_samples, sample_rate)),
+            },
+            "streams": [
+                {
+                    "codec_name": "flac",
+                    "codec_type": "audio",
+                    "sample_fmt": "s16" if bps <= 16 else "s32",
+                    "sample_rate": str(sample_rate),
+                    "channels": str(channels),
+                    "channel_layout": _flac_layouts.get(channels, ...),
+                    "time_base": f"1/{sample_rate}",
+                    "start_pts": "0",
+                    "duration_ts": str(nb_samples),
+                    "nb_frames": None,
+                }
+            ],
+        }
+    )
+
+
+###############################################################################
+# MP4/MOV
+
+_mp4_codecs = {
+    b"avc1": "h264",
+    b"avc3": "h264",
+    b"hvc1": "hevc",
+    b"hev1": "hevc",
+    b"av01": "av1",
+    b"vp09": "vp9",
+    b"apch": "prores",
+    b"apcn": "prores",
+    b"apcs": "prores",
+    b"apco": "prores",
+    b"ap4h": "prores",
+    b"Opus": "opus",
+    b"fLaC": "flac",
+    b"ac-3": "ac3",
+    b"ec-3": "eac3",
+    b"alac": "alac",
+}
+
+_mp4_object_types = {0x40: "aac", 0x66: "aac", 0x67: "aac", 0x68: "aac", 0x6B: "mp3"}
+
+_aac_sample_rates = (
+    96000,
+    88200,
+    64000,
+    48000,
+    44100,
+    32000,
+    24000,
+    22050,
+    16000,
+    12000,
+    11025,
+    8000,
+    7350,
+)
+
+
+def _boxes(m: mmap.mmap, start: int, end: int):
+    """iterate over (type, payload start, payload end) of the boxes in a range"""
+    pos = start
+    while pos + 8 <= end:
+        size, btype = struct.unpack_from(">I4s", m, pos)
+        hdr = 8
+        if size == 1:
+            (size,) = struct.unpack_from(">Q", m, pos + 8)
+            hdr = 16
+        elif size == 0:
+            size = end - pos
+        if size < hdr:
+            raise ValueError("invalid box size")
+        yield btype, pos + hdr, min(pos + size, end)
+        pos += size
+
+
+def _child(m: mmap.mmap, start: int, end: int, *path: bytes) -> tuple[int, int] | None:
+    """find the payload range of a descendant box"""
+    for name in path:
+        for btype, start, end in _boxes(m, start, end):
+            if btype == name:
+                break
+        else:
+            return None
+    return start, end
+
+
+def _full_box_times(m: mmap.mmap, pos: int) -> tuple[int, int]:
+    """timescale and duration of mvhd or mdhd box payload"""
+    if m[pos] == 1:
+        return struct.unpack_from(">IQ", m, pos + 20)
+    return struct.unpack_from(">II", m, pos + 12)
+
+
+def _descriptor(m: mmap.mmap, pos: int) -> tuple[int, int, int]:
+    """MPEG-4 descriptor tag, payload start and size"""
+    tag = m[pos]
+    size = 0
+    pos += 1
+    for _ in range(4):
+        b = m[pos]
+        pos += 1
+        size = (size << 7) | (b & 0x7F)
+        if not b & 0x80:
+            break
+    return tag, pos, size
+
+
+def _parse_esds(m: mmap.mmap, start: int) -> tuple[str | None, bytes]:
+    """object type and decoder specific info of an esds box"""
+    tag, pos, _ = _descriptor(m, start + 4)
+    if tag != 0x03:
+        return None, b""
+    flags = m[pos + 2]
+    pos += 3
+    if flags & 0x80:
+        pos += 2
+    if flags & 0x40:
+        pos += 1 + m[pos]
+    if flags & 0x20:
+        pos += 2
+    tag, pos, _ = _descriptor(m, pos)
+    if tag != 0x04:
+        return None, b""
+    codec = _mp4_object_types.get(m[pos], None)
+    tag, dpos, dsize = _descriptor(m, pos + 13)
+    return codec, m[dpos : dpos + dsize] if tag == 0x05 else b""
+
+
+def _aac_config(asc: bytes) -> tuple[int, int] | None:
+    """decoder's sample rate and channels from AudioSpecificConfig"""
+    if len(asc) < 2:
+        return None
+    aot = asc[0] >> 3
+    index = ((asc[0] & 0x7) << 1) | (asc[1] >> 7)
+    if aot in (5, 29, 31) or index >= len(_aac_sample_rates):
+        return None  # SBR/PS or escaped fields
+    return _aac_sample_rates[index], (asc[1] >> 3) & 0xF
+
+
+def _parse_mp4_audio(m: mmap.mmap, entry: int, end: int, fourcc: bytes, timescale):
+    version, channels, _, _, _, rate = struct.unpack_from(">8xH6xHHHHI", m, entry + 8)
+    if version:
+        return None  # QuickTime sound description v1/v2
+    sample_rate = rate >> 16
+
+    codec = _mp4_codecs.get(fourcc, None)
+    if fourcc == b"mp4a":
+        esds = _child(m, entry + 36, end, b"esds")
+        if esds is None:
+            return None
+        codec, asc = _parse_esds(m, esds[0])
+        if codec == "aac":
+            config = _aac_config(asc)
+            if config is None:
+                return None
+            sample_rate, channels = config
+    if codec is None or sample_rate != timescale or channels not in _default_layouts:
+        return None
+
+    return _audio_fields(codec, sample_rate, channels)
+
+
+def _parse_mp4_video(m: mmap.mmap, entry: int, end: int, fourcc: bytes):
+    codec = _mp4_codecs.get(fourcc, None)
+    if codec is None:
+        return None
+    width, height = struct.unpack_from(">HH", m, entry + 32)
+    st = {
+        "codec_name": codec,
+        "codec_type": "video",
+        "width": str(width),
+        "height": str(height),
+    }
+    pasp = _child(m, entry + 86, end, b"pasp")
+    if pasp:
+        h, v = struct.unpack_from(">II", m, pasp[0])
+        if h and v and width and height:
+            st.update(_aspect_ratios(width, height, Fraction(h, v)))
+    return st
+
+
+def _parse_mp4(m: mmap.mmap) -> Info | None:
+    moov = _child(m, 0, len(m), b"moov")
+    if moov is None:
+        return None
+    mvhd = _child(m, *moov, b"mvhd")
+    if mvhd is None:
+        return None
+    movie_timescale, _ = _full_box_times(m, mvhd[0])
+
+    streams = []
+    durations = []
+    for btype, tstart, tend in _boxes(m, *moov):
+        if btype != b"trak":
+            continue
+        mdia = _child(m, tstart, tend, b"mdia")
+        hdlr = mdia and _child(m, *mdia, b"hdlr")
+        mdhd = mdia and _child(m, *mdia, b"mdhd")
+        stbl = mdia and _child(m, *mdia, b"minf", b"stbl")
+        stsd = stbl and _child(m, *stbl, b"stsd")
+        if not (hdlr and mdhd and stsd):
+            return None
+        handler = m[hdlr[0] + 8 : hdlr[0] + 12]
+        timescale, _ = _full_box_times(m, mdhd[0])
+
+        (nentries,) = struct.unpack_from(">I", m, stsd[0] + 4)
+        if nentries != 1 or not timescale:
+            return None
+        entry = stsd[0] + 8
+        esize, fourcc = struct.unpack_from(">I4s", m, entry)
+        eend = min(entry + esize, stsd[1])
+        if handler == b"vide":
+            st = _parse_mp4_video(m, entry, eend, fourcc)
+        elif handler == b"soun":
+            st = _parse_mp4_audio(m, entry, eend, fourcc, timescale)
+        else:
+            return None  # data/subtitle tracks
+        if st is None:
+            return None
+
+        stsz = _child(m, *stbl, b"stsz")
+        stts = _child(m, *stbl, b"stts")
+        if stsz is None or stts is None:
+            return None
+        nb_frames = struct.unpack_from(">I", m, stsz[0] + 8)[0]
+        (nstts,) = struct.unpack_from(">I", m, stts[0] + 4)
+        deltas = [
+            struct.unpack_from(">II", m, stts[0] + 8 + 8 * i) for i in range(nstts)
+        ]
+        total = sum(n * d for n, d in deltas)
+
+        # presentation offset of the first sample
+        ctts = _child(m, *stbl, b"ctts")
+        offset = 0
+        if ctts and struct.unpack_from(">I", m, ctts[0] + 4)[0]:
+            (offset,) = struct.unpack_from(">i" if m[ctts[0]] else ">I", m, ctts[0] + 12)
+
+        # timing after the edit list is applied
+        elst = _child(m, tstart, tend, b"edts", b"elst")
+        if elst:
+            version = m[elst[0]]
+            (nedits,) = struct.unpack_from(">I", m, elst[0] + 4)
+            seg_duration, media_time = struct.unpack_from(
+                ">Qq" if version else ">Ii", m, elst[0] + 8
+            )
+        else:
+            nedits, seg_duration, media_time = 1, None, 0
+        if nedits != 1 or media_time < 0 or (offset and offset != media_time):
+            # empty or multiple edits or a gap before the first frame
+            st["start_pts"] = st["duration_ts"] = ...
+        else:
+            st["start_pts"] = "0"
+            duration = total + offset - media_time
+            if seg_duration:
+                seg_duration = round(
+                    Fraction(seg_duration * timescale, movie_timescale)
+                )
+                duration = min(duration, seg_duration)
+            st["duration_ts"] = str(duration)
+            durations.append(Fraction(duration, timescale))
+
+        st["time_base"] = f"1/{timescale}"
+        st["nb_frames"] = str(nb_frames)
+        if handler == b"vide":
+            st["avg_frame_rate"] = (
+                _ratio(Fraction(nb_frames * timescale, total)) if total else "0/0"
+            )
+            st["r_frame_rate"] = (
+                _ratio(Fraction(timescale, deltas[0][1]))
+                if nstts == 1 and deltas[0][1]
+                else ...
+            )
+        streams.append(st)
+
+    fmt = {
+        "nb_streams": str(len(streams)),
+        "format_name": "mov,mp4,m4a,3gp,3g2,mj2",
+        # longest stream
+        "duration": _time(max(durations)) if len(durations) == len(streams) else ...,
+        "start_time": (
+            _time(0) if streams and all(s["start_pts"] == "0" for s in streams) else ...
+        ),
+    }
+    return _finalize({"format": fmt, "streams": streams})
+
+
+def faststart(data: memoryview) -> tuple[bytes, int, int] | None:
+    """relocate the trailing moov box of an MP4/MOV data ahead of its media data
+
+    :param data: media data in bytes
+    :return: tuple of the new head (the boxes before the media data followed by
+             the moov box with its chunk offsets adjusted), the start, and the
+             end of the media data in `data`, or None if not an MP4/MOV data
+             with the moov box at the end
+
+    The relocated data is ``head + data[start:end]``, which can be read without
+    seeking.
+    """
+
+    try:
+        if not (len(data) >= 12 and _is_mp4(data)):
+            return None
+        # top-level box types and their start positions
+        types = []
+        starts = [0]
+        for btype, _, bend in _boxes(data, 0, len(data)):
+            types.append(btype)
+            starts.append(bend)
+        if b"moov" not in types or b"mdat" not in types:
+            return None
+        i_moov = types.index(b"moov")
+        i_mdat = types.index(b"mdat")
+        if i_moov < i_mdat or i_moov != len(types) - 1:
+            return None  # already fast-started or trailing boxes after moov
+
+        start = starts[i_mdat]
+        end = starts[i_moov]
+        moov = bytearray(data[end:])
+        shift = len(moov)
+
+        # shift the chunk offsets by the size of the moov box
+        for btype, tstart, tend in _boxes(moov, 8, len(moov)):
+            if btype != b"trak":
+                continue
+            stbl = _child(moov, tstart, tend, b"mdia", b"minf", b"stbl")
+            for name, fmt in ((b"stco", ">I"), (b"co64", ">Q")):
+                box = stbl and _child(moov, *stbl, name)
+                if box is None:
+                    continue
+                (n,) = struct.unpack_from(">I", moov, box[0] + 4)
+                size = struct.calcsize(fmt)
+                for pos in range(box[0] + 8, box[0] + 8 + n * size, size):
+                    (offset,) = struct.unpack_from(fmt, moov, pos)
+                    if offset >= start:
+                        offset += shift
+                        if offset >= 1 << (8 * size):
+                            return None  # needs co64 upgrade
+                        struct.pack_into(fmt, moov, pos, offset)
+    except (ValueError, IndexError, struct.error):
+        return None
+
+    return bytes(data[:start]) + bytes(moov), start, end
+
+
+###############################################################################
+# Matroska/WebM
+
+_mkv_codecs = {
+    "V_MPEG4/ISO/AVC": "h264",
+    "V_MPEGH/ISO/HEVC": "hevc",
+    "V_VP8": "vp8",
+    "V_VP9": "vp9",
+    "V_AV1": "av1",
+    "A_AAC": "aac",
+    "A_OPUS": "opus",
+    "A_VORBIS": "vorbis",
+    "A_FLAC": "flac",
+    "A_MPEG/L3": "mp3",
+    "A_AC3": "ac3",
+    "A_EAC3": "eac3",
+}
+
+
+def _vint(m: mmap.mmap, pos: int, keep_marker: bool) -> tuple[int, int]:
+    """EBML variable-length integer and its length"""
+    b = m[pos]
+    length = 1
+    mask = 0x80
+    while length <= 8 and not b & mask:
+        length += 1
+        mask >>= 1
+    if length > 8:
+        raise ValueError("invalid EBML variable-length integer")
+    value = b if keep_marker else b & (mask - 1)
+    for i in range(1, length):
+        value = (value << 8) | m[pos + i]
+    return value, length
+
+
+def _elements(m: mmap.mmap, start: int, end: int):
+    """iterate over (id, payload start, payload end) of the EBML elements in a range"""
+    pos = start
+    while pos < end:
+        eid, n = _vint(m, pos, True)
+        size, k = _vint(m, pos + n, False)
+        pos += n + k
+        unknown = size == (1 << (7 * k)) - 1
+        stop = end if unknown else pos + size
+        yield eid, pos, min(stop, end)
+        pos = stop
+
+
+def _uint(m: mmap.mmap, start: int, end: int) -> int:
+    return int.from_bytes(m[start:end], "big")
+
+
+def _float(m: mmap.mmap, start: int, end: int) -> float:
+    return struct.unpack(">f" if end - start == 4 else ">d", m[start:end])[0]
+
+
+def _parse_mkv_track(m: mmap.mmap, start: int, end: int) -> dict[str, Any] | None:
+    track = {}
+    for eid, s, e in _elements(m, start, end):
+        if eid == 0xD7:
+            track["number"] = _uint(m, s, e)
+        elif eid == 0x83:
+            track["type"] = _uint(m, s, e)
+        elif eid == 0x86:
+            track["codec"] = m[s:e].rstrip(b"\0").decode("ascii", "replace")
+        elif eid == 0x23E383:
+            track["default_duration"] = _uint(m, s, e)
+        elif eid == 0x56AA:
+            track["codec_delay"] = _uint(m, s, e)
+        elif eid == 0x63A2:
+            track["codec_private"] = m[s:e]
+        elif eid in (0xE0, 0xE1):
+            for eid2, s2, e2 in _elements(m, s, e):
+                if eid2 in (0xB0, 0xBA, 0x54B0, 0x54BA, 0x54B2, 0x9F):
+                    track[eid2] = _uint(m, s2, e2)
+                elif eid2 == 0xB5:
+                    track[eid2] = _float(m, s2, e2)
+
+    codec = _mkv_codecs.get(track.get("codec", None), None)
+    if codec is None:
+        return None
+
+    if track.get("type", None) == 1:
+        width, height = track.get(0xB0, 0), track.get(0xBA, 0)
+        st = {
+            "codec_name": codec,
+            "codec_type": "video",
+            "width": str(width),
+            "height": str(height),
+        }
+        dw, dh = track.get(0x54B0, None), track.get(0x54BA, None)
+        if dw and dh and width and height and not track.get(0x54B2, 0):
+            st.update(_aspect_ratios(width, height, Fraction(dw * height, dh * width)))
+        dd = track.get("default_duration", None)
+        if dd:
+            # FFmpeg reduces the rate to a denominator within 30000
+            rate = Fraction(1000000000, dd).limit_denominator(30000)
+            st["avg_frame_rate"] = st["r_frame_rate"] = _ratio(rate)
+    elif track.get("type", None) == 2:
+        sample_rate = track.get(0xB5, 8000.0)
+        channels = track.get(0x9F, 1)
+        if codec == "aac":
+            config = _aac_config(track.get("codec_private", b""))
+            if config is None:
+                return None
+            sample_rate, channels = config
+        if sample_rate != int(sample_rate):
+            return None
+        st = _audio_fields(codec, int(sample_rate), channels)
+        if codec == "opus" and st["sample_rate"] != "48000":
+            return None  # decoded at 48 kHz
+    else:
+        return None
+
+    st["number"] = track.get("number", None)
+    st["codec_delay"] = track.get("codec_delay", 0)
+    st["duration_ts"] = None
+    st["nb_frames"] = None
+    return st
+
+
+def _first_blocks(m: mmap.mmap, start: int, end: int, ntracks: int) -> dict[int, int]:
+    """timestamps (in TimecodeScale) of the first blocks of the tracks in a cluster"""
+    cluster_time = 0
+    times = {}
+    for eid, s, e in _elements(m, start, end):
+        if eid == 0xE7:
+            cluster_time = _uint(m, s, e)
+        elif eid in (0xA3, 0xA0):
+            if eid == 0xA0:  # BlockGroup
+                for eid2, s2, e2 in _elements(m, s, e):
+                    if eid2 == 0xA1:
+                        s = s2
+                        break
+                else:
+                    continue
+            number, n = _vint(m, s, False)
+            (rel,) = struct.unpack_from(">h", m, s + n)
+            times.setdefault(number, cluster_time + rel)
+            if len(times) == ntracks:
+                break
+    return times
+
+
+def _parse_mkv(m: mmap.mmap) -> Info | None:
+    size = len(m)
+    elements = _elements(m, 0, size)
+    eid, s, e = next(elements)
+    doctype = None
+    for eid2, s2, e2 in _elements(m, s, e):
+        if eid2 == 0x4282:
+            doctype = m[s2:e2].rstrip(b"\0")
+    if doctype not in (b"matroska", b"webm"):
+        return None
+    eid, s, e = next(elements)
+    if eid != 0x18538067:
+        return None
+
+    scale = 1000000
+    duration = None
+    streams = None
+    start_times = {}
+    for eid, s2, e2 in _elements(m, s, e):
+        if eid == 0x1549A966:  # Info
+            for eid3, s3, e3 in _elements(m, s2, e2):
+                if eid3 == 0x2AD7B1:
+                    scale = _uint(m, s3, e3)
+                elif eid3 == 0x4489:
+                    duration = _float(m, s3, e3)
+        elif eid == 0x1654AE6B:  # Tracks
+            streams = []
+            for eid3, s3, e3 in _elements(m, s2, e2):
+                if eid3 == 0xAE:
+                    st = _parse_mkv_track(m, s3, e3)
+                    if st is None:
+                        return None
+                    streams.append(st)
+        elif eid == 0x1F43B675:  # Cluster
+            if streams is not None:
+                start_times = _first_blocks(m, s2, e2, len(streams))
+            break
+
+    if not streams:
+        return None
+
+    time_base = Fraction(scale, 1000000000)
+    starts = []
+    for st in streams:
+        st["time_base"] = _ratio(time_base)
+        t = start_times.get(st.pop("number"), None)
+        # FFmpeg shifts the timestamps by the codec delay (rounded to time base)
+        delay = floor(Fraction(st.pop("codec_delay"), scale) + Fraction(1, 2))
+        if t is None:
+            st["start_pts"] = ...
+        else:
+            st["start_pts"] = str(t - delay)
+            starts.append(t - delay)
+
+    fmt = {
+        "nb_streams": str(len(streams)),
+        "format_name": "matroska,webm",
+        # FFmpeg truncates the duration to microseconds
+        "duration": ... if duration is None else f"{int(duration * scale / 1000) / 1000000:f}",
+        "start_time": (
+            _time(min(starts) * time_base) if len(starts) == len(streams) else ...
+        ),
+    }
+    return _finalize({"format": fmt, "streams": streams})
+
+
+###############################################################################
+# YUV4MPEG2
+
+_y4m_pix_fmts = {
+    "420jpeg": ("yuv420p", 1.5),
+    "420paldv": ("yuv420p", 1.5),
+    "420mpeg2": ("yuv420p", 1.5),
+    "420": ("yuv420p", 1.5),
+    "422": ("yuv422p", 2),
+    "444": ("yuv444p", 3),
+    "mono": ("gray", 1),
+    "420p10": ("yuv420p10le", 3),
+    "422p10": ("yuv422p10le", 4),
+    "444p10": ("yuv444p10le", 6),
+}
+
+
+def _parse_y4m(m: mmap.mmap) -> Info | None:
+    end = m.find(b"\n", 0, 1024)
+    if end < 0:
+        return None
+    params = {p[:1]: p[1:].decode("ascii") for p in m[10:end].split()}
+    width, height = int(params[b"W"]), int(params[b"H"])
+    num, den = (int(v) for v in params[b"F"].split(":"))
+    pix_fmt, bpp = _y4m_pix_fmts.get(params.get(b"C", "420jpeg"), (None, 0))
+    if pix_fmt is None or bpp == 1.5 and (width % 2 or height % 2):
+        return None
+
+    # fixed-size frames if the first frame header has no parameters
+    frame_size = int(width * height * bpp)
+    if m[end + 1 : end + 7] != b"FRAME\n":
+        return None
+    nb_frames = (len(m) - end - 1) // (frame_size + 6)
+
+    st = {
+        "codec_name": "rawvideo",
+        "codec_type": "video",
+        "width": str(width),
+        "height": str(height),
+        "pix_fmt": pix_fmt,
+        "avg_frame_rate": f"{num}/{den}",
+        "r_frame_rate": f"{num}/{den}",
+        "time_base": _ratio(Fraction(den, num)),
+        "start_pts": "0",
+        "duration_ts": str(nb_frames),
+        "nb_frames": None,
+    }
+    sar = params.get(b"A", "0:0").split(":")
+    if int(sar[0]) and int(sar[1]):
+        st.update(_aspect_ratios(width, height, Fraction(int(sar[0]), int(sar[1]))))
+
+    fmt = {
+        "nb_streams": "1",
+        "format_name": "yuv4mpegpipe",
+        "start_time": _time(0),
+        "duration": _time(Fraction(nb_frames * den, num)),
+    }
+    return _finalize({"format": fmt, "streams": [st]})
+
+
+###############################################################################
+
+
+def _is_mp4(m: mmap.mmap) -> bool:
+    return m[4:8] in (b"ftyp", b"moov", b"mdat", b"free", b"wide", b"skip")
+
+
+_parsers: list[tuple[Callable[[mmap.mmap], bool], Callable[[mmap.mmap], Info]]] = [
+    (lambda m: m[:4] == b"RIFF" and m[8:12] == b"WAVE", _parse_wav),
+    (lambda m: m[:4] == b"fLaC", _parse_flac),
+    (_is_mp4, _parse_mp4),
+    (lambda m: m[:4] == b"\x1a\x45\xdf\xa3", _parse_mkv),
+    (lambda m: m[:10] == b"YUV4MPEG2 ", _parse_y4m),
+]
+
+
+def probe(path: str | os.PathLike) -> Info | None:
+    """parse the container headers of a local media file
+
+    :param path: path of the media file
+    :return: ffprobe-like format and stream fields in str (or None if N/A),
+             or None if the container is not supported or the headers
+             cannot be parsed
+    """
+
+    try:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            for sniff, parse in _parsers:
+                if len(m) >= 12 and sniff(m):
+                    return parse(m)
+    except (OSError, ValueError, IndexError, KeyError, struct.error, StopIteration):
+        pass
+    return None
@@ -20,6 +20,9 @@ except:
 
     prod = lambda seq: reduce(mul, seq, 1)
 
+DEFAULT_PROBESIZE = 5000000
+"""FFmpeg's default ``probesize`` input option value in bytes"""
+
 
 def is_non_str_sequence(
     value: Any, class_excluded: type | tuple[type, ...] = str
@@ -2,15 +2,35 @@
 
 from __future__ import annotations
 
+import json
 import logging
+import os
+import pickle
+import stat
 from abc import ABC
-from collections import namedtuple
+from collections import deque, namedtuple
+from hashlib import blake2b, sha256
+from threading import Thread, get_ident
+from time import time_ns
 
 logger = logging.getLogger("ffmpegio")
 
 import re
-from json import loads
-from typing import Any, List, NamedTuple, Optional, Tuple
+from array import array
+from codecs import getincrementaldecoder
+from io import TextIOWrapper
+from math import log10
+from os import PathLike
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 from . import configure
 from . import ffmpegprocess as fp
@@ -18,12 +38,16 @@ from .errors import FFmpegError
 from .filtergraph import Chain, Filter, Graph, as_filtergraph
 from .filtergraph.utils import compose_filter
 from .path import devnull
+from .threading import LoggerThread
 
 try:
     from typing import Literal
 except ImportError:
     from typing_extensions import Literal
 
+if TYPE_CHECKING:
+    from numpy import ndarray
+
 
 def loudnorm(
     url,
@@ -105,20 +129,28 @@ def loudnorm(
         universal_newlines=True,
     ).stderr
 
-    stats = loads(log[re.search(r"\[Parsed_loudnorm_2 @ .+\] \n", log).end() :])
+    m = re.search(r"\[Parsed_loudnorm_\d+ @ .+\] \n", log)
+    if m is None:
+        raise FFmpegError(log, False)
+    stats = json.JSONDecoder().raw_decode(log, m.end())[0]
 
     if return_stats:
         return stats
 
-    for k, src in (
-        ("measured_i", "input_i"),
-        ("measured_lra", "input_lra"),
-        ("measured_tp", "input_tp"),
-        ("measured_thresh", "input_thresh"),
-    ):
-        loudnorm_opts[k] = float(stats[src])
+    return compose_filter("loudnorm", **loudnorm_opts, **_loudnorm_measured(stats))
 
-    return compose_filter("loudnorm", loudnorm_opts)
+
+def _loudnorm_measured(stats: dict[str, str]) -> dict[str, float]:
+    """convert loudnorm first-pass stats to second-pass ``measured_*`` options"""
+    return {
+        k: float(stats[src])
+        for k, src in (
+            ("measured_i", "input_i"),
+            ("measured_lra", "input_lra"),
+            ("measured_tp", "input_tp"),
+            ("measured_thresh", "input_thresh"),
+        )
+    }
 
 
 class MetadataLogger(ABC):
@@ -139,11 +171,62 @@ class MetadataLogger(ABC):
         """stream specifier for reference input url only if applicable (default: None)"""
         return None
 
+    @property
+    def config(self) -> dict[str, Any]:
+        """logger settings, which determine its output for a given input
+
+        Used as a part of :py:class:`AnalysisCache` keys. Override it if a
+        logger has settings other than its filter options.
+        """
+        return {"options": self.options, "ref_in": self.ref_in}
+
     @property
     def output(self) -> NamedTuple:
         """log output as a namedtuple"""
         ...
 
+    @property
+    def output_arrays(self) -> dict[str, ndarray]:
+        """columnar log output as NumPy arrays (requires NumPy)
+
+        The per-frame metrics are keyed by the names of their columnar buffers
+        (see :py:meth:`_column`): ``'time'`` for the timestamps and the metric
+        names (suffixed by ``'.<channel>'`` for per-channel audio metrics).
+        The frames are in the order they were logged, which may not be sorted
+        by time unlike :py:attr:`output`. Each array is a snapshot of the
+        column, so the logger can keep logging while the arrays are in use.
+        Loggers, which only log intervals, return an empty dict.
+        """
+
+        import numpy as np
+
+        return {k: np.array(v) for k, v in self.__dict__.get("_columns", {}).items()}
+
+    def _column(self, name: str, typecode: Literal["d", "q"] = "d") -> array:
+        """get a columnar buffer, created on the first call
+
+        :param name: column name
+        :param typecode: array typecode of a new column: ``'d'`` for float64 or
+                         ``'q'`` for int64, defaults to ``'d'``
+        :return: growable typed array
+
+        The columns hold the logged values unboxed (8 bytes per value) and
+        they are exposed as NumPy arrays by :py:attr:`output_arrays`.
+        """
+        columns = self.__dict__.setdefault("_columns", {})
+        try:
+            return columns[name]
+        except KeyError:
+            col = columns[name] = array(typecode)
+            return col
+
+    def _log_time(self, t: float | int):
+        """append a timestamp to the ``'time'`` column
+
+        The column is int64 if the timestamps are in frames or pts.
+        """
+        self._column("time", "d" if isinstance(t, float) else "q").append(t)
+
     def log(self, t: float | int, name: str, key: Optional[str], value: str):
         """log the metadata
 
@@ -164,49 +247,173 @@ class MetadataLogger(ABC):
         """
         ...
 
+    def log_frame(
+        self, t: float | int, metadata: list[tuple[str, Optional[str], str]]
+    ):
+        """log all the metadata of a frame
 
-def run(
-    url,
-    *loggers,
-    references=None,
-    time_units=None,
-    start_at_zero=False,
-    progress=None,
-    show_log=None,
-    **input_options,
-):
-    """analyze media streams' frames with FFmpeg filters
+        :param t: timestamps in seconds, frames, or pts
+        :type t: float|int
+        :param metadata: name, secondary key (or None), and value of each
+                         metadata entry of the frame, which begins with one of
+                         the class' ``meta_names`` entry
+        :type metadata: list[tuple[str, str|None, str]]
+
+        This method is called by :py:func:`analyze.run` (with the default
+        ``parser='bulk'``) once per frame. By default, it calls :py:meth:`log`
+        for each entry. Loggers with many metadata entries per frame may
+        override it to store the entries in bulk.
+        """
+        for entry in metadata:
+            try:
+                self.log(t, *entry)
+            except:
+                pass  # ignore unknown metadata
 
-    :param url: video file url
-    :type url: str
-    :param \*loggers: class object with the metadata logging interface
-    :type \*loggers: tuple[MetadataLogger]
-    :param references: reference input urls or pairs of url and input option
-                       dict, defaults to None
-    :type references: seq of str or seq of (str, dict), optional
-    :param ss: start time to process, defaults to None
-    :type ss: int, float, str, optional
-    :param t: duration of data to process, defaults to None
-    :type t: int, float, str, optional
-    :param to: stop processing at this time (ignored if t is also specified), defaults to None
-    :type to: int, float, str, optional
-    :param time_units: units of detected time stamps (not for ss, t, or to), defaults to None ('seconds')
-    :type time_units: 'seconds', 'frames', 'pts', optional
-    :param start_at_zero: ignore start time, defaults to False
-    :type start_at_zero: bool, optional
-    :param progress: progress callback function, defaults to None
-    :type progress: callable object, optional
-    :param show_log: True to show FFmpeg log messages on the console,
-                     defaults to None (no show/capture)
-    :type show_log: bool, optional
-    :param \**options: FFmpeg (primary) input options.
-    :type \**options: dict, optional
-    :returns: logger objects passed in
-    :rtype: tuple[MetadataLogger]
 
+class _KeyedColumnsLogger(MetadataLogger):
+    """Base class for the loggers storing the values of each metadata key in its
+    own float64 column
+
+    The first metadata key of a frame marks the frame time. Subclasses name the
+    columns by implementing :py:meth:`_column_name`.
+    """
+
+    def __init__(self, **options):
+        self.options = options
+        self._first = None  # first metadata key of a frame
+        self._keys = {}  # metadata key -> column (None if ignored)
+
+    def _column_name(self, key: str) -> str | None:
+        """name the column of a metadata key (None to ignore the key)"""
+        raise NotImplementedError
+
+    def _key_column(self, key: str) -> array | None:
+        """resolve the column of a new metadata key"""
+        name = self._column_name(key)
+        col = self._keys[key] = None if name is None else self._column(name)
+        return col
+
+    def log(self, t: float | int, name: str, key: Optional[str], value: str):
+        """log the metadata
+
+        :param t: timestamps in seconds, frames, or pts
+        :type t: float|int
+        :param name: one of the class' meta_names
+        :type name: str
+        :param key: secondary metadata key if found
+        :type key: str | None
+        :param value: metadata value
+        :type value: str
+
+        This method is called by :py:func:`analyze.run` if a metadata line begins
+        with one of the class' ``meta_names`` entry. The `log` method shall store
+        the metadata info in a private storage property of the class so they can be
+        returned later by the `output` property.
+
+        """
+
+        try:
+            col = self._keys[key]
+        except KeyError:
+            col = self._key_column(key)
+        if col is None:
+            return
+
+        if not self._first:
+            self._first = key
+        if key == self._first:
+            self._log_time(t)
+
+        col.append(float(value))
+
+    def log_frame(
+        self, t: float | int, metadata: list[tuple[str, Optional[str], str]]
+    ):
+        """log all the metadata of a frame
+
+        :param t: timestamps in seconds, frames, or pts
+        :type t: float|int
+        :param metadata: name, secondary key, and value of each metadata entry
+        :type metadata: list[tuple[str, str|None, str]]
+        """
+
+        keys = self._keys
+        for _, key, value in metadata:
+            try:
+                col = keys[key]
+            except KeyError:
+                col = self._key_column(key)
+            if col is None:
+                continue
+
+            if not self._first:
+                self._first = key
+            if key == self._first:
+                self._log_time(t)
+
+            col.append(float(value))
+
+
+analysis_profiles = {
+    "full": {},
+    "proxy": {"width": 320},
+    "fast": {"width": 320, "fps": 5},
+    "keyframes": {"width": 320, "keyframes_only": True},
+}
+"""predefined reduced-cost analysis profiles (see :py:func:`run`)"""
 
+
+def _resolve_profile(profile) -> tuple[list[Filter], dict[str, Any], bool]:
+    """resolve analysis profile to its video prefilters and input options
+
+    :return: prefilters, input options, and True if the profile drops frames
     """
 
+    if profile is None:
+        return [], {}, False
+
+    if isinstance(profile, str):
+        try:
+            profile = analysis_profiles[profile]
+        except KeyError:
+            raise ValueError(
+                f'analysis_profile "{profile}" is invalid. Must be one of {tuple(analysis_profiles)} or a dict'
+            )
+
+    unknown = set(profile) - {"width", "fps", "pix_fmt", "keyframes_only"}
+    if unknown:
+        raise ValueError(f"Unknown analysis_profile key(s): {sorted(unknown)}")
+
+    width = profile.get("width", None)
+    fps = profile.get("fps", None)
+    pix_fmt = profile.get("pix_fmt", None)
+    keyframes_only = profile.get("keyframes_only", False)
+
+    filters = []
+    if fps:
+        # select (unlike fps) keeps the original timestamps and time base. 1-ms
+        # slack absorbs the rounding of the timestamps
+        dt = 1 / float(fps) - 1e-3
+        filters.append(
+            Filter("select", f"isnan(prev_selected_t)+gte(t-prev_selected_t,{dt})")
+        )
+    if width:
+        # never upscale, keep the aspect ratio with an even height
+        filters.append(Filter("scale", f"min({int(width)},iw)", -2))
+    if pix_fmt:
+        filters.append(Filter("format", pix_fmt))
+
+    input_options = {"skip_frame:v": "nokey"} if keyframes_only else {}
+
+    return filters, input_options, bool(fps or keyframes_only)
+
+
+def _compose_args(
+    url, loggers, references, start_at_zero, input_options, analysis_profile=None
+) -> dict[str, Any]:
+    """compose FFmpeg arguments to print the frame metadata of the loggers to stdout"""
+
     if not len(loggers):
         raise ValueError("At least one logger object must be present.")
 
@@ -215,12 +422,13 @@ def run(
     elif isinstance(references, str):
         references = [references]
 
-    try:
-        tunits = ("frames", "pts", "seconds").index(time_units) + 1 if time_units else 3
-    except:
+    prefilters, profile_options, _ = _resolve_profile(analysis_profile)
+    if prefilters and any(l.ref_in for l in loggers if l.media_type == "video"):
         raise ValueError(
-            f'time_units "{time_units}" is invalid. Must be one of ("frames", "pts", "seconds")'
+            "analysis_profile cannot be used with the video loggers with reference inputs."
         )
+    if profile_options:
+        input_options = {**input_options, **profile_options}
 
     fchains = {"video": Chain([]), "audio": Chain([])}
     for l in loggers:
@@ -241,6 +449,11 @@ def run(
         fchains[l.media_type] = c + f
 
     if len(fchains["video"]):
+        if prefilters:
+            # no reference inputs, so the video filtergraph is a simple chain
+            vf = fchains["video"]
+            vf = vf if isinstance(vf, Chain) else [vf]
+            fchains["video"] = Chain([*prefilters, *vf])
         fchains["video"] >>= Filter("metadata", "print", file="-")
 
     if len(fchains["audio"]):
@@ -276,48 +489,899 @@ def run(
     configure.add_url(ffmpeg_args, "output", devnull, oopts)
     ffmpeg_args["global_options"] = gopts
 
+    return ffmpeg_args
+
+
+_re_frame = re.compile(r"frame:(\d+)\s+pts:(\d+)\s+pts_time:(\d+(?:\.\d+)?)")
+_re_metadata = re.compile(r"lavfi\.(.+?)(?:\.(.+?))?=(.+)")
+
+
+def _parse_regex(
+    stdout, to_time, tunits, meta_logger
+) -> Iterator[Tuple[float | int, dict[str, str]]]:
+    """parse metadata=print output line by line with regular expressions"""
+
+    t = None  # time of the current frame (None if no frame or invalid)
+    meta = {}
+    for line in TextIOWrapper(stdout, "utf-8"):
+        if line.startswith("frame:"):
+            if t is not None:
+                yield t, meta
+            m = _re_frame.match(line)
+            t = m and to_time(m[tunits])
+            meta = {}
+            continue
+
+        if t is None:
+            continue
+
+        mm = _re_metadata.search(line.rstrip("\n"))
+        if mm is None:
+            continue
+
+        name, key, value = mm.groups()
+        meta[name if key is None else f"{name}.{key}"] = value
+
+        try:
+            meta_logger[name].log(t, *mm.groups())
+        except:
+            pass  # ignore unknown metadata
+
+    if t is not None:
+        yield t, meta
+
+
+def _parse_bulk(
+    stdout, to_time, tunits, meta_logger
+) -> Iterator[Tuple[float | int, dict[str, str]]]:
+    """decode metadata=print output block by block
+
+    Each distinct metadata tag is matched against the regular expression only
+    once, and the entries of each frame are passed to their loggers at once
+    via :py:meth:`MetadataLogger.log_frame`.
+    """
+
+    # metadata tag -> (yielded key, logger, name, key) or None if invalid
+    routes = {}
+
+    decoder = getincrementaldecoder("utf-8")()
+    tail = ""  # incomplete last line of the previous block
+
+    t = None  # time of the current frame (None if no frame or invalid)
+    meta = {}
+    entries = {}  # logger -> list of (name, key, value)
+
+    while True:
+        block = stdout.read1(65536)
+        lines = (tail + decoder.decode(block, not block)).replace("\r", "").split("\n")
+        tail = lines.pop() if block else ""
+
+        for line in lines:
+            if line.startswith("frame:"):
+                if t is not None:
+                    for l, e in entries.items():
+                        l.log_frame(t, e)
+                    yield t, meta
+                m = _re_frame.match(line)
+                t = m and to_time(m[tunits])
+                meta = {}
+                entries = {}
+                continue
+
+            if t is None:
+                continue
+
+            tag, _, value = line.partition("=")
+            if not value:
+                continue
+
+            try:
+                route = routes[tag]
+            except KeyError:
+                mm = _re_metadata.search(line)
+                route = routes[tag] = mm and (
+                    mm[1] if mm[2] is None else f"{mm[1]}.{mm[2]}",
+                    meta_logger.get(mm[1]),
+                    mm[1],
+                    mm[2],
+                )
+            if route is None:
+                continue
+
+            field, l, name, key = route
+            meta[field] = value
+            if l is not None:
+                try:
+                    entries[l].append((name, key, value))
+                except KeyError:
+                    entries[l] = [(name, key, value)]
+
+        if not block:
+            break
+
+    if t is not None:
+        for l, e in entries.items():
+            l.log_frame(t, e)
+        yield t, meta
+
+
+def iter_run(
+    url,
+    *loggers,
+    references=None,
+    time_units=None,
+    start_at_zero=False,
+    progress=None,
+    show_log=None,
+    parser="bulk",
+    analysis_profile: str | dict[str, Any] | None = None,
+    **input_options,
+) -> Iterator[Tuple[float | int, dict[str, str]]]:
+    """analyze media streams' frames with FFmpeg filters and yield the frame metadata live
+
+    :param url: video file url
+    :type url: str
+    :param \*loggers: class object with the metadata logging interface
+    :type \*loggers: tuple[MetadataLogger]
+    :param references: reference input urls or pairs of url and input option
+                       dict, defaults to None
+    :type references: seq of str or seq of (str, dict), optional
+    :param time_units: units of detected time stamps (not for ss, t, or to), defaults to None ('seconds')
+    :type time_units: 'seconds', 'frames', 'pts', optional
+    :param start_at_zero: ignore start time, defaults to False
+    :type start_at_zero: bool, optional
+    :param progress: progress callback function, defaults to None
+    :type progress: callable object, optional
+    :param show_log: True to show FFmpeg log messages on the console,
+                     defaults to None (no show/capture)
+    :type show_log: bool, optional
+    :param parser: FFmpeg metadata output parser: ``'bulk'`` to decode the
+                   output in blocks or ``'regex'`` to match each output line
+                   against regular expressions, defaults to ``'bulk'``
+    :type parser: 'bulk', 'regex', optional
+    :param analysis_profile: reduced-cost video analysis profile: one of the
+                             :py:data:`analysis_profiles` names or a dict
+                             of ``width``, ``fps``, ``pix_fmt``, and
+                             ``keyframes_only``, defaults to None (analyze
+                             every frame at full resolution)
+    :type analysis_profile: 'full', 'proxy', 'fast', 'keyframes', dict, optional
+    :param \**options: FFmpeg (primary) input options.
+    :type \**options: dict, optional
+    :yield: a pair of the frame time and a dict of its metadata values, keyed
+            by the metadata name without the ``'lavfi.'`` prefix (e.g.,
+            ``'scd.mafd'``)
+    :rtype: tuple[float|int, dict[str, str]]
+
+    FFmpeg's metadata output is parsed as FFmpeg produces it, and the metadata
+    entries of each frame are dispatched to their loggers (via
+    :py:meth:`MetadataLogger.log_frame`) before the frame is yielded. Hence,
+    the loggers are up to date with the yielded frames at any time, and the
+    memory usage does not grow with the media duration. Closing the generator
+    early terminates FFmpeg.
+
+    See :py:func:`run` for the supported input options.
+    """
+
+    try:
+        tunits = ("frames", "pts", "seconds").index(time_units) + 1 if time_units else 3
+    except:
+        raise ValueError(
+            f'time_units "{time_units}" is invalid. Must be one of ("frames", "pts", "seconds")'
+        )
+    to_time = (int, int, float)[tunits - 1]
+
+    try:
+        parse = {"bulk": _parse_bulk, "regex": _parse_regex}[parser]
+    except KeyError:
+        raise ValueError(f'parser "{parser}" is invalid. Must be "bulk" or "regex"')
+
+    if tunits == 1 and _resolve_profile(analysis_profile)[2]:
+        raise ValueError(
+            'time_units="frames" cannot be used with an analysis_profile which drops frames.'
+        )
+
+    ffmpeg_args = _compose_args(
+        url, loggers, references, start_at_zero, input_options, analysis_profile
+    )
+
+    # link a logger to each metadata field names (trailing "lavifi.")
+    meta_logger = {name: l for l in loggers for name in l.meta_names}
+
     # run FFmpeg
-    out = fp.run(
-        ffmpeg_args,
-        progress=progress,
-        capture_log=True,
-        universal_newlines=True,
-        stdout=fp.PIPE,
-        stderr=fp.PIPE if show_log else None,
+    proc = fp.Popen(
+        ffmpeg_args, progress=progress, capture_log=True, stdout=fp.PIPE
     )
 
+    # drain stderr in the background to keep FFmpeg from blocking
+    log_thread = LoggerThread(proc.stderr, bool(show_log))
+    log_thread.start()
+
+    exhausted = False
+    try:
+        yield from parse(proc.stdout, to_time, tunits, meta_logger)
+        exhausted = True
+    finally:
+        if not exhausted and proc.poll() is None:
+            proc.stdout.close()  # generator closed early
+            proc.terminate()
+        proc.wait()  # FFmpeg may still be finishing after closing stdout
+        log_thread.join()
+
     # if FFmpeg terminated abnormally, return error
-    if out.returncode:
-        if show_log:
-            print(out.stderr)
-        raise FFmpegError(out.stderr, show_log)
+    if proc.returncode:
+        raise FFmpegError(log_thread.logs, show_log)
+
+
+def iter_frames(
+    url,
+    *loggers,
+    pix_fmt: str = "rgb24",
+    width: int | None = None,
+    time_units=None,
+    start_at_zero=False,
+    progress=None,
+    show_log=None,
+    parser="bulk",
+    analysis_profile: str | dict[str, Any] | None = None,
+    **input_options,
+) -> Iterator[Tuple[float | int, dict[str, str], Any]]:
+    """analyze video frames with FFmpeg filters and yield the frames with their metadata
+
+    :param url: video file url
+    :type url: str
+    :param \*loggers: video loggers without reference inputs
+    :type \*loggers: tuple[MetadataLogger]
+    :param pix_fmt: pixel format of the yielded frames, defaults to ``'rgb24'``
+    :type pix_fmt: str, optional
+    :param width: width of the yielded frames in pixels (the height is scaled
+                  to keep the aspect ratio), defaults to None (analyzed size)
+    :type width: int, optional
+    :param time_units: units of detected time stamps (not for ss, t, or to), defaults to None ('seconds')
+    :type time_units: 'seconds', 'frames', 'pts', optional
+    :param start_at_zero: ignore start time, defaults to False
+    :type start_at_zero: bool, optional
+    :param progress: progress callback function, defaults to None
+    :type progress: callable object, optional
+    :param show_log: True to show FFmpeg log messages on the console,
+                     defaults to None (no show/capture)
+    :type show_log: bool, optional
+    :param parser: FFmpeg metadata output parser, defaults to ``'bulk'``
+    :type parser: 'bulk', 'regex', optional
+    :param analysis_profile: reduced-cost video analysis profile, defaults to
+                             None (see :py:func:`iter_run`)
+    :type analysis_profile: str, dict, optional
+    :param \**options: FFmpeg input options.
+    :type \**options: dict, optional
+    :yield: a tuple of the frame time, a dict of its metadata values, and the
+            frame data, created by ``bytes_to_video`` plugin hook
+    :rtype: tuple[float|int, dict[str, str], object]
+
+    The video stream is decoded only once: FFmpeg passes each frame through
+    the loggers' filters, prints its metadata to a named pipe, and then
+    outputs the (optionally downscaled) raw frame to stdout. Every frame is
+    yielded (with an empty metadata dict if no logger reported on it), and its
+    metadata entries are dispatched to the loggers before it is yielded.
+
+    The metadata are printed unbuffered (``direct=1``), so each frame is held
+    only until its metadata arrive. The frames and the metadata are paired in
+    their output order, which match one-to-one as no frame is dropped after
+    the metadata are printed. Closing the generator early terminates FFmpeg.
+    """
+
+    if any(l.media_type != "video" or l.ref_in for l in loggers):
+        raise ValueError(
+            "iter_frames() only supports the video loggers without reference inputs."
+        )
+
+    try:
+        tunits = ("frames", "pts", "seconds").index(time_units) + 1 if time_units else 3
+    except:
+        raise ValueError(
+            f'time_units "{time_units}" is invalid. Must be one of ("frames", "pts", "seconds")'
+        )
+    to_time = (int, int, float)[tunits - 1]
+
+    try:
+        parse = {"bulk": _parse_bulk, "regex": _parse_regex}[parser]
+    except KeyError:
+        raise ValueError(f'parser "{parser}" is invalid. Must be "bulk" or "regex"')
+
+    prefilters, profile_options, drops_frames = _resolve_profile(analysis_profile)
+    if tunits == 1 and drops_frames:
+        raise ValueError(
+            'time_units="frames" cannot be used with an analysis_profile which drops frames.'
+        )
+
+    postfilters = [] if width is None else [Filter("scale", int(width), -2)]
+
+    # the loggers pass the frames through as is: resolve the raw frame format
+    # with only the resizing filters
+    options = {"pix_fmt": pix_fmt}
+    if prefilters or postfilters:
+        options["vf"] = Chain([*prefilters, *postfilters])
+    args, _, output_info = configure.init_media_read(
+        [(url, {**input_options, **profile_options})], ["0:V:0"], options, None, True
+    )
+    info = output_info[0]
+    dtype, shape, _ = info["raw_info"]
+    nbytes = info["item_size"]
+    bytes2data = info["bytes2data"]
+
+    # tag every frame so metadata=print reports all of them
+    pipe = configure.NamedPipe("r")
+    args["outputs"][0][1]["vf"] = Chain(
+        [
+            *prefilters,
+            *(l.filter for l in loggers),
+            Filter("metadata", "add", "lavfi.ffmpegio.frame", 1),
+            Filter("metadata", "print", file=pipe.path, direct=1),
+            *postfilters,
+        ]
+    )
+    args["outputs"][0][1]["fps_mode"] = "passthrough"  # one output per frame
+    configure.assign_output_url(args, 0, "pipe:1")
+    gopts = args["global_options"]
+    gopts["copyts"] = fp.FLAG
+    if start_at_zero:
+        gopts["start_at_zero"] = fp.FLAG
 
-    # link a logger to each metadata field names (trailing "lavifi.")
     meta_logger = {name: l for l in loggers for name in l.meta_names}
+    metadata = deque()  # parsed (time, meta) pairs, not yet paired with frames
+    errors = []
 
-    # stdout analysis
-    re_metadata = re.compile(r"lavfi\.(.+?)(?:\.(.+?))?=(.+)")
-    for m in re.finditer(
-        r"frame:(\d+)\s+pts:(\d+)\s+pts_time:(\d+(?:\.\d+)?)\s*\n(.+?)(?=\nframe:|$)",
-        out.stdout,
-        re.DOTALL,
-    ):
-        logger.debug(f"analyze::run: {m[0]}")
+    def parse_metadata():
+        try:
+            for t, meta in parse(pipe.wait(), to_time, tunits, meta_logger):
+                meta.pop("ffmpegio.frame", None)
+                metadata.append((t, meta))
+        except Exception as e:
+            errors.append(e)
+
+    proc = fp.Popen(args, progress=progress, capture_log=True, stdout=fp.PIPE)
+    log_thread = LoggerThread(proc.stderr, bool(show_log))
+    log_thread.start()
+    meta_thread = Thread(target=parse_metadata, daemon=True)
+    meta_thread.start()
+
+    frames = deque()  # frames waiting for their metadata
+    exhausted = False
+    try:
+        while True:
+            b = proc.stdout.read(nbytes)
+            if len(b) < nbytes:
+                break
+            frames.append(b)
+            while frames and metadata:
+                b = frames.popleft()
+                data = bytes2data(b=b, dtype=dtype, shape=shape, squeeze=True)
+                yield (*metadata.popleft(), data)
+
+        # FFmpeg flushes the rest of the metadata as it exits
+        proc.wait()
+        meta_thread.join()
+        if errors:
+            raise errors[0]
+        while frames and metadata:
+            b = frames.popleft()
+            data = bytes2data(b=b, dtype=dtype, shape=shape, squeeze=True)
+            yield (*metadata.popleft(), data)
+        exhausted = True
+    finally:
+        if not exhausted and proc.poll() is None:
+            proc.stdout.close()  # generator closed early
+            proc.terminate()
+        proc.wait()
+        if not pipe:
+            # FFmpeg never opened the pipe, release the waiting thread
+            with open(pipe.path, "wb"):
+                pass
+        meta_thread.join()
+        pipe.close()
+        log_thread.join()
 
-        # logged time
-        t = (int, int, float)[tunits - 1](m[tunits])
+    if proc.returncode:
+        raise FFmpegError(log_thread.logs, show_log)
 
-        # log each meta data
-        for mm in re_metadata.finditer(m[4]):
-            try:
-                meta_logger[mm[1]].log(t, *mm.groups())
-            except:
-                pass  # ignore unknown metadata
+
+def run(
+    url,
+    *loggers,
+    references=None,
+    time_units=None,
+    start_at_zero=False,
+    progress=None,
+    show_log=None,
+    parser="bulk",
+    analysis_profile: str | dict[str, Any] | None = None,
+    cache: AnalysisCache | None = None,
+    **input_options,
+):
+    """analyze media streams' frames with FFmpeg filters
+
+    :param url: video file url
+    :type url: str
+    :param \*loggers: class object with the metadata logging interface
+    :type \*loggers: tuple[MetadataLogger]
+    :param references: reference input urls or pairs of url and input option
+                       dict, defaults to None
+    :type references: seq of str or seq of (str, dict), optional
+    :param ss: start time to process, defaults to None
+    :type ss: int, float, str, optional
+    :param t: duration of data to process, defaults to None
+    :type t: int, float, str, optional
+    :param to: stop processing at this time (ignored if t is also specified), defaults to None
+    :type to: int, float, str, optional
+    :param time_units: units of detected time stamps (not for ss, t, or to), defaults to None ('seconds')
+    :type time_units: 'seconds', 'frames', 'pts', optional
+    :param start_at_zero: ignore start time, defaults to False
+    :type start_at_zero: bool, optional
+    :param progress: progress callback function, defaults to None
+    :type progress: callable object, optional
+    :param show_log: True to show FFmpeg log messages on the console,
+                     defaults to None (no show/capture)
+    :type show_log: bool, optional
+    :param parser: FFmpeg metadata output parser: ``'bulk'`` to decode the
+                   output in blocks or ``'regex'`` to match each output line
+                   against regular expressions, defaults to ``'bulk'``
+    :type parser: 'bulk', 'regex', optional
+    :param analysis_profile: reduced-cost video analysis profile: one of the
+                             :py:data:`analysis_profiles` names or a dict
+                             of ``width``, ``fps``, ``pix_fmt``, and
+                             ``keyframes_only``, defaults to None (analyze
+                             every frame at full resolution)
+    :type analysis_profile: 'full', 'proxy', 'fast', 'keyframes', dict, optional
+    :param \**options: FFmpeg (primary) input options.
+    :type \**options: dict, optional
+    :param cache: analysis cache to reuse the results of the previous calls
+                  with the same input file and settings, defaults to None
+    :type cache: AnalysisCache, optional
+    :returns: logger objects passed in
+    :rtype: tuple[MetadataLogger]
+
+    The metadata are parsed and logged incrementally as FFmpeg outputs them
+    (see :py:func:`iter_run`).
+
+    ``analysis_profile`` trades the accuracy of the video loggers for speed by
+    inserting ``select`` (``fps``), ``scale`` (``width``, never upscaled), and
+    ``format`` (``pix_fmt``) filters ahead of them, and by decoding only the
+    keyframes (``-skip_frame:v nokey``) if ``keyframes_only=True``. The frame
+    timestamps are retained, so the ``'seconds'`` and ``'pts'`` time units
+    are unaffected, but ``'frames'`` cannot be used if frames are dropped.
+    :py:class:`BBox` positions are reported in the scaled resolution. The
+    audio loggers always analyze the full stream.
+    """
+
+    key = (
+        None
+        if cache is None
+        else cache.key(
+            url,
+            loggers,
+            references,
+            time_units,
+            start_at_zero,
+            input_options,
+            analysis_profile,
+        )
+    )
+    if key and cache.load(key, loggers):
+        return loggers
+
+    for _ in iter_run(
+        url,
+        *loggers,
+        references=references,
+        time_units=time_units,
+        start_at_zero=start_at_zero,
+        progress=progress,
+        show_log=show_log,
+        parser=parser,
+        analysis_profile=analysis_profile,
+        **input_options,
+    ):
+        pass
+
+    if key:
+        cache.store(key, loggers)
 
     # return the loggers as convenience
     return loggers
 
 
+quality_metrics = ("psnr", "ssim", "vmaf")
+"""quality metrics supported by :py:func:`score_quality` (``'vmaf'`` requires
+FFmpeg built with libvmaf)"""
+
+
+class QualityScores(NamedTuple):
+    """quality scores of an encode, returned by :py:func:`score_quality`"""
+
+    url: str  #: url of the encode
+    frames: dict[str, ndarray]  #: per-frame scores keyed by score name
+    aggregate: dict[str, float]  #: mean of the per-frame scores
+    error: Exception | None  #: exception if the encode failed to be scored
+
+
+_re_stats_entry = re.compile(r"(\w+):(\S+)")
+
+
+def _parse_quality_stats(metric: str, path: str) -> dict[str, ndarray]:
+    """parse a stats file of psnr, ssim, or libvmaf filter to per-frame scores"""
+
+    import numpy as np
+
+    if metric == "vmaf":
+        # csv log: one row per frame with the trailing comma
+        with open(path) as f:
+            header = f.readline().rstrip(",\n").split(",")
+            data = np.loadtxt(f, delimiter=",", usecols=header.index("vmaf"), ndmin=1)
+        return {"vmaf": data}
+
+    # psnr: "n:1 mse_avg:64.70 mse_y:78.11 ... psnr_avg:30.02 psnr_y:29.20 ..."
+    # ssim: "n:1 Y:0.899293 U:0.952432 V:0.970949 All:0.920092 (10.974094)"
+    columns = {}
+    with open(path) as f:
+        for line in f:
+            for key, value in _re_stats_entry.findall(line):
+                if key == "n":
+                    continue
+                if metric == "ssim":
+                    name = "ssim" if key == "All" else f"ssim.{key.lower()}"
+                else:
+                    name, _, comp = key.partition("_")
+                    if name not in ("mse", "psnr"):
+                        continue  # e.g., max_* (output_max=1)
+                    if comp != "avg":
+                        name = f"{name}.{comp}"
+                columns.setdefault(name, []).append(float(value))
+    return {k: np.array(v) for k, v in columns.items()}
+
+
+def _score_batch(
+    reference, encodes, metrics, size, threads, show_log, input_options
+) -> list[dict[str, ndarray]]:
+    """score a batch of encodes against one reference decode in one FFmpeg run"""
+
+    from tempfile import TemporaryDirectory
+
+    nm = len(metrics)
+    w, h = size
+
+    with TemporaryDirectory() as tmpdir:
+        refs = "".join(f"[r{i}_{j}]" for i in range(len(encodes)) for j in range(nm))
+        chains = [f"[0:v:0]setpts=PTS-STARTPTS,split={len(encodes) * nm}{refs}"]
+        maps = []
+        paths = []
+        for i in range(len(encodes)):
+            # upscale the encode to the reference size
+            dists = "".join(f"[d{i}_{j}]" for j in range(nm))
+            scale = Filter("scale", w, h)
+            chains.append(f"[{i + 1}:v:0]setpts=PTS-STARTPTS,{scale},split={nm}{dists}")
+            for j, metric in enumerate(metrics):
+                path = os.path.join(tmpdir, f"{i}_{metric}.log")
+                if metric == "vmaf":
+                    f = Filter(
+                        "libvmaf", log_path=path, log_fmt="csv", n_threads=threads
+                    )
+                else:
+                    f = Filter(metric, stats_file=path)
+                # main (distorted) input first, reference second
+                chains.append(f"[d{i}_{j}][r{i}_{j}]{f}[q{i}_{j}]")
+                maps.append(f"[q{i}_{j}]")
+                paths.append(path)
+
+        args = configure.empty()
+        input_options = {"threads": threads, **input_options}
+        for url in (reference, *encodes):
+            configure.add_url(args, "input", url, input_options)
+        configure.add_url(args, "output", devnull, {"f": "null", "map": maps})
+        args["global_options"] = {
+            "filter_complex": ";".join(chains),
+            "filter_complex_threads": threads,
+        }
+
+        out = fp.run(args, capture_log=True, universal_newlines=True)
+        if out.returncode:
+            raise FFmpegError(out.stderr, show_log)
+
+        scores = [{} for _ in encodes]
+        for k, path in enumerate(paths):
+            i, j = divmod(k, nm)
+            scores[i].update(_parse_quality_stats(metrics[j], path))
+        return scores
+
+
+def score_quality(
+    reference,
+    encodes: Sequence,
+    metrics: Sequence[Literal["psnr", "ssim", "vmaf"]] | None = None,
+    *,
+    batch_size: int | None = None,
+    cores: int | None = None,
+    show_log=None,
+    **input_options,
+) -> list[QualityScores]:
+    """score the quality of multiple encodes (e.g., a bitrate ladder) against
+    their reference video
+
+    :param reference: url of the reference (source) video
+    :param encodes: urls of the encoded videos
+    :param metrics: quality metrics to compute, defaults to None (``'psnr'``,
+                    ``'ssim'``, and ``'vmaf'`` if FFmpeg has libvmaf)
+    :param batch_size: maximum number of encodes scored per FFmpeg run,
+                       defaults to None (all encodes in one run)
+    :param cores: number of CPU cores to use, defaults to None (all CPUs)
+    :param show_log: True to show FFmpeg log messages on the console,
+                     defaults to None (no show/capture)
+    :param \\**input_options: FFmpeg input options, applied to all the inputs
+                             (e.g., ``t`` to score only the beginning)
+    :return: scores of the encodes in the order of ``encodes``
+
+    The reference video is decoded once per FFmpeg run and ``split`` to the
+    metric filters of all the encodes in the run. The encodes are upscaled to
+    the reference frame size, and both the reference and the encodes start at
+    zero timestamps. The encodes are divided into batches of ``batch_size``
+    encodes, and up to ``cores`` batches run concurrently. The cores are
+    shared evenly among the concurrent runs via FFmpeg's decoder and filter
+    threads.
+
+    The per-frame scores are NumPy arrays (NumPy required), keyed by
+    ``'psnr'``, ``'mse'``, and ``'ssim'`` for the averages over the color
+    components, ``'psnr.y'``, ``'mse.y'``, ``'ssim.y'``, etc. for each
+    component, and ``'vmaf'``. The aggregate scores are the means of the
+    per-frame scores. If an FFmpeg run fails, all the encodes in the batch
+    report the exception in the ``error`` field and their scores are empty.
+    """
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    from . import caps, probe
+
+    has_vmaf = "libvmaf" in caps.filters()
+    if metrics is None:
+        metrics = [m for m in quality_metrics if m != "vmaf" or has_vmaf]
+    elif isinstance(metrics, str):
+        metrics = [metrics]
+    else:
+        metrics = list(metrics)
+
+    unknown = set(metrics) - set(quality_metrics)
+    if unknown or not metrics:
+        raise ValueError(
+            f"metrics must be a non-empty subset of {quality_metrics}: {metrics}"
+        )
+    if "vmaf" in metrics and not has_vmaf:
+        raise ValueError("metric 'vmaf' requires FFmpeg built with libvmaf.")
+
+    encodes = list(encodes)
+    if not encodes:
+        return []
+
+    batch_size = batch_size or len(encodes)
+    if batch_size < 1:
+        raise ValueError("batch_size must be a positive integer.")
+    batches = [
+        encodes[i : i + batch_size] for i in range(0, len(encodes), batch_size)
+    ]
+
+    cores = cores or os.cpu_count() or 1
+    jobs = min(cores, len(batches))
+    threads = max(cores // jobs, 1)
+
+    (info,) = probe.video_streams_basic(reference, 0, entries=("width", "height"))
+    size = (info["width"], info["height"])
+
+    def score(batch):
+        try:
+            return _score_batch(
+                reference, batch, metrics, size, threads, show_log, input_options
+            )
+        except Exception as e:
+            logger.warning(f"failed to score {batch}: {e}")
+            return e
+
+    results = []
+    with ThreadPoolExecutor(jobs) as executor:
+        for batch, scores in zip(batches, executor.map(score, batches)):
+            for i, url in enumerate(batch):
+                if isinstance(scores, Exception):
+                    results.append(QualityScores(str(url), {}, {}, scores))
+                else:
+                    frames = scores[i]
+                    aggregate = {k: float(v.mean()) for k, v in frames.items()}
+                    results.append(QualityScores(str(url), frames, aggregate, None))
+    return results
+
+
+class AnalysisCache:
+    """On-disk LRU cache of :py:func:`analyze.run` results
+
+    :param directory: cache directory, created if it does not exist
+    :param max_bytes: total size limit of the cached results, defaults to 256 MiB
+
+    Pass a cache object to :py:func:`analyze.run`, :py:func:`video.detect`, or
+    :py:func:`audio.detect` via their ``cache`` argument. A result is keyed by
+    the identity of the input file (its size, modification time, and a hash of
+    its first and last 64 KiB), the classes and the settings of the loggers
+    (in the given order), and the input options (e.g., ``ss``, ``t``, and
+    ``to``) and ``time_units``. The key also includes the ffmpegio version and
+    :py:attr:`format_version`, so the results pickled by a version with
+    different logger internals are never restored. If a matching result is
+    found, the loggers are restored from it without running FFmpeg. Only the
+    results of local input files are cached.
+
+    The results are pickled states of the loggers, one file per
+    :py:func:`analyze.run` call. When the cache exceeds ``max_bytes``, the
+    least recently used results are removed. Do not share a cache directory
+    with untrusted users.
+    """
+
+    #: number of bytes hashed at each end of an input file to identify it
+    hash_bytes = 65536
+
+    #: version of the cached logger states, bump when loggers' attributes change
+    format_version = 1
+
+    def __init__(self, directory: str | PathLike, max_bytes: int = 256 * 2**20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def file_identity(cls, url: str | PathLike) -> list | None:
+        """identify a local file by its size, modification time, and partial
+        content hash (None if url is not a local file)"""
+
+        try:
+            st = os.stat(url)
+            if not stat.S_ISREG(st.st_mode):
+                return None
+            h = blake2b(digest_size=16)
+            with open(url, "rb") as f:
+                h.update(f.read(cls.hash_bytes))
+                if st.st_size > 2 * cls.hash_bytes:
+                    f.seek(-cls.hash_bytes, os.SEEK_END)
+                h.update(f.read(cls.hash_bytes))
+        except (OSError, TypeError, ValueError):
+            return None
+        return [st.st_size, st.st_mtime_ns, h.hexdigest()]
+
+    def key(
+        self,
+        url,
+        loggers: Sequence[MetadataLogger],
+        references=None,
+        time_units=None,
+        start_at_zero=False,
+        input_options: dict[str, Any] | None = None,
+        analysis_profile: str | dict[str, Any] | None = None,
+    ) -> str | None:
+        """compose the cache key of an :py:func:`analyze.run` call
+
+        :return: cache key or None if any of the inputs is not a local file
+        """
+
+        if references is None:
+            references = ()
+        elif isinstance(references, str):
+            references = [references]
+
+        inputs = []
+        for ref in [(url, input_options), *references]:
+            ref_url, ref_opts = (ref, None) if isinstance(ref, (str, PathLike)) else ref
+            identity = self.file_identity(ref_url)
+            if identity is None:
+                return None
+            inputs.append([identity, ref_opts])
+
+        from . import __version__
+
+        signature = {
+            "version": [__version__, self.format_version],
+            "inputs": inputs,
+            "loggers": [
+                [type(l).__module__, type(l).__qualname__, l.config] for l in loggers
+            ],
+            "time_units": time_units,
+            "start_at_zero": start_at_zero,
+        }
+        if analysis_profile is not None:
+            signature["analysis_profile"] = analysis_profile
+        return sha256(
+            json.dumps(signature, sort_keys=True, default=repr).encode()
+        ).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def load(self, key: str, loggers: Sequence[MetadataLogger]) -> bool:
+        """restore the loggers from a cached result
+
+        :param key: cache key
+        :param loggers: loggers in the same order as they were stored
+        :return: True if restored
+        """
+
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                states = pickle.load(f)
+        except FileNotFoundError:
+            return False
+        except Exception:
+            logger.warning(f"[AnalysisCache] removing a corrupted entry: {path}")
+            self._remove(path)
+            return False
+
+        if len(states) != len(loggers):
+            return False
+
+        for l, state in zip(loggers, states):
+            l.__dict__.update(state)
+
+        try:
+            now = time_ns()
+            os.utime(path, ns=(now, now))  # mark as recently used
+        except OSError:
+            pass
+        return True
+
+    def store(self, key: str, loggers: Sequence[MetadataLogger]):
+        """store the states of the loggers
+
+        :param key: cache key
+        :param loggers: loggers to store
+        """
+
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump([l.__dict__ for l in loggers], f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self, max_bytes: int | None = None):
+        """remove the least recently used results until the cache fits the size limit
+
+        :param max_bytes: size limit, defaults to :py:attr:`max_bytes`
+        """
+
+        if max_bytes is None:
+            max_bytes = self.max_bytes
+
+        entries = []
+        with os.scandir(self.directory) as it:
+            for e in it:
+                if e.name.endswith(".pkl"):
+                    try:
+                        st = e.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime_ns, st.st_size, e.path))
+
+        total = sum(e[1] for e in entries)
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self):
+        """remove all the cached results"""
+        self.evict(0)
+
+    def __len__(self) -> int:
+        with os.scandir(self.directory) as it:
+            return sum(e.name.endswith(".pkl") for e in it)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
 class ScDet(MetadataLogger):
     """Logger for FFmpeg scdet filter to detect video scene change
 
@@ -369,7 +1433,11 @@ class ScDet(MetadataLogger):
         self.all_scores = all_scores
         #: FFmpeg filter options (value must be stringifiable)
         self.options: dict[str, Any] = options
-        self.data = {}
+
+    @property
+    def config(self) -> dict[str, Any]:
+        """logger settings, which determine its output for a given input"""
+        return {**super().config, "all_scores": self.all_scores}
 
     def log(self, t: float | int, name: str, key: Optional[str], value: str):
         """log the metadata
@@ -390,31 +1458,41 @@ class ScDet(MetadataLogger):
 
         """
         if key == "mafd":  # always the first entry / frame
-            self.data[t] = {"mafd": float(value)}
+            self._log_time(t)
+            self._column("mafd").append(float(value))
+            self._column("score").append(float("nan"))
+            self._column("changed", "q").append(0)
         elif key == "score":
-            self.data[t]["score"] = float(value)
+            self._column("score")[-1] = float(value)
         elif key == "time":
-            self.data[t]["changed"] = True
+            self._column("changed", "q")[-1] = 1
 
     @property
     def output(self) -> ScDet.Scenes | ScDet.AllScenes:
         """log output. Scenes if all_scores==True else AllScenes"""
-        d = self.data
+
+        cols = self.__dict__.get("_columns", {})
+        time, changed, score, mafd = (
+            cols.get(k, ()) for k in ("time", "changed", "score", "mafd")
+        )
+
+        # frames in time order, the last frame logged wins if time repeats
+        index = {t: i for i, t in enumerate(time)}
+        index = [index[t] for t in sorted(index)]
+
         if self.all_scores:
-            times = sorted((t for t, v in self.data.items()))
             return self.AllScenes(
-                tuple(times),
-                *zip(
-                    *(
-                        (d[t].get("changed", False), d[t]["score"], d[t]["mafd"])
-                        for t in times
-                    )
-                ),
+                tuple(time[i] for i in index),
+                tuple(bool(changed[i]) for i in index),
+                tuple(score[i] for i in index),
+                tuple(mafd[i] for i in index),
             )
         else:
-            times = sorted((t for t, v in d.items() if v.get("changed", False)))
+            index = [i for i in index if changed[i]]
             return self.Scenes(
-                tuple(times), *zip(*((d[t]["score"], d[t]["mafd"]) for t in times))
+                tuple(time[i] for i in index),
+                tuple(score[i] for i in index),
+                tuple(mafd[i] for i in index),
             )
 
 
@@ -517,7 +1595,6 @@ class BlackFrame(MetadataLogger):
 
     def __init__(self, **options):
         self.options = options
-        self.frames = []
 
     def log(self, t: float | int, name: str, key: Optional[str], value: str):
         """log the metadata
@@ -539,12 +1616,16 @@ class BlackFrame(MetadataLogger):
         """
         if key != "pblack":
             raise ValueError(f"Unknown blackframe metadata found: {key}")
-        self.frames.append((t, int(value)))
+        self._log_time(t)
+        self._column("pblack", "q").append(int(value))
 
     @property
     def output(self) -> BlackFrames:
         """log output"""
-        return self.BlackFrames(*zip(*self.frames))
+        cols = self.__dict__.get("_columns", {})
+        return self.BlackFrames(
+            *(tuple(cols.get(k, ())) for k in ("time", "pblack"))
+        )
 
 
 class FreezeDetect(MetadataLogger):
@@ -647,8 +1728,6 @@ class BBox(MetadataLogger):
 
     def __init__(self, **options):
         self.options = options
-        self.time = []
-        self.position = []
 
     def log(self, t: float | int, name: str, key: Optional[str], value: str):
         """log the metadata
@@ -669,19 +1748,23 @@ class BBox(MetadataLogger):
 
         """
         if key == "x1":
-            self.time.append(t)
-            self.position.append([int(value), 0, 0, 0])
-        else:
-            try:
-                key = self.pos_keys[key]
-                self.position[-1][key] = int(value)
-            except:
-                pass
+            self._log_time(t)
+            self._column("x1", "q").append(int(value))
+            for k in self.pos_keys:
+                self._column(k, "q").append(0)
+        elif key in self.pos_keys:
+            self._column(key, "q")[-1] = int(value)
 
     @property
     def output(self) -> BBox.BBox:
         """log output"""
-        return self.BBox(self.time, self.position)
+        cols = self.__dict__.get("_columns", {})
+        if not cols:
+            return self.BBox([], [])
+        return self.BBox(
+            cols["time"].tolist(),
+            [list(p) for p in zip(*(cols[k] for k in ("x1", *self.pos_keys)))],
+        )
 
 
 class BlurDetect(MetadataLogger):
@@ -721,7 +1804,6 @@ class BlurDetect(MetadataLogger):
 
     def __init__(self, **options):
         self.options = options
-        self.frames = []
 
     def log(self, t: float | int, name: str, key: Optional[str], value: str):
         """log the metadata
@@ -743,12 +1825,14 @@ class BlurDetect(MetadataLogger):
         """
         if name != "blur":
             raise ValueError(f"Unknown blurdetect metadata found: {name}")
-        self.frames.append((t, float(value)))
+        self._log_time(t)
+        self._column("blur").append(float(value))
 
     @property
     def output(self) -> BlurDetect.Blur:
         """log output"""
-        return self.Blur(*zip(*self.frames))
+        cols = self.__dict__.get("_columns", {})
+        return self.Blur(*(tuple(cols.get(k, ())) for k in ("time", "blur")))
 
 
 #  'frame:26   pts:26026   pts_time:0.867533\n'
@@ -803,9 +1887,6 @@ class PSNR(MetadataLogger):
 
     def __init__(self, ref_stream_spec: str = "1:v", **options):
         self.options = options
-        self.time = []
-        self.comps = []
-        self.stats = {}
         self._first = None
         self._ref = ref_stream_spec or "1:v"
 
@@ -841,37 +1922,26 @@ class PSNR(MetadataLogger):
         if not self._first:
             self._first = key
 
-        name, comp = m.groups()
-
-        new_row = key == self._first
-        if new_row:
-            self.time.append(t)
-        if comp:
-            n = len(t)
-            if n == 1:
-                self.comps.append(comp)
-            try:
-                stat = self.stats[name]
-            except:
-                stat = self.stats[name] = []
-            if len(stat) < n:
-                l = []
-                stat.append(l)
-            else:
-                l = stat[-1]
-        else:
-            try:
-                l = self.stats[name]
-            except:
-                l = self.stats[name] = []
+        if key == self._first:
+            self._log_time(t)
 
-        l.append(float(value))
+        # per-component stats are only stored in columns (e.g., 'mse.y')
+        self._column(key).append(float(value))
 
     @property
     def output(self):
-        """log output"""
-        Output = namedtuple("PSNR", ["time", *self.stats.keys()])
-        return Output(self.time, *self.stats.values())
+        """log output
+
+        The per-component stats (e.g., ``mse.y``) are only available via
+        :py:attr:`output_arrays`.
+        """
+        cols = {
+            k: v.tolist()
+            for k, v in self.__dict__.get("_columns", {}).items()
+            if "." not in k
+        }
+        Output = namedtuple("PSNR", ["time", *(k for k in cols if k != "time")])
+        return Output(cols.pop("time", []), *cols.values())
 
 
 class SilenceDetect(MetadataLogger):
@@ -1007,8 +2077,6 @@ class APhaseMeter(MetadataLogger):
 
     def __init__(self, **options):
         self.options = options
-        self.time = []
-        self.value = []
         self.mono = []
         self.out_phase = []
 
@@ -1037,8 +2105,8 @@ class APhaseMeter(MetadataLogger):
         """
 
         if key == "phase":
-            self.time.append(t)
-            self.value.append(float(value))
+            self._log_time(t)
+            self._column("value").append(float(value))
         else:
             ptype, action = key.rsplit("_", 1)
             i = getattr(self, ptype)
@@ -1054,10 +2122,15 @@ class APhaseMeter(MetadataLogger):
     @property
     def output(self) -> APhaseMeter.Phase:
         """log output"""
-        return self.Phase(self.time, self.value, self.mono, self.out_phase)
+        cols = self.__dict__.get("_columns", {})
+        return self.Phase(
+            *(cols[k].tolist() if k in cols else [] for k in ("time", "value")),
+            self.mono,
+            self.out_phase,
+        )
 
 
-class AStats(MetadataLogger):
+class AStats(_KeyedColumnsLogger):
     """Logger for FFmpeg astats filter to measure time domain statistics per audio frames
 
     :param \**options: FFmpeg filter options (see below)
@@ -1117,33 +2190,13 @@ class AStats(MetadataLogger):
     filter_name: Literal["astats"] = "astats"
     re_key = re.compile(r"(?:(\d+|Overall)\.)?([\s\S]+)")
 
-    def __init__(self, **options):
-        self.options = options
-        self.time = []
-        self.stats = {}
-        self._first = None
-
     @property
     def filter(self):
         """filter specification expression to be used in FilterGraph"""
         return Filter(self.filter_name, **self.options, metadata=True)
 
-    def log(self, t: float | int, name: str, key: Optional[str], value: str):
-        """log the metadata
-
-        :param t: timestamps in seconds, frames, or pts
-        :type t: float|int
-        :param name: one of the class' meta_names
-        :type name: str
-        :param key: secondary metadata key if found
-        :type key: str | None
-        :param value: metadata value
-        :type value: str
-
-        This method is called by :py:func:`analyze.run` if a metadata line begins
-        with one of the class' ``meta_names`` entry. The `log` method shall store
-        the metadata info in a private storage property of the class so they can be
-        returned later by the `output` property.
+    def _column_name(self, key: str) -> str | None:
+        """name the column of a metadata key
 
         lavfi.astats.1.Number of Infs=0.000000
         lavfi.astats.2.Number of denormals=0.000000
@@ -1152,39 +2205,16 @@ class AStats(MetadataLogger):
         lavfi.astats.Overall.Max_level=0.100442
         """
 
-        if not self._first:
-            self._first = key
-
-        if key == self._first:
-            self.time.append(t)
-
         m = self.re_key.match(key)
         if not m:
             logger.warning(f"[AStats.log()] Unknown metadata key: {key}")
-            return
-        ch, name = m.groups()
+            return None
 
-        # get stat name and storage dict
+        # column: '<stat name>.<channel number|overall>'
+        ch, name = m.groups()
         meas = name.lower().replace(" ", "_")
-        try:
-            stat = self.stats[meas]
-        except:
-            stat = self.stats[meas] = [] if ch is None else {}
-
-        # get channel number and storage list
-        try:
-            ch = int(ch)
-        except:
-            ch = "overall"
-
-        try:
-            l = stat[ch]
-        except:
-            l = stat[ch] = []
-
-        # use int or float
-        v = float(value)
-        l.append(int(v) if value.endswith(".000000") else v)
+        ch = "overall" if ch is None else ch.lower()
+        return f"{meas}.{ch}"
 
     @property
     def output(self) -> NamedTuple:
@@ -1231,13 +2261,24 @@ class AStats(MetadataLogger):
 
         """
 
-        # self._bit_depth2
-        Output = namedtuple("AStats", ["time", *self.stats.keys()])
+        cols = self.__dict__.get("_columns", {})
+        time = cols["time"].tolist() if "time" in cols else []
 
-        return Output(self.time, *self.stats.values())
+        # integral values are returned as int
+        stats = {}
+        for k, col in cols.items():
+            if k == "time":
+                continue
+            meas, _, ch = k.rpartition(".")
+            stats.setdefault(meas, {})[int(ch) if ch.isdigit() else ch] = [
+                int(v) if v.is_integer() else v for v in col
+            ]
 
+        Output = namedtuple("AStats", ["time", *stats.keys()])
+        return Output(time, *stats.values())
 
-class ASpectralStats(MetadataLogger):
+
+class ASpectralStats(_KeyedColumnsLogger):
     """Logger for FFmpeg aspectralstats filter to measure frequency domain statistics about audio frames
 
     :param \**options: FFmpeg filter options (see below)
@@ -1296,56 +2337,17 @@ class ASpectralStats(MetadataLogger):
     filter_name: Literal["aspectralstats"] = "aspectralstats"
     re_key = re.compile(r"(?:(\d+)\.)?(.+)")
 
-    def __init__(self, **options):
-        self.options = options
-        self.time = []
-        self.stats = {}
-        self._first = None
-
-    def log(self, t: float | int, name: str, key: Optional[str], value: str):
-        """log the metadata
-
-        :param t: timestamps in seconds, frames, or pts
-        :type t: float|int
-        :param name: one of the class' meta_names
-        :type name: str
-        :param key: secondary metadata key if found
-        :type key: str | None
-        :param value: metadata value
-        :type value: str
-
-        This method is called by :py:func:`analyze.run` if a metadata line begins
-        with one of the class' ``meta_names`` entry. The `log` method shall store
-        the metadata info in a private storage property of the class so they can be
-        returned later by the `output` property.
-
-        """
+    def _column_name(self, key: str) -> str | None:
+        """name the column of a metadata key"""
 
         m = self.re_key.match(key)
         if not (m and m[1]):
             logger.warning(f"[ASpectralStats.log()] Unknown metadata key: {key}")
-            return
-
-        if not self._first:
-            self._first = key
+            return None
 
+        # column: '<stat name>.<channel number>'
         ch, name = m.groups()
-
-        if key == self._first:
-            self.time.append(t)
-
-        try:
-            stat = self.stats[name]
-        except:
-            stat = self.stats[name] = {}
-
-        ch = int(ch)
-        try:
-            l = stat[ch]
-        except:
-            l = stat[ch] = []
-
-        l.append(float(value))
+        return f"{name}.{ch}"
 
     @property
     def output(self):
@@ -1379,5 +2381,161 @@ class ASpectralStats(MetadataLogger):
 
         """
 
-        Output = namedtuple("ASpectralStats", ["time", *self.stats.keys()])
-        return Output(self.time, *self.stats.values())
+        cols = self.__dict__.get("_columns", {})
+        time = cols["time"].tolist() if "time" in cols else []
+
+        stats = {}
+        for k, col in cols.items():
+            if k != "time":
+                name, _, ch = k.rpartition(".")
+                stats.setdefault(name, {})[int(ch)] = col.tolist()
+
+        Output = namedtuple("ASpectralStats", ["time", *stats.keys()])
+        return Output(time, *stats.values())
+
+
+class EBUR128(_KeyedColumnsLogger):
+    """Logger for FFmpeg ebur128 filter to measure EBU R128 loudness
+
+    :param \**options: FFmpeg filter options (see below)
+    :type \**options: dict[str, any]
+
+    FFmpeg ``ebur128`` filter options
+    ---------------------------------
+
+    ========  ======  ===============
+    name      type    description
+    ========  ======  ===============
+    peak      str     set peak mode: "none", "sample", "true", or combined with ``+`` (e.g., "sample+true") (default "none")
+    dualmono  bool    treat mono input files as dual-mono (default false)
+    panlaw    float   set a specific pan law for dual-mono files (from -10 to 0) (default -3.0103)
+    framelog  str     force frame logging level (default "verbose")
+    ========  ======  ===============
+
+    The ``ebur128`` filter re-frames the audio into 100-ms frames (in
+    double-precision samples), and only the metadata of the frames it outputs
+    reach :py:func:`analyze.run`. Place this logger first so the other audio
+    loggers analyze the same 100-ms frames.
+
+    Unlike :py:func:`loudnorm`, this logger shares the decoding with the other
+    loggers. For example, to measure the loudness, silence, and time domain
+    statistics of an audio stream at once:
+
+    .. code-block:: python
+
+        loggers = analyze.run(
+            url, analyze.EBUR128(peak="true"), analyze.SilenceDetect(), analyze.AStats()
+        )
+
+    """
+
+    #: (static) target stream media type
+    media_type: Literal["audio"] = "audio"
+    #: (static) metadata names to be logged
+    meta_names: Tuple[Literal["r128"]] = ("r128",)
+    #: (static) name of the FFmpeg filter to use
+    filter_name: Literal["ebur128"] = "ebur128"
+
+    #: metadata keys of the loudness measurements and their column names
+    loudness_keys = {
+        "M": "momentary",
+        "S": "short_term",
+        "I": "integrated",
+        "LRA": "lra",
+        "LRA.low": "lra_low",
+        "LRA.high": "lra_high",
+    }
+    re_peak_key = re.compile(r"(sample|true)_peak(?:s_ch(\d+))?")
+
+    @property
+    def filter(self):
+        """filter specification expression to be used in FilterGraph"""
+        return Filter(
+            self.filter_name,
+            **{"framelog": "verbose", **self.options},
+            video=False,
+            metadata=True,
+        )
+
+    def _column_name(self, key: str) -> str | None:
+        """name the column of a metadata key"""
+
+        try:
+            return self.loudness_keys[key]
+        except KeyError:
+            pass
+
+        m = self.re_peak_key.fullmatch(key)
+        if not m:
+            logger.warning(f"[EBUR128.log()] Unknown metadata key: {key}")
+            return None
+
+        # column: '<sample|true>_peak' or '<sample|true>_peaks.<channel number>'
+        mode, ch = m.groups()
+        return f"{mode}_peak" if ch is None else f"{mode}_peaks.{ch}"
+
+    @property
+    def output(self) -> NamedTuple:
+        """log output
+
+        EBUR128's log output is a dynamically composed namedtuple. Every field
+        contains a list of the measurements over time:
+
+        ===========  =====  ======================================================
+        field name   unit   description
+        ===========  =====  ======================================================
+        time                timestamps in seconds, frames, or pts
+        momentary    LUFS   momentary loudness (400-ms window)
+        short_term   LUFS   short-term loudness (3-s window)
+        integrated   LUFS   integrated loudness from the start
+        lra          LU     loudness range from the start
+        lra_low      LUFS   lower bound of the loudness range
+        lra_high     LUFS   upper bound of the loudness range
+        sample_peak  ratio  sample peak from the start (``peak`` includes "sample")
+        true_peak    ratio  true peak from the start (``peak`` includes "true")
+        ===========  =====  ======================================================
+
+        If the peaks are measured, the ``sample_peaks`` and ``true_peaks``
+        fields are :py:obj:`dict` of the per-channel peaks keyed by the channel
+        number (0, 1, ...).
+        """
+
+        cols = self.__dict__.get("_columns", {})
+        time = cols["time"].tolist() if "time" in cols else []
+
+        stats = {}
+        for k, col in cols.items():
+            if k != "time":
+                name, _, ch = k.partition(".")
+                if ch:
+                    stats.setdefault(name, {})[int(ch)] = col.tolist()
+                else:
+                    stats[name] = col.tolist()
+
+        Output = namedtuple("EBUR128", ["time", *stats.keys()])
+        return Output(time, *stats.values())
+
+    @property
+    def summary(self) -> dict[str, float]:
+        """loudness summary of the whole logged duration
+
+        :py:obj:`dict` with the final ``integrated`` loudness (LUFS), loudness
+        range ``lra`` (LU), and its bounds ``lra_low`` and ``lra_high`` (LUFS),
+        plus ``sample_peak`` (dBFS) and ``true_peak`` (dBTP) if measured.
+        Empty if nothing has been logged.
+        """
+
+        cols = self.__dict__.get("_columns", {})
+        if not len(cols.get("integrated", ())):
+            return {}
+
+        summary = {
+            k: cols[k][-1]
+            for k in ("integrated", "lra", "lra_low", "lra_high")
+            if k in cols
+        }
+        for k in ("sample_peak", "true_peak"):
+            if k in cols and len(cols[k]):
+                peak = max(cols[k])
+                summary[k] = 20 * log10(peak) if peak > 0 else float("-inf")
+        return summary
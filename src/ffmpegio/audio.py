@@ -2,12 +2,25 @@
 
 from __future__ import annotations
 
+import json
 import logging
+import os
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from os import PathLike
+from threading import Lock
+from time import perf_counter
 
-from . import analyze, configure, utils
+from . import analyze, configure, probe, utils
 from . import filtergraph as fgb
-from ._typing import Any, ProgressCallable, RawDataBlob
+from ._typing import (
+    TYPE_CHECKING,
+    Any,
+    NamedTuple,
+    ProgressCallable,
+    RawDataBlob,
+    Sequence,
+)
 from .configure import (
     FFmpegInputOptionTuple,
     FFmpegInputUrlComposite,
@@ -20,9 +33,12 @@ from .errors import FFmpegioError
 from .filtergraph.abc import FilterGraphObject
 from .std_runners import run_and_return_encoded, run_and_return_raw
 
+if TYPE_CHECKING:
+    from .streams.pool import FilterPool
+
 logger = logging.getLogger("ffmpegio")
 
-__all__ = ["create", "read", "write", "filter", "detect"]
+__all__ = ["create", "read", "write", "filter", "detect", "normalize_many"]
 
 
 def create(
@@ -255,6 +271,7 @@ def filter(
     progress: ProgressCallable | None = None,
     show_log: bool | None = None,
     sp_kwargs: dict[str, Any] | None = None,
+    pool: FilterPool | None = None,
     **options,
 ) -> tuple[int, RawDataBlob]:
     """Filter audio samples.
@@ -277,6 +294,10 @@ def filter(
     :param sp_kwargs: dictionary with keywords passed to `subprocess.run()` or
                       `subprocess.Popen()` call used to run the FFmpeg, defaults
                       to None
+    :param pool: :py:class:`streams.FilterPool` to run a stateless SISO filter
+                 on a warm FFmpeg process, defaults to None (run a new FFmpeg
+                 process). ``progress``, ``show_log``, and ``sp_kwargs`` are
+                 ignored if pooled.
     :param options: FFmpeg options, append '_in' for input option names (see :doc:`options`)
     :return rate: sample rate in samples/second
     :return data: audio data object specified by selected `bytes_to_audio` plugin hook.
@@ -286,6 +307,13 @@ def filter(
 
     """
 
+    if pool is not None:
+        if extra_inputs is not None or extra_outputs is not None:
+            raise ValueError("Pooled filtering does not support extra inputs or outputs.")
+        return pool.filter(
+            expr, input_rate, input, media_type="audio", squeeze=squeeze, **options
+        )
+
     if expr is not None:
         if extra_inputs is None and extra_outputs is None:
             # guaranteed SISO filtering
@@ -323,6 +351,7 @@ def detect(
     time_units=None,
     progress=None,
     show_log=None,
+    cache=None,
     **options,
 ):
     """detect audio stream features
@@ -354,6 +383,9 @@ def detect(
     :param show_log: True to show FFmpeg log messages on the console,
                      defaults to None (no show/capture)
     :type show_log: bool, optional
+    :param cache: analysis cache to reuse the outcomes of the previous calls
+                  with the same input file and settings, defaults to None
+    :type cache: analyze.AnalysisCache, optional
     :param \**options: FFmpeg detector filter options. For a single-feature call, the FFmpeg filter options
         of the specified feature can be specified directly as keyword arguments. For a multiple-feature call,
         options for each individual FFmpeg filter can be specified with <feature>_options dict keyword argument.
@@ -425,7 +457,173 @@ def detect(
         time_units=time_units,
         progress=progress,
         show_log=show_log,
+        cache=cache,
         **input_opts,
     )
 
     return tuple((l.output for l in loggers))
+
+
+class NormalizeResult(NamedTuple):
+    """per-file report of :py:func:`normalize_many`"""
+
+    input: str  #: input url
+    output: str  #: output url
+    #: loudnorm first-pass measurements (``None`` if failed to measure)
+    stats: dict[str, str] | None
+    cached: bool  #: ``True`` if the measurements were loaded from the stats cache
+    analysis_time: float  #: elapsed time of the first pass in seconds (0 if cached)
+    transcode_time: float  #: elapsed time of the second pass in seconds
+    error: Exception | None  #: exception raised while processing the file
+
+
+class _LoudnormStatsCache:
+    """append-only JSON Lines store of loudnorm measurements keyed by file identity"""
+
+    def __init__(self, path: str | PathLike):
+        self.path = path
+        self._lock = Lock()
+        self._entries = {}
+        try:
+            with open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        self._entries[record["key"]] = record["value"]
+                    except (ValueError, KeyError, TypeError):
+                        pass  # skip a partially written line
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def key(url: str | PathLike, settings: dict[str, Any]) -> str | None:
+        """identify a local file by its real path, size, and modification time
+        (None if url is not a local file)"""
+        try:
+            st = os.stat(url)
+        except (OSError, TypeError, ValueError):
+            return None
+        identity = [os.path.realpath(url), st.st_size, st.st_mtime_ns, settings]
+        return json.dumps(identity, sort_keys=True, default=str)
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key: str, value: dict[str, Any]):
+        with self._lock:
+            self._entries[key] = value
+            with open(self.path, "at", encoding="utf-8") as f:
+                f.write(json.dumps({"key": key, "value": value}) + "\n")
+
+
+def normalize_many(
+    inputs: Sequence[FFmpegInputUrlNoPipe],
+    outputs: Sequence[FFmpegOutputUrlNoPipe],
+    *,
+    jobs: int | None = None,
+    stats_cache: str | PathLike | None = None,
+    i: float | None = None,
+    lra: float | None = None,
+    tp: float | None = None,
+    offset: float | None = None,
+    linear: bool | None = None,
+    dual_mono: bool | None = None,
+    af: str | FilterGraphObject | None = None,
+    overwrite: bool | None = None,
+    **options,
+) -> list[NormalizeResult]:
+    """Normalize the loudness of multiple audio files with two-pass EBU R128
+    loudness normalization
+
+    :param inputs: urls of the input media files
+    :param outputs: urls of the output media files, one for each input
+    :param jobs: maximum number of files processed concurrently, defaults to
+        the number of CPUs
+    :param stats_cache: path of the file to persist the first-pass measurements,
+        defaults to None (no persistence). The measurements of a local input
+        file are reused until the file is modified.
+    :param i: integrated loudness target, defaults to None (-24 LUFS)
+    :param lra: loudness range target, defaults to None (7 LU)
+    :param tp: maximum true peak, defaults to None (-2 dBTP)
+    :param offset: offset gain, defaults to None
+    :param linear: True to normalize by linearly scaling the source audio,
+        False to normalize dynamically, defaults to None
+    :param dual_mono: True to treat mono input files as "dual-mono", defaults
+        to None
+    :param af: filter chain to apply before the normalization, defaults to None
+    :param overwrite: True to overwrite if output url exists, defaults to None
+        (auto-select)
+    :param options: FFmpeg options of the second pass (encoding). Append ``'_in'``
+        to the input option names, which are also used in the first pass.
+        If ``ar`` is not specified, the outputs retain the input sample rates
+        (the ``loudnorm`` filter otherwise outputs at 192 kHz).
+    :return: per-file reports in the order of the inputs
+
+    Each file is analyzed by :py:func:`analyze.loudnorm` (first pass) and
+    then transcoded with the measured ``loudnorm`` filter (second pass). Up to
+    ``jobs`` files are processed concurrently, each in its own FFmpeg
+    processes, so the first pass of a file overlaps the second passes of the
+    others. A failure does not stop the other files; it is reported in the
+    ``error`` field of the file's report.
+    """
+
+    from .transcode import transcode  # circular import
+
+    if len(inputs) != len(outputs):
+        raise ValueError("inputs and outputs must have the same length.")
+
+    targets = {
+        k: v
+        for k, v in zip(
+            ("i", "lra", "tp", "offset", "linear", "dual_mono"),
+            (i, lra, tp, offset, linear, dual_mono),
+        )
+        if v is not None
+    }
+    input_options = {k[:-3]: v for k, v in options.items() if k.endswith("_in")}
+
+    cache = stats_cache and _LoudnormStatsCache(stats_cache)
+    measure_settings = {"af": af and str(af), "dual_mono": dual_mono, **input_options}
+
+    def normalize(url, out_url):
+        stats = None
+        cached = False
+        analysis_time = transcode_time = 0.0
+        try:
+            key = cache and cache.key(url, measure_settings)
+            entry = key and cache.get(key)
+            cached = entry is not None
+            if not cached:
+                t0 = perf_counter()
+                stats = analyze.loudnorm(
+                    url, dual_mono=dual_mono, af=af, return_stats=True, **input_options
+                )
+                (info,) = probe.audio_streams_basic(url, 0, entries=("sample_rate",))
+                entry = {"stats": stats, "sample_rate": info["sample_rate"]}
+                analysis_time = perf_counter() - t0
+                if key:
+                    cache.put(key, entry)
+            stats = entry["stats"]
+
+            t0 = perf_counter()
+            f = fgb.Filter("loudnorm", **targets, **analyze._loudnorm_measured(stats))
+            transcode(
+                url,
+                out_url,
+                af=(fgb.Graph(af) + f) if af else f,
+                overwrite=overwrite,
+                **{"ar": entry["sample_rate"], **options},
+            )
+            transcode_time = perf_counter() - t0
+            error = None
+        except Exception as e:
+            logger.warning(f"failed to normalize {url}: {e}")
+            error = e
+
+        return NormalizeResult(
+            str(url), str(out_url), stats, cached, analysis_time, transcode_time, error
+        )
+
+    with ThreadPoolExecutor(jobs or os.cpu_count() or 1) as executor:
+        return list(executor.map(normalize, inputs, outputs))
@@ -1031,8 +1031,11 @@ def _get_filter_option(block: str, name: str) -> FilterOption:
         ]
     )
 
+    # flags and string constants are not listed with their int values
     constants = [
-        _get_filter_option_constant(l, otype == "flags") for l in lines[1:] if l
+        _get_filter_option_constant(l, otype in ("flags", "string"))
+        for l in lines[1:]
+        if l
     ]
 
     if not len(constants):
@@ -34,6 +34,7 @@ from collections.abc import Sequence
 from contextlib import ExitStack
 from functools import cache
 from itertools import count
+from threading import Lock
 
 from namedpipe import NPopen
 
@@ -133,6 +134,19 @@ FFmpegNoPipeOutputOptionTuple = tuple[FFmpegOutputUrlNoPipe, FFmpegOptionDict]
 
 raw_formats = ("rawvideo", *(formats for _, formats in utils.audio_codecs.values()))
 
+OPTIMIZE_FILTERGRAPHS: bool | Literal["approximate"] = False
+"""``True`` to optimize the filtergraph options of all the FFmpeg arguments
+configured by ``init_media_*()`` functions (see ``optimize_filtergraphs()``) or
+``'approximate'`` to also apply the approximate rewrites, defaults to ``False``"""
+
+FILTERGRAPH_PROFILER: fgb.FilterProfile | None = None
+"""active filter profiler, set by :py:func:`filtergraph.profile_filters`"""
+
+FILTERGRAPH_PIPE_THRESHOLD: int | None = 32768
+"""filtergraph options longer than this number of characters are passed to
+FFmpeg through an inherited pipe instead of the command line (POSIX only).
+``None`` to always pass them on the command line."""
+
 
 class FFmpegArgs(TypedDict):
     """FFmpeg arguments"""
@@ -305,29 +319,33 @@ def init_media_read(
     # assign inputs
     input_info = process_url_inputs(args, input_urls, inopts_default)
 
-    # assign outputs
-    try:
-        output_info = process_raw_outputs(
-            args, input_info, output_streams, options, squeeze
-        )
-    except FFmpegError as e:
-        raise FFmpegioInsufficientInputData(
-            "Failed to retrieve input stream information."
-        ) from e
+    # probe each input file only once while resolving the outputs
+    with utils.probe_plan():
+        # assign outputs
+        try:
+            output_info = process_raw_outputs(
+                args, input_info, output_streams, options, squeeze
+            )
+        except FFmpegError as e:
+            raise FFmpegioInsufficientInputData(
+                "Failed to retrieve input stream information."
+            ) from e
 
-    # standardize output stream options
+        # standardize output stream options
 
-    if extra_outputs is not None:
-        output_info.extend(
-            process_url_outputs(
-                args,
-                input_info,
-                extra_outputs,
-                {},
-                skip_automapping=True,
-                no_pipe=True,
+        if extra_outputs is not None:
+            output_info.extend(
+                process_url_outputs(
+                    args,
+                    input_info,
+                    extra_outputs,
+                    {},
+                    skip_automapping=True,
+                    no_pipe=True,
+                )
             )
-        )
+
+    finalize_filtergraphs(args)
 
     return args, input_info, output_info
 
@@ -415,6 +433,8 @@ def init_media_write(
                 'all piped encoded output stream must have its format (`"f"`) defined in its option dict'
             )
 
+    finalize_filtergraphs(args)
+
     return args, input_info, output_info
 
 
@@ -516,6 +536,8 @@ def init_media_filter(
         except FFmpegioNoPipeAllowed:
             raise FFmpegioError("extra_outputs cannot be piped out.")
 
+    finalize_filtergraphs(args)
+
     return args, input_info, output_info
 
 
@@ -564,6 +586,8 @@ def init_media_transcode(
     if not len(output_info):
         raise ValueError("At least one output must be given.")
 
+    finalize_filtergraphs(args)
+
     return args, input_info, output_info
 
 
@@ -963,6 +987,82 @@ def move_global_options(args: FFmpegArgs) -> FFmpegArgs:
     return args
 
 
+def map_filtergraphs(
+    args: FFmpegArgs, func: Callable[[fgb.Graph], FilterGraphObject | None]
+) -> FFmpegArgs:
+    """apply a function to the filtergraphs of FFmpeg arguments
+
+    :param args: FFmpeg arguments. The ``filter_complex`` (``lavfi``) global
+        option and the ``vf``, ``af``, and ``filter`` output options are
+        replaced with the filtergraphs returned by ``func``.
+    :param func: function to take a filtergraph and return its replacement or
+        ``None`` to keep the option as is
+    :returns: FFmpeg arguments (the same object as the input)
+
+    An option is left as is if its filtergraph cannot be parsed.
+    """
+
+    def apply(expr):
+        if isinstance(expr, (list, tuple)) and not isinstance(expr, FilterGraphObject):
+            return [apply(e) for e in expr]
+        try:
+            fg = fgb.as_filtergraph(expr)
+        except fgb.FiltergraphInvalidExpression:
+            return expr
+        new_fg = func(fg)
+        return expr if new_fg is None else new_fg
+
+    gopts = args.get("global_options", None) or {}
+    for name in ("filter_complex", "lavfi"):
+        if gopts.get(name):
+            gopts[name] = apply(gopts[name])
+
+    for _, outopts in args.get("outputs", ()):
+        for name, value in (outopts or {}).items():
+            if value and (name in ("vf", "af", "filter") or name.startswith("filter:")):
+                outopts[name] = apply(value)
+
+    return args
+
+
+def optimize_filtergraphs(args: FFmpegArgs, approximate: bool = False) -> FFmpegArgs:
+    """optimize the filtergraphs of FFmpeg arguments
+
+    :param args: FFmpeg arguments. The ``filter_complex`` (``lavfi``) global
+        option and the ``vf``, ``af``, and ``filter`` output options are
+        replaced with their optimized filtergraphs.
+    :param approximate: ``True`` to also apply the rewrites which do not
+        preserve the exact pixel values, defaults to ``False``
+    :returns: FFmpeg arguments (the same object as the input)
+
+    See :py:meth:`filtergraph.Graph.optimize` for the optimization rules.
+    """
+
+    def optimize(fg):
+        fg_opt = fg.optimize(approximate)
+        return None if str(fg_opt) == str(fg) else fg_opt
+
+    return map_filtergraphs(args, optimize)
+
+
+def finalize_filtergraphs(args: FFmpegArgs) -> FFmpegArgs:
+    """apply the enabled filtergraph passes to the configured FFmpeg arguments
+
+    :param args: FFmpeg arguments
+    :returns: FFmpeg arguments (the same object as the input)
+
+    Called at the end of ``init_media_*()`` functions: optimizes the filtergraphs
+    if ``OPTIMIZE_FILTERGRAPHS`` is set, then instruments them if a filter
+    profiler (:py:func:`filtergraph.profile_filters`) is active.
+    """
+
+    if OPTIMIZE_FILTERGRAPHS:
+        optimize_filtergraphs(args, OPTIMIZE_FILTERGRAPHS == "approximate")
+    if FILTERGRAPH_PROFILER is not None:
+        FILTERGRAPH_PROFILER.instrument_args(args)
+    return args
+
+
 def config_input_fg(
     expr: str | FilterGraphObject, args: tuple, kwargs: dict
 ) -> tuple[str | fgb.Filter, float | None, dict]:
@@ -1027,6 +1127,80 @@ def config_input_fg(
     return f.apply(fargs), dopt, oargs
 
 
+def config_renditions(
+    renditions: Sequence[tuple[str, FFmpegOptionDict | None]],
+    shared_filters: dict[MediaType, str | FilterGraphObject] | None = None,
+) -> tuple[fgb.Graph, list[FFmpegOptionDict]]:
+    """configure a complex filtergraph to output multiple renditions of input streams
+
+    :param renditions: pairs of an input stream map option with its stream type
+                       (e.g., ``'0:v:0'``) and the output options of a rendition.
+                       The simple filtergraph option (``vf``, ``af``, or ``filter``)
+                       of a rendition is moved to the complex filtergraph.
+    :param shared_filters: filterchains keyed by media type to apply to the input
+                           streams before they are split, defaults to None
+    :return fg: complex filtergraph, which decodes and splits each input stream once
+    :return stream_opts: output options of the renditions, mapping the outputs of
+                         ``fg``
+    """
+
+    groups: dict[str, list[int]] = {}
+    for i, (spec, _) in enumerate(renditions):
+        groups.setdefault(spec, []).append(i)
+
+    fg = fgb.Graph()
+    stream_opts = [None] * len(renditions)
+    for spec, indices in groups.items():
+        stream_spec = parse_map_option(spec, input_file_id=0, parse_stream=True).get(
+            "stream_specifier", {}
+        )
+        media_type = stream_type_to_media_type(stream_spec.get("stream_type", None))
+        if media_type not in ("video", "audio"):
+            raise ValueError(
+                f"map option {spec!r} of a rendition must specify the video or audio stream type (e.g., '0:v:0')."
+            )
+
+        # filters of the renditions
+        filters = []
+        for i in indices:
+            opts = stream_opts[i] = {**(renditions[i][1] or {})}
+            names = [
+                name
+                for name in (utils.find_filter_simple_option(opts, media_type), "filter")
+                if name in opts
+            ]
+            if any(name[0] == "/" for name in names):
+                raise FFmpegioError(
+                    "filtergraph script option is not supported for a rendition."
+                )
+            filters.append([opts.pop(name) for name in names])
+
+        # shared filters and split
+        prefix = "" if media_type == "video" else "a"
+        src = [spec]
+        if shared_filters and shared_filters.get(media_type):
+            fc = fgb.as_filterchain(shared_filters[media_type])
+            src = [(fg.add_chain(fc, src), len(fc) - 1, 0)]
+        n = len(indices)
+        if n > 1:
+            labels = [None if f else f"rendition{i}" for i, f in zip(indices, filters)]
+            cid = fg.add_chain(f"{prefix}split={n}", src, labels)
+            srcs = [[(cid, 0, k)] for k in range(n)]
+        else:
+            srcs = [src]
+
+        for i, f, src in zip(indices, filters, srcs):
+            label = f"rendition{i}"
+            if f or n == 1:
+                fc = fgb.Chain()
+                for expr in f:
+                    fc = fc + fgb.as_filterchain(expr)
+                fg.add_chain(fc if len(fc) else f"{prefix}null", src, [label])
+            stream_opts[i]["map"] = f"[{label}]"
+
+    return fg, stream_opts
+
+
 class RawInputCallablesDict(TypedDict):
     data2bytes: ToBytesCallable
     data_count: CountDataCallable
@@ -1414,8 +1588,12 @@ def process_url_inputs(
             input_info = {"src_type": "filtergraph"}
 
         elif utils.is_fileobj(url, readable=True):
-            # if not url.seekable():
-            #     raise FFmpegioNoPipeAllowed("Fileobj input must be seekable.")
+            if not url.seekable():
+                # read the source only once: probe its head and replay it to FFmpeg
+                probesize = opts.get("probesize", None)
+                url = utils.SniffedReader(
+                    url, probesize if isinstance(probesize, int) else None
+                )
             input_info = {"src_type": "fileobj", "fileobj": url}
             url = None
         elif utils.is_pipe(url):
@@ -1800,6 +1978,25 @@ def assign_output_url(args: FFmpegArgs, ofile: int, url: str):
 ########################################
 
 
+class NamedPipe(NPopen):
+    """NPopen with thread-safe creation and removal
+
+    ``namedpipe`` shares one temporary directory and a fifo counter among all
+    the pipes, which are not protected against multiple runners starting or
+    stopping concurrently in different threads.
+    """
+
+    _lock = Lock()
+
+    def __init__(self, *args, **kwargs):
+        with self._lock:
+            super().__init__(*args, **kwargs)
+
+    def close(self):
+        with self._lock:
+            super().close()
+
+
 def assign_output_pipes(
     args: FFmpegArgs,
     output_info: list[OutputInfoDict],
@@ -1845,7 +2042,7 @@ def assign_output_pipes(
                 pipe_info[i] = {"pipe": "stdout"}
         else:
             # if fileobj or buffer output, use pipe
-            pipe = NPopen("r", bufsize=0)
+            pipe = NamedPipe("r", bufsize=0)
             pipe_path = pipe.path
             pipe_info[i] = {"pipe": pipe}
         assign_output_url(args, i, pipe_path)
@@ -1898,7 +2095,10 @@ def assign_input_pipes(
             src_type = info["src_type"]
             if src_type == "fileobj":
                 assert "fileobj" in info
-                sp_kwargs["stdin"] = info["fileobj"]
+                f = info["fileobj"]
+                sp_kwargs["stdin"] = (
+                    f.open_pipe() if isinstance(f, utils.SniffedReader) else f
+                )
             elif src_type == "buffer":
                 if set_sp_kwargs_input and "buffer" in info:
                     # given data to send to subprocess
@@ -1907,7 +2107,7 @@ def assign_input_pipes(
                     sp_kwargs["stdin"] = fp.PIPE
                 pipe_info[i] = {"pipe": "stdin"}
         else:
-            pipe = NPopen("w", bufsize=0)
+            pipe = NamedPipe("w", bufsize=0)
             pipe_path = pipe.path
             pipe_info[i] = {"pipe": pipe}
         assign_input_url(args, i, pipe_path)
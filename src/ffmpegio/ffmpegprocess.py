@@ -22,6 +22,7 @@ PIPE:    Special value that indicates a pipe should be created
 from __future__ import annotations
 
 import logging
+import os
 import signal
 import subprocess as sp
 from collections import abc
@@ -31,8 +32,10 @@ from os import path
 from tempfile import TemporaryDirectory
 from threading import Thread
 
+from . import configure
 from .configure import move_global_options
-from .path import DEVNULL, PIPE, TimeoutExpired, devnull, ffmpeg
+from .filtergraph.abc import FilterGraphObject
+from .path import DEVNULL, PIPE, TimeoutExpired, check_version, devnull, ffmpeg
 from .threading import ProgressMonitorThread
 from .utils.parser import FLAG, compose, parse
 
@@ -51,6 +54,91 @@ __all__ = [
 ]
 
 
+def _script_option(name: str) -> str:
+    """FFmpeg option to read the filtergraph of the given option from a file"""
+    if check_version("7.0", ">="):
+        return f"/{name}"
+    if name in ("filter_complex", "lavfi"):
+        return "filter_complex_script"
+    return "filter_script" + {"vf": ":v", "af": ":a"}.get(name, name[6:])
+
+
+def _pipe_filtergraphs(
+    ffmpeg_args: dict, threshold: int
+) -> tuple[dict, list[tuple[int, int, bytes]]]:
+    """move oversize filtergraph options to inherited pipes
+
+    :param ffmpeg_args: FFmpeg arguments, not modified
+    :param threshold: maximum length of a filtergraph option on the command line
+    :return: FFmpeg arguments with the oversize filtergraph options replaced by
+        their script options reading ``pipe:N``, and the (read fd, write fd,
+        filtergraph) of the pipes
+    """
+
+    pipes = []
+
+    def move(opts, names):
+        new_opts = None
+        for name in names:
+            value = opts[name]
+            values = (
+                value
+                if isinstance(value, (list, tuple))
+                and not isinstance(value, FilterGraphObject)
+                else [value]
+            )
+            exprs = [v if isinstance(v, str) else str(v) for v in values]
+            if all(len(expr) <= threshold for expr in exprs):
+                continue
+
+            if new_opts is None:
+                new_opts = {**opts}
+            inline = []
+            scripts = []
+            for v, expr in zip(values, exprs):
+                if len(expr) > threshold:
+                    fd_r, fd_w = os.pipe()
+                    pipes.append((fd_r, fd_w, expr.encode()))
+                    scripts.append(f"pipe:{fd_r}")
+                else:
+                    inline.append(v)
+            if inline:
+                new_opts[name] = inline if len(inline) > 1 else inline[0]
+            else:
+                del new_opts[name]
+            script_name = _script_option(name)
+            new_opts[script_name] = scripts if len(scripts) > 1 else scripts[0]
+        return opts if new_opts is None else new_opts
+
+    gopts = ffmpeg_args.get("global_options", None) or {}
+    names = [name for name in ("filter_complex", "lavfi") if gopts.get(name)]
+    new_gopts = move(gopts, names) if names else gopts
+
+    outputs = ffmpeg_args.get("outputs", None) or []
+    new_outputs = []
+    for url, opts in outputs:
+        names = [
+            name
+            for name, value in (opts or {}).items()
+            if value and (name in ("vf", "af", "filter") or name.startswith("filter:"))
+        ]
+        new_outputs.append((url, move(opts, names) if names else opts))
+
+    if not pipes:
+        return ffmpeg_args, pipes
+
+    return {**ffmpeg_args, "global_options": new_gopts, "outputs": new_outputs}, pipes
+
+
+def _write_pipe(fd: int, data: bytes):
+    """write data to a pipe and close it"""
+    with open(fd, "wb") as f:
+        try:
+            f.write(data)
+        except OSError:  # FFmpeg failed to start or terminated early
+            pass
+
+
 def exec(
     ffmpeg_args,
     hide_banner=True,
@@ -191,12 +279,40 @@ def exec(
         PIPE if capture_log else None if capture_log is None else DEVNULL
     )
 
+    # log the filtergraph-profiled job to a report file
+    profiler = configure.FILTERGRAPH_PROFILER
+    if profiler is not None and "env" not in sp_kwargs:
+        env = profiler.report_env(ffmpeg_args)
+        if env is not None:
+            sp_kwargs["env"] = env
+
+    # pass oversize filtergraphs through inherited pipes
+    threshold = configure.FILTERGRAPH_PIPE_THRESHOLD
+    fg_pipes = []
+    if threshold is not None and os_name != "nt" and "pass_fds" not in sp_kwargs:
+        ffmpeg_args, fg_pipes = _pipe_filtergraphs(ffmpeg_args, threshold)
+        if fg_pipes:
+            sp_kwargs["pass_fds"] = tuple(fd_r for fd_r, *_ in fg_pipes)
+
+    for _, fd_w, data in fg_pipes:
+        Thread(target=_write_pipe, args=(fd_w, data), daemon=True).start()
+
     args = compose(ffmpeg_args)
 
     # run the FFmpeg
-    return ffmpeg(
-        args, sp_run=sp_run, stdin=inpipe, stdout=outpipe, stderr=errpipe, **sp_kwargs
-    )
+    try:
+        return ffmpeg(
+            args,
+            sp_run=sp_run,
+            stdin=inpipe,
+            stdout=outpipe,
+            stderr=errpipe,
+            **sp_kwargs,
+        )
+    finally:
+        # FFmpeg holds its own copies of the read ends
+        for fd_r, *_ in fg_pipes:
+            os.close(fd_r)
 
 
 def monitor_process(proc, on_exit=None):
@@ -8,7 +8,7 @@ from typing_extensions import Iterable, Literal
 from .. import filtergraph as fgb
 from . import abc
 from . import utils as filter_utils
-from .convert import as_filter, as_filterchain, as_filtergraph
+from .convert import as_filter, as_filterchain, as_filtergraph, parse_graph
 from .exceptions import (
     FFmpegioError,
     FiltergraphConversionError,
@@ -56,9 +56,7 @@ class Chain(abc.FilterGraphObject, UserList):
         """
 
         if isinstance(filter_specs, str):
-            filter_specs, links, sws_flags = filter_utils.parse_graph(
-                filter_specs, False
-            )
+            filter_specs, links, sws_flags, _ = parse_graph(filter_specs)
             if links:
                 raise FiltergraphInvalidExpression(
                     "filter_specs with link labels cannot be represented by the Chain class. Use Graph instead."
@@ -397,7 +397,7 @@ class Filter(abc.FilterGraphObject, tuple):
             return (
                 2
                 if any(
-                    expr.find(key) >= 0
+                    str(expr).find(key) >= 0
                     for expr in (w_expr, h_expr)
                     for key in ("ref_", "rw", "rh")
                 )
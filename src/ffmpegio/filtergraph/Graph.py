@@ -15,7 +15,13 @@ from ..stream_spec import is_map_option
 from . import abc
 from . import utils as filter_utils
 from .Chain import Chain
-from .convert import as_filterchain, as_filtergraph, as_filtergraph_object
+from .convert import (
+    ParsedGraph,
+    as_filterchain,
+    as_filtergraph,
+    as_filtergraph_object,
+    parse_graph,
+)
 from .exceptions import (
     FiltergraphInvalidExpression,
     FiltergraphInvalidIndex,
@@ -182,11 +188,13 @@ class Graph(abc.FilterGraphObject, UserList):
                                   'out':    (None,    (1,0,0))})
 
         """
+        shared = None
         if isinstance(filter_specs, str):
-            # parse ffmpeg filtergraph expression
-            filter_specs, links, sws_flags = filter_utils.parse_graph(
-                filter_specs, False
-            )
+            # parse ffmpeg filtergraph expression (or reuse the cached parse)
+            shared = parse_graph(filter_specs)
+            links = shared.links
+            sws_flags = shared.sws_flags
+            filter_specs = ()
         elif filter_specs is None:
             # empty graph
             filter_specs = ()
@@ -194,6 +202,10 @@ class Graph(abc.FilterGraphObject, UserList):
             # copy constructor, pull links and sws_flags aside
             links = filter_specs._links
             sws_flags = filter_specs.sws_flags and [*filter_specs.sws_flags]
+            if filter_specs._data is None:
+                # source not yet modified, keep sharing its parsed chains
+                shared = filter_specs._shared
+                filter_specs = ()
         elif isinstance(filter_specs, Filter):
             filter_specs = [[filter_specs]]
         elif isinstance(filter_specs, Chain):
@@ -201,6 +213,11 @@ class Graph(abc.FilterGraphObject, UserList):
 
         super().__init__((Chain(c) for c in filter_specs))
 
+        if shared is not None:
+            # copy-on-write: the chains are materialized on the first access
+            self._shared = shared
+            self._data = None
+
         self._links = GraphLinks(links)
         """utils.fglinks.GraphLinks: filtergraph link specifications
         """
@@ -209,6 +226,26 @@ class Graph(abc.FilterGraphObject, UserList):
         """Filter|None: swscale flags for automatically inserted scalers
         """
 
+    _shared: ParsedGraph | None = None
+    # parsed expression shared with the other objects constructed from it
+
+    _data: list[Chain] | None = None
+    # private chains, None until the shared chains are first accessed
+
+    _composed: dict | None = None
+    # cache of the last composed expressions
+
+    @property
+    def data(self) -> list[Chain]:
+        """list of filterchains"""
+        if self._data is None:
+            self._data = [Chain(c) for c in self._shared.chains]
+        return self._data
+
+    @data.setter
+    def data(self, value: list[Chain]):
+        self._data = value
+
     @property
     def links(self) -> GraphLinks | None:
         """full filtergraph link definition"""
@@ -365,6 +402,39 @@ class Graph(abc.FilterGraphObject, UserList):
         :param show_unconnected_outputs: display [UNC#] on all unconnected output pads, defaults to True
         """
 
+        flags = (show_unconnected_inputs, show_unconnected_outputs)
+        shared = self._shared
+        links_key = tuple(self._links.data.items())
+        if (
+            self._data is None
+            and self.sws_flags == shared.sws_flags
+            and links_key == tuple(shared.links.data.items())
+        ):
+            # unmodified copy of the parsed expression
+            expr = shared.composed.get(flags, None)
+            if expr is None:
+                expr = shared.composed[flags] = self._compose(*flags)
+            return expr
+
+        # reuse the last composition unless the graph has been modified since:
+        # same Filter objects in the same positions with the same links
+        chains = tuple(tuple(c) for c in self.data)
+        key = (
+            tuple(tuple(map(id, c)) for c in chains),
+            links_key,
+            self.sws_flags,
+        )
+        if self._composed is None:
+            self._composed = {}
+        cached = self._composed.get(flags, None)
+        if cached is not None and cached[1] == key:
+            return cached[2]
+
+        expr = self._compose(*flags)
+        self._composed[flags] = (chains, key, expr)  # chains keep the ids valid
+        return expr
+
+    def _compose(self, show_unconnected_inputs: bool, show_unconnected_outputs: bool):
         fg = self
 
         # label unconnected pads
@@ -431,6 +501,9 @@ class Graph(abc.FilterGraphObject, UserList):
     Available output pads: ({self.get_num_outputs()}): {", ".join((str(id[0]) for id in self.iter_output_pads()))}
 """
 
+    def __len__(self) -> int:
+        return len(self._shared.chains if self._data is None else self._data)
+
     def __setitem__(self, key, value):
         UserList.__setitem__(self, key, as_filterchain(value, copy=True))
         # TODO purge invalid links
@@ -476,6 +549,96 @@ class Graph(abc.FilterGraphObject, UserList):
         )
         self.data.extend(other.data)
 
+    def add_chain(
+        self,
+        item: Chain | Filter | str,
+        inputs: Sequence[PAD_INDEX | str | None] | None = None,
+        outputs: Sequence[str | None] | None = None,
+    ) -> int:
+        """append a filterchain and connect its pads in place
+
+        :param item: filterchain to append
+        :param inputs: sources of the unconnected input pads of ``item`` in
+            order: an output pad index or an output label of this graph to
+            link, a new input label (e.g., an input stream specifier ``'0:v'``),
+            or ``None`` to leave the pad unconnected. Defaults to leave all the
+            input pads unconnected.
+        :param outputs: labels of the unconnected output pads of ``item`` in
+            order or ``None`` to leave the pad unlabeled. Defaults to leave all
+            the output pads unlabeled.
+        :return: index of the appended chain
+
+        Unlike the filtergraph operators, which create a new ``Graph`` object,
+        this builder method modifies the graph in place, and each link or label
+        is added in (amortized) constant time. Use it to construct a filtergraph
+        with thousands of chains incrementally:
+
+        .. code:: python
+
+            fg = fgb.Graph()
+            segments = [
+                (fg.add_chain(f"trim={i}:{i + 1},setpts=PTS-STARTPTS", ["0:v"]), 1, 0)
+                for i in range(n)
+            ]
+            fg.add_chain(f"concat=n={n}", segments, ["out"])
+
+        """
+
+        fc = as_filterchain(item, copy=True)
+        if not len(fc):
+            raise ValueError("Empty filterchain cannot be appended to filtergraph.")
+
+        cid = len(self)
+        links = self._links
+
+        def pads(src, name):
+            src = [] if src is None else list(src)
+            ids = [(cid, *index) for index, *_ in getattr(fc, name)()]
+            if len(src) > len(ids):
+                raise Graph.Error(
+                    f"{len(src)} {name[5:-5]} pads specified but the chain has only {len(ids)}."
+                )
+            return [(s, id) for s, id in zip(src, ids) if s is not None]
+
+        # resolve all the links and labels before modifying the graph
+        new_links = []
+        new_labels = []
+        used = set()
+        for src, inpad in pads(inputs, "iter_input_pads"):
+            if isinstance(src, str) and not links.is_output(src):
+                label, pads_ = GraphLinks.validate_label_item(src, (inpad, None))
+                if label in links and not links.is_input_stream(label):
+                    raise Graph.Error(f"{label=} is already in use.")
+                new_labels.append((label, *pads_))
+                continue
+            if isinstance(src, str):
+                label, outpad = src, links[src][1]
+            else:
+                label, outpad = None, self.resolve_pad_index(src, is_input=False)
+                try:
+                    f = self.data[outpad[0]][outpad[1]]
+                    assert 0 <= outpad[2] < f.get_num_outputs()
+                except:
+                    raise Graph.InvalidFilterPadId("output", outpad)
+            if outpad in used:
+                raise Graph.Error(f"output pad {outpad} is specified multiple times.")
+            used.add(outpad)
+            new_links.append((inpad, outpad, label))
+        for label, outpad in pads(outputs, "iter_output_pads"):
+            label, pads_ = GraphLinks.validate_label_item(label, (None, outpad))
+            if label in links or label in used:
+                raise Graph.Error(f"{label=} is already in use.")
+            used.add(label)
+            new_labels.append((label, *pads_))
+
+        self.data.append(fc)
+        for inpad, outpad, label in new_links:
+            links.link(inpad, outpad, label)
+        for label, inpad, outpad in new_labels:
+            links.create_label(label, inpad, outpad)
+
+        return cid
+
     def insert(self, i: int, item: Chain | str):
         fc = as_filterchain(item)
         if not len(fc):
@@ -710,6 +873,32 @@ class Graph(abc.FilterGraphObject, UserList):
     def copy(self):
         return Graph(self)
 
+    def optimize(self, approximate: bool = False) -> Graph:
+        """rewrite the filtergraph to reduce its processing cost
+
+        :param approximate: ``True`` to also apply the rewrites which keep the
+            output frame size but not the exact pixel values (fusing consecutive
+            ``scale`` filters and cropping before scaling), defaults to ``False``
+        :return: optimized filtergraph (a new object)
+
+        Graphs assembled from :py:mod:`filtergraph.presets` and user chains often
+        contain redundant processing. This method drops ``null``/``anull``
+        (and ``copy``/``acopy``) filters, fuses back-to-back ``format``,
+        ``aformat``, ``scale``, and ``setsar``/``setdar`` filters when the result
+        is identical, and processes identical branches of a ``split``/``asplit``
+        filter only once. The input and output labels are preserved.
+
+        .. code:: python
+
+            fg = fgb.Graph("[in]split[a][b];[a]scale=320:240,null[o1];[b]scale=320:240[o2]")
+            fg.optimize() # [in]scale=320:240,split=2[o1][o2]
+
+        """
+
+        from .optimizer import optimize
+
+        return optimize(self, approximate)
+
     def are_linked(
         self,
         inpad: PAD_INDEX | None,
@@ -1031,6 +1220,36 @@ class Graph(abc.FilterGraphObject, UserList):
 
         others = list(as_filtergraph_object(obj) for obj in others)
 
+        if inplace and (not auto_link or len(others) == 1):
+            # append in place: only the links of others need to be relabeled
+            self.sws_flags = self._select_sws_flags([self, *others], sws_flags_policy)
+            links = self._links
+            for fg in others:
+                other = fg.links
+                pairs = (
+                    [
+                        (label, other.is_output(label))
+                        for label in other
+                        if label in links
+                        and (
+                            links.is_output(label)
+                            and other.is_input(label, exclude_stream_specs=True)
+                            or links.is_input(label, exclude_stream_specs=True)
+                            and other.is_output(label)
+                        )
+                    ]
+                    if auto_link and other is not None
+                    else ()
+                )
+                mapping = links.merge(other, len(self))
+                self.data.extend(Chain(fc) for fc in fg.iter_chains())
+                for label, is_output in pairs:
+                    in_label, out_label = (
+                        (label, mapping[label]) if is_output else (mapping[label], label)
+                    )
+                    links.link_by_labels(in_label, out_label, label=label)
+            return self
+
         new_links, sws_flags, *_ = self._stack_analyze(
             others, auto_link, sws_flags_policy
         )
@@ -1076,24 +1295,34 @@ class Graph(abc.FilterGraphObject, UserList):
                 out_label = link_mappings[out_fg][label]
                 new_links.link_by_labels(in_label, out_label, label=label)
 
-        # pick sws_flags
+        sws_flags = self._select_sws_flags(fgs, sws_flags_policy)
+
+        return new_links, sws_flags, chain_offsets, link_mappings
+
+    @staticmethod
+    def _select_sws_flags(
+        fgs: Sequence[abc.FilterGraphObject],
+        sws_flags_policy: Literal["first", "last"] | int | None,
+    ) -> str | None:
+        """pick sws_flags of the filtergraphs to be combined"""
+
         if isinstance(sws_flags_policy, int):
             fg = fgs[sws_flags_policy]
-            sws_flags = fg.sws_flags if isinstance(fg, Graph) else None
-        else:
-            iter_sws_flags = (
-                fg.sws_flags
-                for fg in (fgs if sws_flags_policy != "last" else fgs[::-1])
-                if isinstance(fg, Graph) and fg.sws_flags is not None
-            )
-            sws_flags = next(iter_sws_flags, None)
+            return fg.sws_flags if isinstance(fg, Graph) else None
 
-            if sws_flags_policy is None and next(iter_sws_flags, None) is not None:
-                raise Graph.Error(
-                    f"{sws_flags_policy=} and more than 1 filtergraphs has sws_flags"
-                )
+        iter_sws_flags = (
+            fg.sws_flags
+            for fg in (fgs if sws_flags_policy != "last" else fgs[::-1])
+            if isinstance(fg, Graph) and fg.sws_flags is not None
+        )
+        sws_flags = next(iter_sws_flags, None)
 
-        return new_links, sws_flags, chain_offsets, link_mappings
+        if sws_flags_policy is None and next(iter_sws_flags, None) is not None:
+            raise Graph.Error(
+                f"{sws_flags_policy=} and more than 1 filtergraphs has sws_flags"
+            )
+
+        return sws_flags
 
     def _stack_create(
         self,
@@ -1638,9 +1867,12 @@ class Graph(abc.FilterGraphObject, UserList):
         containing the filtergraph description.
 
         .. note::
-          Only use this function when the filtergraph description is too long for
-          OS to handle it. Presenting the filtergraph with a `filter_complex` or
-          `filter` option to FFmpeg is always a faster solution.
+          On Posix systems, :py:mod:`ffmpegprocess` already passes long
+          filtergraph options through pipes (see
+          ``configure.FILTERGRAPH_PIPE_THRESHOLD``). Only use this function
+          when the filtergraph description is too long for OS to handle it.
+          Presenting the filtergraph with a `filter_complex` or `filter`
+          option to FFmpeg is always a faster solution.
 
           Moreover, if `stdin` is available, i.e., not for a write or filter
           operation, it is more performant to pass the long filtergraph object
@@ -1760,9 +1992,12 @@ class Graph(abc.FilterGraphObject, UserList):
 
     def __ior__(self, other):
         if len(other):
-            fg = self | other if len(self) else Graph(other)
-            self.data = fg.data
-            self._links = fg._links
+            if len(self):
+                self.stack(other, inplace=True)
+            else:
+                fg = Graph(other)
+                self.data = fg.data
+                self._links = fg._links
         return self
 
     def __iadd__(self, other):
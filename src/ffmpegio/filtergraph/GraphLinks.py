@@ -57,6 +57,101 @@ GraphLinks class design:
 """
 
 
+_re_label_stem = re.compile(r"(.+?)(\d+)$")
+
+
+class _LinkTable(dict):
+    """``GraphLinks`` storage: dict of labels with the reverse look-up tables
+
+    Every assignment and deletion keeps the following tables in sync so the
+    pads and labels can be looked up in constant time:
+
+    - ``inpads``: input pad index to its label
+    - ``outpads``: output pad index to its label
+    - ``stems``: label stem (label without its trailing number) to the largest
+      trailing number ever used (never decreases)
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.inpads: dict[PAD_INDEX_, str | int] = {}
+        self.outpads: dict[PAD_INDEX_, str | int] = {}
+        self.stems: dict[str, int] = {}
+        for label, value in self.items():
+            self._index(label, value)
+
+    def _index(self, label: str | int, value: PAD_PAIR_):
+        inpads, outpad = value
+        for pad in GraphLinks.iter_inpad_ids(inpads):
+            self.inpads[pad] = label
+        if outpad is not None:
+            self.outpads[outpad] = label
+        if isinstance(label, str):
+            m = _re_label_stem.search(label)
+            key, j = (m[1], int(m[2])) if m else (label, 0)
+            if self.stems.get(key, -1) < j:
+                self.stems[key] = j
+
+    def _unindex(self, label: str | int, value: PAD_PAIR_):
+        inpads, outpad = value
+        for pad in GraphLinks.iter_inpad_ids(inpads):
+            if self.inpads.get(pad, None) == label:
+                del self.inpads[pad]
+        if outpad is not None and self.outpads.get(outpad, None) == label:
+            del self.outpads[outpad]
+
+    def __setitem__(self, label: str | int, value: PAD_PAIR_):
+        old = self.get(label, None)
+        if old is not None:
+            (old_inpads, old_outpad), (inpads, outpad) = old, value
+            if (
+                old_outpad is None
+                and outpad is None
+                and isinstance(old_inpads[0], tuple)
+                and isinstance(inpads[0], tuple)
+                and inpads[: len(old_inpads)] == old_inpads
+            ):
+                # input stream connected to additional pads: index only the new
+                super().__setitem__(label, value)
+                for pad in inpads[len(old_inpads) :]:
+                    self.inpads[pad] = label
+                return
+            self._unindex(label, old)
+        super().__setitem__(label, value)
+        self._index(label, value)
+
+    def __delitem__(self, label: str | int):
+        self._unindex(label, self[label])
+        super().__delitem__(label)
+
+    def pop(self, label: str | int, *args):
+        if label in self:
+            self._unindex(label, self[label])
+        return super().pop(label, *args)
+
+    def popitem(self) -> tuple[str | int, PAD_PAIR_]:
+        label, value = super().popitem()
+        self._unindex(label, value)
+        return label, value
+
+    def setdefault(self, label: str | int, default: PAD_PAIR_) -> PAD_PAIR_:
+        if label not in self:
+            self[label] = default
+        return self[label]
+
+    def update(self, *args, **kwargs):
+        for label, value in dict(*args, **kwargs).items():
+            self[label] = value
+
+    def clear(self):
+        super().clear()
+        self.inpads.clear()
+        self.outpads.clear()
+
+    def copy(self) -> _LinkTable:
+        return _LinkTable(self)
+
+
 class GraphLinks(UserDict):
     class Error(FFmpegioError):
         pass
@@ -443,6 +538,15 @@ class GraphLinks(UserDict):
 
     _auto_count: int = 0
 
+    @property
+    def data(self) -> _LinkTable:
+        """label-to-pad-pair mapping"""
+        return self._data
+
+    @data.setter
+    def data(self, value: dict[str | int, PAD_PAIR_]):
+        self._data = value if isinstance(value, _LinkTable) else _LinkTable(value)
+
     def __init__(
         self,
         links: dict[str | int, PAD_PAIR] | GraphLinks | None = None,
@@ -858,6 +962,19 @@ class GraphLinks(UserDict):
 
             other = self.validate(other)
 
+        if not self._overlaps(other):
+            # no conflict possible: insert directly without a working copy
+            data = self.data
+            labels = []
+            for l, v in other.items():
+                if v[0] is None or v[1] is None:
+                    labels.append(l)
+                else:
+                    data[self._auto_label() if isinstance(l, int) else l] = v
+            for l in labels:
+                data[l] = other[l]
+            return
+
         # set aside labels
         labels = {
             l: is_input
@@ -891,6 +1008,19 @@ class GraphLinks(UserDict):
         # finalize
         self.data = fglinks.data
 
+    def _overlaps(self, other: Mapping[str | int, PAD_PAIR_]) -> bool:
+        """``True`` if any label or pad of validated ``other`` is used"""
+
+        data = self.data
+        for l, (inpads, outpad) in other.items():
+            if (
+                l in data
+                or (outpad is not None and outpad in data.outpads)
+                or any(pad in data.inpads for pad in self.iter_inpad_ids(inpads))
+            ):
+                return True
+        return False
+
     def _is_inpad_used(self, pad: PAD_INDEX_) -> bool | str:
         """check if given input pad index is already linked
 
@@ -900,11 +1030,10 @@ class GraphLinks(UserDict):
             yet, or ``False`` if no record is found.
         """
 
-        for label, (inpads, outpad) in self.items():
-            for inpad in self.iter_inpad_ids(inpads):
-                if pad == inpad:
-                    return label if outpad is None else True
-        return False
+        label = self.find_inpad_label(pad)
+        if label is None:
+            return False
+        return label if self.data[label][1] is None else True
 
     def _is_outpad_used(self, pad: PAD_INDEX_) -> bool | str:
         """check if given output pad index is already linked
@@ -914,10 +1043,10 @@ class GraphLinks(UserDict):
             the output label ``str`` if the pad has a label but not connected
             yet, or ``False`` if no record is found.
         """
-        for label, (inpad, outpad) in self.items():
-            if pad == outpad:
-                return label if inpad is None else True
-        return False
+        label = self.find_outpad_label(pad)
+        if label is None:
+            return False
+        return label if self.data[label][0] is None else True
 
     def _refresh_autolabels(self):
 
@@ -984,9 +1113,9 @@ class GraphLinks(UserDict):
 
                     if label in unique_labels:
                         # the pad label already used, set the trailing index to minimum unused
-                        next_label_id[key] = i = next_label_id[key] + 1
+                        next_label_id[key] = j = next_label_id[key] + 1
                         # create new label by append trailing index
-                        new_label = f"{key}{i}"
+                        new_label = f"{key}{j}"
                     else:
                         # new pad label, keep the maximum trailing digit tracker
                         j = int(m[2]) if m else 0
@@ -1017,6 +1146,52 @@ class GraphLinks(UserDict):
 
         return combined, mappings
 
+    def merge(
+        self, other: GraphLinks | None, chain_offset: int
+    ) -> dict[str | int, str | int]:
+        """merge the links of another filtergraph stacked after this one in place
+
+        :param other: links of the stacked filtergraph. If ``None``, nothing is
+            merged.
+        :param chain_offset: number of the chains preceding the stacked
+            filtergraph (i.e., the chain index offset of ``other``)
+        :return: mapping of the old labels of ``other`` to their new labels
+
+        The labels are resolved in the same manner as :py:meth:`combine` except
+        that the labels of this object are never changed: duplicate ``str``
+        labels of ``other`` are renamed with unique trailing digits, ``int``
+        labels are renumbered, and the input pads sharing an input stream are
+        combined. The cost is proportional to the size of ``other`` only.
+        """
+
+        mapping = {}
+        if other is None:
+            return mapping
+
+        def shift(pad):
+            return pad and (pad[0] + chain_offset, *pad[1:])
+
+        data = self.data
+        for label, (in_pad, out_pad) in other.items():
+            if isinstance(label, int):
+                new_label = self._auto_label()
+            elif other.is_input_stream(label):
+                mapping[label] = self.create_label(
+                    label, tuple(shift(pad) for pad in in_pad)
+                )
+                continue
+            elif label in data:
+                m = _re_label_stem.search(label)
+                key = m[1] if m else label
+                new_label = f"{key}{data.stems[key] + 1}"
+            else:
+                new_label = label
+
+            data[new_label] = (shift(in_pad), shift(out_pad))
+            mapping[label] = new_label
+
+        return mapping
+
     @staticmethod
     def pair_unconnected_labels(
         link_objs: Sequence[GraphLinks | None],
@@ -1528,15 +1703,8 @@ class GraphLinks(UserDict):
         :return: found label or None if no match found
         """
         try:
-            return next(
-                (
-                    label
-                    for label, dst1, _ in self.iter_input_pads()
-                    if dst1 is not None and inpad == dst1
-                ),
-                None,
-            )
-        except StopIteration:
+            return self.data.inpads.get(inpad, None)
+        except TypeError:  # unhashable, not a valid pad index
             return None
 
     def find_outpad_label(self, outpad: PAD_INDEX) -> str | int | None:
@@ -1546,12 +1714,8 @@ class GraphLinks(UserDict):
         :return: found label or None if outpad is None
         """
         try:
-            return next(
-                label
-                for label, (_, src1) in self.data.items()
-                if src1 is not None and outpad == src1
-            )
-        except StopIteration:
+            return self.data.outpads.get(outpad, None)
+        except TypeError:  # unhashable, not a valid pad index
             return None
 
     def are_linked(
@@ -1583,31 +1747,15 @@ class GraphLinks(UserDict):
         outpad = self.validate_pad_idx(outpad, none_ok=True)
 
         if inpad is None:  # any link with outpad
-            return any(
-                inp is not None and outp == outpad
-                for _, inp, outp in self.iter_output_pads()
-            )
-        elif outpad is None:  # any link with inpad
-            for label, inp, outp in self.iter_input_pads():
-                if inp is None:
-                    continue
-
-                if inp == inpad and outp is not None:
-                    return True
+            label = self.find_outpad_label(outpad)
+            return label is not None and self.data[label][0] is not None
 
-                # check input stream link
-                if check_input_stream is not False and isinstance(inp[0], tuple):
-                    if check_input_stream is True and any(p == inpad for p in inp[0]):
-                        return True
-
-                    if check_input_stream is None and len(inp) == 1 and inp[0] == inpad:
-                        # ambiguous input stream connection if it is also a valid link label
-                        return re.match(r"[a-zA-Z0-9_]+$", label) is not None
-        else:  # specific pairing
-            return any(
-                inp == inpad and outp == outpad for _, inp, outp in self.iter_links()
-            )
-        return False
+        label = self.find_inpad_label(inpad)
+        if label is None:
+            return False
+        outp = self.data[label][1]
+        # any link with inpad or specific pairing
+        return outp is not None if outpad is None else outp == outpad
 
     def chain_has_link(
         self, chain_id: int, check_input: bool = True, check_output: bool = True
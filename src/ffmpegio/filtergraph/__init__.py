@@ -111,6 +111,7 @@ from .convert import (
     as_filtergraph_object,
     as_filtergraph_object_like,
     atleast_filterchain,
+    parse_cache_clear,
 )
 from .exceptions import (
     FiltergraphConversionError,
@@ -120,6 +121,7 @@ from .exceptions import (
 )
 from .Filter import Filter
 from .Graph import Graph
+from .profiler import FilterProfile, FilterTiming, profile_filters
 
 # chain | filter | pad
 
@@ -132,6 +134,7 @@ __all__ = [
     "as_filtergraph_object",
     "as_filtergraph_object_like",
     "atleast_filterchain",
+    "parse_cache_clear",
     "connect",
     "join",
     "attach",
@@ -140,6 +143,9 @@ __all__ = [
     "Filter",
     "Chain",
     "Graph",
+    "FilterProfile",
+    "FilterTiming",
+    "profile_filters",
     "FiltergraphInvalidIndex",
     "FiltergraphPadNotFoundError",
     "FiltergraphConversionError",
@@ -1,7 +1,61 @@
 from __future__ import annotations
 
+from functools import lru_cache
+from typing import NamedTuple
+
 from .. import filtergraph as fgb
 from . import utils as filter_utils
+from .GraphLinks import GraphLinks
+
+PARSE_CACHE_SIZE = 1024
+"""int: maximum number of parsed filtergraph expressions to retain"""
+
+
+class ParsedGraph(NamedTuple):
+    """parsed filtergraph expression, shared by all the objects built from it"""
+
+    chains: tuple[tuple[fgb.Filter, ...], ...]
+    """immutable filters of each chain"""
+    links: GraphLinks
+    """validated link specifications (copied, never modified)"""
+    sws_flags: str | None
+    """swscale flags"""
+    composed: dict[tuple[bool, bool], str]
+    """composed expressions keyed by the show_unconnected_* flags"""
+
+
+@lru_cache(PARSE_CACHE_SIZE * 4)
+def _intern_filter(expr: str) -> fgb.Filter:
+    # same Filter object for the same (escaped) filter expression
+    return as_filter(expr)
+
+
+@lru_cache(PARSE_CACHE_SIZE)
+def parse_graph(expr: str) -> ParsedGraph:
+    """parse filtergraph expression with a least-recently-used cache
+
+    :param expr: filtergraph expression
+    :return: parsed filtergraph. Its content must not be modified.
+
+    ``Graph`` and ``Chain`` objects constructed from the same expression
+    share the ``Filter`` objects of the returned ``ParsedGraph``. The
+    ``Filter`` objects are also shared among the expressions containing the
+    same filter.
+    """
+
+    specs, links, sws_flags = filter_utils.parse_graph(expr, False)
+    return ParsedGraph(
+        tuple(tuple(_intern_filter(spec) for spec in chain) for chain in specs),
+        GraphLinks(links),
+        None if sws_flags is None else str(sws_flags),
+        {},
+    )
+
+
+def parse_cache_clear():
+    """clear the cache of the parsed filtergraph expressions"""
+    parse_graph.cache_clear()
+    _intern_filter.cache_clear()
 
 
 def as_filter(filter_spec: str | fgb.abc.FilterGraphObject) -> fgb.Filter:
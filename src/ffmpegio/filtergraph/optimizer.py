@@ -0,0 +1,432 @@
+"""ffmpegio.filtergraph.optimizer Module - filtergraph rewriting passes
+
+The rewrites are applied to a working copy of a filtergraph (a list of lists of
+filters and a link dict). Each pass rewrites as much as it can and reports if it
+changed the graph, and the passes are repeated until none of them applies:
+
+- ``split``/``asplit`` branches with identical filterchains are processed once
+  and split afterwards
+- ``null``, ``anull``, ``copy``, and ``acopy`` filters are dropped
+- chains linked by a single-output and single-input filter pair are joined
+- back-to-back filters are fused: ``format`` (intersection of the pixel
+  formats), identical ``aformat``, identical fixed-size ``scale`` (the second
+  is a passthrough), and ``setsar``/``setdar`` (the last fixed value wins)
+
+With ``approximate=True``, rewrites which keep the output frame size but not
+the exact pixel values are also applied:
+
+- back-to-back ``scale`` filters to a fixed size are fused into the last
+- ``scale`` to a fixed size followed by a fixed ``crop`` is reordered to crop
+  first (in the input coordinates) and scale only the cropped area
+
+Filters with an instance id (``name@id``) are never modified as they may be
+targeted by commands.
+"""
+
+from __future__ import annotations
+
+import re
+
+from .. import filtergraph as fgb
+from .._typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from .Graph import Graph
+    from .typing import PAD_INDEX
+
+_null_filters = {"null", "anull", "copy", "acopy"}
+_split_filters = {"split": "null", "asplit": "anull"}
+_re_ratio = re.compile(r"\d+(?:[:/]\d+|\.\d*)?$")
+
+
+def optimize(fg: Graph, approximate: bool = False) -> Graph:
+    """optimize a filtergraph
+
+    :param fg: source filtergraph (not modified)
+    :param approximate: ``True`` to also apply the rewrites which change the
+        output pixel values slightly, defaults to ``False``
+    :return: optimized filtergraph
+    """
+
+    work = _Work(fg)
+    while (
+        _dedupe_split_branches(work)
+        | _drop_null_filters(work)
+        | _join_chains(work)
+        | _fuse_filters(work, approximate)
+    ):
+        pass
+    return work.to_graph()
+
+
+def _num_pads(f: fgb.Filter) -> tuple[int | None, int | None]:
+    try:
+        return f.get_num_inputs(), f.get_num_outputs()
+    except Exception:
+        return None, None
+
+
+def _options(f: fgb.Filter) -> dict[str, Any] | None:
+    """get the options of a filter keyed by their full names (None if unknown)"""
+    try:
+        infos = f.info.options
+    except Exception:
+        return None
+    names = {a: o.name for o in infos for a in (o.name, *o.aliases)}
+    try:
+        opts = {infos[i].name: v for i, v in enumerate(f.ordered_options)}
+        opts.update((names[k], v) for k, v in f.named_options.items())
+    except (IndexError, KeyError):
+        return None
+    return opts
+
+
+def _as_size(value: Any) -> int | None:
+    """return the value if a positive integer constant"""
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return None
+    return value if value > 0 else None
+
+
+class _Work:
+    """mutable working copy of a filtergraph"""
+
+    def __init__(self, fg: Graph):
+        self.chains = [list(fc) for fc in fg.iter_chains()]
+        self.links = {
+            label: [pads, outpad] for label, (pads, outpad) in fg.links.items()
+        }
+        self.sws_flags = fg.sws_flags
+
+    def to_graph(self) -> Graph:
+        return fgb.Graph(
+            self.chains,
+            {label: tuple(value) for label, value in self.links.items()},
+            self.sws_flags,
+        )
+
+    @staticmethod
+    def is_stream(pads) -> bool:
+        return pads is not None and isinstance(pads[0], tuple)
+
+    def find_input(self, pad: PAD_INDEX) -> str | int | None:
+        for label, (pads, _) in self.links.items():
+            if pads == pad or (self.is_stream(pads) and pad in pads):
+                return label
+        return None
+
+    def find_output(self, pad: PAD_INDEX) -> str | int | None:
+        for label, (_, outpad) in self.links.items():
+            if outpad == pad:
+                return label
+        return None
+
+    def map_pads(
+        self,
+        map_input: Callable[[PAD_INDEX], PAD_INDEX],
+        map_output: Callable[[PAD_INDEX], PAD_INDEX],
+    ):
+        for value in self.links.values():
+            pads, outpad = value
+            if self.is_stream(pads):
+                value[0] = tuple(map_input(pad) for pad in pads)
+            elif pads is not None:
+                value[0] = map_input(pads)
+            if outpad is not None:
+                value[1] = map_output(outpad)
+
+    def remove_filter(self, cid: int, fid: int) -> bool:
+        """remove a single-input, single-output filter from a multi-filter chain"""
+
+        chain = self.chains[cid]
+        nin = nout = 0
+        if fid + 1 < len(chain):
+            nin = _num_pads(chain[fid + 1])[0]
+        if fid > 0:
+            nout = _num_pads(chain[fid - 1])[1]
+        if nin is None or nout is None:
+            return False
+
+        # the pads of the removed filter are taken over by the chained pads of
+        # its neighbors
+        def map_input(pad):
+            c, f, p = pad
+            if c != cid or f < fid:
+                return pad
+            return (c, f - 1, p) if f > fid else (c, f, nin - 1)
+
+        def map_output(pad):
+            c, f, p = pad
+            if c != cid or f < fid:
+                return pad
+            return (c, f - 1, p) if f > fid else (c, f - 1, nout - 1)
+
+        self.map_pads(map_input, map_output)
+        del chain[fid]
+        return True
+
+    def remove_chain(self, cid: int):
+        """remove a chain (no link may refer to it)"""
+
+        def map_pad(pad):
+            return pad if pad[0] < cid else (pad[0] - 1, *pad[1:])
+
+        self.map_pads(map_pad, map_pad)
+        del self.chains[cid]
+
+    def bypass_chain(self, cid: int) -> bool:
+        """remove a single-filter chain by connecting its input and output
+        sides directly"""
+
+        inpad = outpad = (cid, 0, 0)
+        in_label = self.find_input(inpad)
+        out_label = self.find_output(outpad)
+        if in_label is None or out_label is None:
+            return False
+
+        src_pads, src = self.links[in_label]
+        dst, _ = self.links[out_label]
+        if src is not None:
+            # fed by another filter: connect it to the output side
+            del self.links[in_label]
+            self.links[out_label][1] = src
+        elif dst is not None:
+            # fed by an input label: connect it to the filter on the output side
+            del self.links[out_label]
+            self.links[in_label][0] = (
+                tuple(dst if pad == inpad else pad for pad in src_pads)
+                if self.is_stream(src_pads)
+                else dst
+            )
+        else:
+            # input label to output label: need a filter in between
+            return False
+
+        self.remove_chain(cid)
+        return True
+
+
+def _drop_null_filters(work: _Work) -> bool:
+    changed = False
+    cid = 0
+    while cid < len(work.chains):
+        chain = work.chains[cid]
+        fid = 0
+        while fid < len(chain):
+            f = chain[fid]
+            if f.fullname in _null_filters and not (f.ordered_options or f[-1]):
+                if len(chain) > 1:
+                    if work.remove_filter(cid, fid):
+                        changed = True
+                        continue
+                elif work.bypass_chain(cid):
+                    changed = True
+                    break
+            fid += 1
+        else:
+            cid += 1
+    return changed
+
+
+def _fuse_pair(
+    f0: fgb.Filter, f1: fgb.Filter, approximate: bool
+) -> list[fgb.Filter] | None:
+    """returns the filters to replace a pair of chained filters"""
+
+    name = f0.fullname
+    if name not in ("format", "aformat", "scale", "setsar", "setdar"):
+        return None
+
+    opts0 = _options(f0)
+    opts1 = _options(f1)
+    if opts0 is None or opts1 is None:
+        return None
+
+    if name == f1.fullname:
+        if name == "format":
+            if opts0.keys() == opts1.keys() == {"pix_fmts"}:
+                fmts0 = str(opts0["pix_fmts"]).split("|")
+                fmts = [
+                    fmt for fmt in str(opts1["pix_fmts"]).split("|") if fmt in fmts0
+                ]
+                if fmts:  # a passthrough filter
+                    return [fgb.Filter("format", "|".join(fmts))]
+        elif name == "aformat":
+            if opts0 == opts1:
+                return [f1]
+        elif name in ("setsar", "setdar"):
+            value = opts1.get("sar" if name == "setsar" else "dar")
+            if value is not None and _re_ratio.match(str(value)):
+                return [f1]
+        elif name == "scale":
+            if (
+                opts1.keys() <= {"w", "h", "flags"}
+                and _as_size(opts1.get("w"))
+                and _as_size(opts1.get("h"))
+                and (
+                    opts0 == opts1
+                    or (
+                        approximate
+                        and opts0.keys() <= {"w", "h", "flags"}
+                        and _num_pads(f0) == (1, 1)
+                    )
+                )
+            ):
+                # identical: the second is a passthrough
+                return [f1]
+
+    elif approximate and name == "scale" and f1.fullname == "crop":
+        w, h = _as_size(opts0.get("w")), _as_size(opts0.get("h"))
+        if (
+            w
+            and h
+            and opts0.keys() <= {"w", "h", "flags"}
+            and opts1.keys() <= {"out_w", "out_h", "x", "y"}
+        ):
+            crop = {k: _as_size(v) if k[0] == "o" else v for k, v in opts1.items()}
+            if all(
+                isinstance(v, int) and not isinstance(v, bool) and v >= 0
+                for v in crop.values()
+            ):
+                cw = crop.get("out_w", w)
+                ch = crop.get("out_h", h)
+                # crop the source area first, then scale only the cropped area
+                kwargs = {"w": f"{cw}*iw/{w}", "h": f"{ch}*ih/{h}"}
+                if "x" in crop:
+                    kwargs["x"] = f"{crop['x']}*iw/{w}"
+                if "y" in crop:
+                    kwargs["y"] = f"{crop['y']}*ih/{h}"
+                scale = {"w": cw, "h": ch}
+                if "flags" in opts0:
+                    scale["flags"] = opts0["flags"]
+                return [fgb.Filter("crop", **kwargs), fgb.Filter("scale", **scale)]
+
+    return None
+
+
+def _fuse_filters(work: _Work, approximate: bool) -> bool:
+    changed = False
+    for cid, chain in enumerate(work.chains):
+        fid = 0
+        while fid + 1 < len(chain):
+            new = _fuse_pair(chain[fid], chain[fid + 1], approximate)
+            if new is not None and len(new) == 1:
+                # both filters are single-input, single-output filters
+                if work.remove_filter(cid, fid):
+                    chain[fid] = new[0]
+                    changed = True
+                else:
+                    fid += 1
+            elif new is not None and new != chain[fid : fid + 2]:
+                chain[fid : fid + 2] = new
+                changed = True
+                fid += 1
+            else:
+                fid += 1
+    return changed
+
+
+def _join_chains(work: _Work) -> bool:
+    """join the chains linked between single-output and single-input filters"""
+    chains = work.chains
+    for label, (dst, src) in work.links.items():
+        if src is None or dst is None or work.is_stream(dst):
+            continue
+        cid, fid, p = src
+        cid1 = dst[0]
+        if (
+            cid1 == cid
+            or fid != len(chains[cid]) - 1
+            or dst[1:] != (0, 0)
+            or _num_pads(chains[cid][-1])[1] != 1
+            or _num_pads(chains[cid1][0])[0] != 1
+        ):
+            continue
+
+        del work.links[label]
+        n = len(chains[cid])
+
+        def map_pad(pad):
+            return pad if pad[0] != cid1 else (cid, pad[1] + n, pad[2])
+
+        work.map_pads(map_pad, map_pad)
+        chains[cid].extend(chains[cid1])
+        chains[cid1] = []
+        work.remove_chain(cid1)
+        return True
+    return False
+
+
+def _is_simple_chain(chain: list[fgb.Filter]) -> bool:
+    """True if all the filters have one input and one output"""
+    return all(_num_pads(f) == (1, 1) for f in chain)
+
+
+def _dedupe_split_branches(work: _Work) -> bool:
+    chains = work.chains
+    links = work.links
+    for sid, schain in enumerate(chains):
+        split = schain[-1]
+        if split.fullname not in _split_filters:
+            continue
+        fid = len(schain) - 1
+        n = _num_pads(split)[1]
+        if n is None:
+            continue
+
+        # group the branches, each of which must be a complete chain
+        branches = {}
+        for p in range(n):
+            label = work.find_output((sid, fid, p))
+            if label is None:
+                continue
+            dst = links[label][0]
+            if dst is None or work.is_stream(dst) or dst[1:] != (0, 0):
+                continue
+            cid = dst[0]
+            chain = chains[cid]
+            if cid == sid or not _is_simple_chain(chain):
+                continue
+            out_label = work.find_output((cid, len(chain) - 1, 0))
+            if out_label is None:
+                continue
+            key = tuple(f.compose() for f in chain)
+            branches.setdefault(key, []).append((p, label, cid, out_label))
+
+        group = next((g for g in branches.values() if len(g) > 1), None)
+        if group is None:
+            continue
+
+        # keep the first branch and split its output
+        cid0 = group[0][2]
+        fid0 = len(chains[cid0])
+        chains[cid0].append(fgb.Filter(split.name, len(group)))
+        for i, (_, _, _, out_label) in enumerate(group):
+            links[out_label][1] = (cid0, fid0, i)
+
+        # remove the other branches from the split filter
+        removed = sorted(p for p, *_ in group[1:])
+        for _, label, _, _ in group[1:]:
+            del links[label]
+
+        def map_output(pad):
+            c, f, p = pad
+            if (c, f) != (sid, fid):
+                return pad
+            return (c, f, p - sum(r < p for r in removed))
+
+        work.map_pads(lambda pad: pad, map_output)
+        m = n - len(removed)
+        schain[-1] = (
+            fgb.Filter(split.name, m)
+            if m > 1
+            else fgb.Filter(_split_filters[split.name])
+        )
+
+        for cid in sorted((cid for *_, cid, _ in group[1:]), reverse=True):
+            work.remove_chain(cid)
+        return True
+
+    return False
@@ -0,0 +1,344 @@
+"""ffmpegio.filtergraph.profiler Module - per-filter timing of filtergraph jobs
+
+Each profiled filter (or chain) ``F`` is wrapped as::
+
+    bench=start,F,metadata@fpN=mode=print:key=lavfi.bench.start_time,bench=stop
+
+(``abench`` and ``ametadata`` for audio). ``bench=stop`` logs the time each
+frame spent since ``bench=start``, but its log lines only identify the filter
+instance by its memory address. The tagged ``metadata`` filter prints a line
+immediately before it, which associates the address with the tag ``fpN``.
+
+The instrumented FFmpeg jobs write their logs to report files (``FFREPORT``
+environment variable) so the timing lines are retrieved regardless of how the
+jobs handle their stderr.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from contextlib import contextmanager
+from glob import glob
+from itertools import count
+from tempfile import TemporaryDirectory
+
+from .. import filtergraph as fgb
+from .._typing import TYPE_CHECKING, Iterable, Literal, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    from ..configure import FFmpegArgs
+    from .Graph import Graph
+
+__all__ = ["FilterTiming", "FilterProfile", "profile_filters"]
+
+_tags = count()
+_re_line = re.compile(r"\[(\S+) @ (0x[0-9a-fA-F]+)\] (?:frame:|t:([\d.]+) )")
+
+
+class FilterTiming(NamedTuple):
+    """processing time of a profiled filter (or chain)"""
+
+    graph: int  #: index of the profiled filtergraph
+    index: tuple[int, ...]  #: (chain, filter) index or (chain,) index
+    filter: fgb.Filter | fgb.Chain  #: profiled filter or chain
+    frames: int  #: number of timed frames
+    total: float  #: total processing time in seconds
+    mean: float  #: mean processing time per frame in seconds
+    max: float  #: maximum processing time per frame in seconds
+    percentiles: dict[float, float]  #: percentiles of processing time per frame
+
+
+def _percentile(values: list[float], q: float) -> float:
+    """linearly interpolated percentile of sorted values"""
+    x = (len(values) - 1) * q / 100
+    i = int(x)
+    return (
+        values[i]
+        if i + 1 >= len(values)
+        else values[i] + (values[i + 1] - values[i]) * (x - i)
+    )
+
+
+def _media_type(f: fgb.Filter, port: Literal["input", "output"]) -> str | None:
+    try:
+        n = f.get_num_inputs() if port == "input" else f.get_num_outputs()
+        return f.get_pad_media_type(port, 0) if n == 1 else None
+    except Exception:
+        return None
+
+
+class FilterProfile:
+    """per-filter processing time report of filtergraph jobs
+
+    :param per: ``'filter'`` to time each filter or ``'chain'`` to time each
+        filterchain, defaults to ``'filter'``
+    :param percentiles: percentiles of the per-frame processing time to report,
+        defaults to ``(50, 90, 99)``
+
+    Only the filters (chains) with one input and one output of the same media
+    type can be timed. The others are listed in ``unprofiled``. The time of a
+    filter which buffers frames (e.g., ``fps`` or ``reverse``) includes the time
+    the frames are held in the filter.
+
+    Use :py:func:`profile_filters` to profile ``ffmpegio`` jobs, or
+    :py:meth:`instrument` a filtergraph, run FFmpeg with it, and
+    :py:meth:`parse_log` the FFmpeg log (at the ``info`` level).
+    """
+
+    def __init__(
+        self,
+        per: Literal["filter", "chain"] = "filter",
+        percentiles: Iterable[float] = (50, 90, 99),
+    ):
+        if per not in ("filter", "chain"):
+            raise ValueError(f"{per=} must be either 'filter' or 'chain'.")
+        self.per = per
+        self.percentiles = tuple(percentiles)
+        #: profiled filtergraphs
+        self.graphs: list[Graph] = []
+        #: filters (chains) which could not be timed: (graph, index, filter) tuples
+        self.unprofiled: list[tuple[int, tuple[int, ...], fgb.Filter | fgb.Chain]] = []
+        self._units: dict[str, tuple[int, tuple[int, ...], fgb.Filter | fgb.Chain]] = {}
+        self._samples: dict[str, list[float]] = {}
+        self._instrumented: list[Graph] = []
+        self._report_dir: str | None = None
+        self._jobs = 0
+
+    def _wrap(self, gid, index, obj, fin, fout) -> list[fgb.Filter] | None:
+        media_type = _media_type(fin, "input")
+        if media_type is None or media_type != _media_type(fout, "output"):
+            self.unprofiled.append((gid, index, obj))
+            return None
+
+        tag = f"fp{next(_tags)}"
+        self._units[tag] = (gid, index, obj)
+        self._samples[tag] = []
+        prefix = "" if media_type == "video" else "a"
+        return [
+            fgb.Filter(f"{prefix}bench", "start"),
+            fgb.Filter(
+                fgb.Filter(
+                    f"{prefix}metadata", mode="print", key="lavfi.bench.start_time"
+                ),
+                filter_id=tag,
+            ),
+            fgb.Filter(f"{prefix}bench", "stop"),
+        ]
+
+    def instrument(self, fg: str | fgb.abc.FilterGraphObject) -> Graph:
+        """wrap the filters (chains) of a filtergraph with timing filters
+
+        :param fg: filtergraph to profile
+        :return: instrumented filtergraph
+        """
+
+        fg = fgb.as_filtergraph(fg)
+        gid = len(self.graphs)
+        self.graphs.append(fg)
+
+        chains = []
+        pos = []  # new positions of the filters: (input index, filter, output index)
+        for cid, fc in enumerate(fg.iter_chains()):
+            filters = []
+            cpos = []
+            if self.per == "chain":
+                wrap = self._wrap(gid, (cid,), fc, fc[0], fc[-1])
+                if wrap is None:
+                    cpos = [(j, j, j) for j in range(len(fc))]
+                    filters = list(fc)
+                else:
+                    n = len(fc)
+                    cpos = [(j + 1, j + 1, j + 1) for j in range(n)]
+                    cpos[0] = (0, 1, cpos[0][2])
+                    cpos[-1] = (cpos[-1][0], n, n + 2)
+                    filters = [wrap[0], *fc, *wrap[1:]]
+            else:
+                for fid, f in enumerate(fc):
+                    wrap = self._wrap(gid, (cid, fid), f, f, f)
+                    j = len(filters)
+                    if wrap is None:
+                        cpos.append((j, j, j))
+                        filters.append(f)
+                    else:
+                        cpos.append((j, j + 1, j + 3))
+                        filters.extend((wrap[0], f, *wrap[1:]))
+            chains.append(filters)
+            pos.append(cpos)
+
+        def map_input(pad):
+            c, f, p = pad
+            j_in, j, _ = pos[c][f]
+            return (c, j_in, 0) if j_in != j else (c, j, p)
+
+        def map_output(pad):
+            c, f, p = pad
+            _, j, j_out = pos[c][f]
+            return (c, j_out, 0) if j_out != j else (c, j, p)
+
+        links = {}
+        for label, (inpads, outpad) in fg.links.items():
+            if inpads is not None:
+                inpads = (
+                    tuple(map_input(pad) for pad in inpads)
+                    if isinstance(inpads[0], tuple)
+                    else map_input(inpads)
+                )
+            links[label] = (inpads, outpad and map_output(outpad))
+
+        return fgb.Graph(chains, links, fg.sws_flags)
+
+    def instrument_args(self, args: FFmpegArgs) -> FFmpegArgs:
+        """instrument the filtergraphs of FFmpeg arguments
+
+        :param args: FFmpeg arguments, modified in place
+        :return: the same FFmpeg arguments
+        """
+
+        from ..configure import map_filtergraphs
+
+        def instrument(fg):
+            fg = self.instrument(fg)
+            self._instrumented.append(fg)
+            return fg
+
+        return map_filtergraphs(args, instrument)
+
+    def report_env(self, args: FFmpegArgs) -> dict[str, str] | None:
+        """environment variables to run an instrumented FFmpeg job with
+
+        :param args: FFmpeg arguments of the job
+        :return: a copy of ``os.environ`` with ``FFREPORT`` set to log the job
+            to a report file or ``None`` if the job is not instrumented or the
+            profiler is not active (:py:func:`profile_filters`)
+        """
+
+        from ..configure import map_filtergraphs
+
+        if self._report_dir is None:
+            return None
+
+        found = False
+
+        def find(fg):
+            nonlocal found
+            found = found or any(fg is g for g in self._instrumented)
+
+        map_filtergraphs(args, find)
+        if not found:
+            return None
+
+        path = os.path.join(self._report_dir, f"job{self._jobs}-%p.log")
+        self._jobs += 1
+        return {**os.environ, "FFREPORT": f"file='{path}':level=32"}
+
+    def parse_log(self, log: str | Iterable[str]):
+        """collect the timing lines from FFmpeg log
+
+        :param log: log text or lines of an instrumented FFmpeg run
+        """
+
+        if isinstance(log, str):
+            log = log.splitlines()
+
+        tags = {}  # bench address -> tag
+        last_tag = None
+        for line in log:
+            m = _re_line.search(line)
+            if m is None:
+                continue
+            name, addr, t = m.groups()
+            if t is None:
+                last_tag = name if name in self._samples else None
+            elif name in ("bench", "abench"):
+                tag = tags.get(addr)
+                if tag is None and last_tag is not None:
+                    tag = tags[addr] = last_tag
+                if tag is not None:
+                    self._samples[tag].append(float(t))
+                last_tag = None
+
+    @property
+    def timings(self) -> list[FilterTiming]:
+        """timing of the profiled filters, the most time-consuming first"""
+
+        timings = []
+        for tag, (gid, index, obj) in self._units.items():
+            samples = sorted(self._samples[tag])
+            n = len(samples)
+            total = sum(samples)
+            timings.append(
+                FilterTiming(
+                    gid,
+                    index,
+                    obj,
+                    n,
+                    total,
+                    total / n if n else float("nan"),
+                    samples[-1] if n else float("nan"),
+                    {
+                        q: _percentile(samples, q) if n else float("nan")
+                        for q in self.percentiles
+                    },
+                )
+            )
+        return sorted(timings, key=lambda t: -t.total if t.frames else 0.0)
+
+    def __str__(self) -> str:
+        head = f"{'graph':>5} {'index':<10} {'frames':>7}"
+        head += f" {'total[s]':>9} {'mean[ms]':>9}"
+        head += "".join(f" {f'p{q:g}[ms]':>9}" for q in self.percentiles)
+        head += f" {'max[ms]':>9}  filter"
+        lines = [head]
+        for t in self.timings:
+            line = f"{t.graph:>5} {','.join(map(str, t.index)):<10} {t.frames:>7}"
+            line += f" {t.total:>9.3f} {t.mean * 1e3:>9.3f}"
+            line += "".join(f" {v * 1e3:>9.3f}" for v in t.percentiles.values())
+            line += f" {t.max * 1e3:>9.3f}  {t.filter}"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+@contextmanager
+def profile_filters(
+    per: Literal["filter", "chain"] = "filter",
+    percentiles: Iterable[float] = (50, 90, 99),
+) -> Generator[FilterProfile]:
+    """profile the filtergraphs of the ffmpegio jobs run in the context
+
+    :param per: ``'filter'`` to time each filter or ``'chain'`` to time each
+        filterchain, defaults to ``'filter'``
+    :param percentiles: percentiles of the per-frame processing time to report,
+        defaults to ``(50, 90, 99)``
+    :yield: profile report, populated when the context exits
+
+    The ``filter_complex``, ``vf``, ``af``, and ``filter`` options of the jobs
+    (e.g., :py:func:`video.filter` or :py:func:`transcode`) are instrumented
+    with ``bench``/``abench`` filters. The profiler is not thread-safe: run
+    the jobs one at a time in the context.
+
+    .. code:: python
+
+        with fgb.profile_filters() as prof:
+            ffmpegio.transcode("input.mp4", "output.mp4", vf="scale=1280:-2,hqdn3d")
+        print(prof)
+
+    """
+
+    from .. import configure
+
+    prof = FilterProfile(per, percentiles)
+    profiler = configure.FILTERGRAPH_PROFILER
+    with TemporaryDirectory() as report_dir:
+        prof._report_dir = report_dir
+        configure.FILTERGRAPH_PROFILER = prof
+        try:
+            yield prof
+        finally:
+            configure.FILTERGRAPH_PROFILER = profiler
+            prof._report_dir = None
+            for path in sorted(glob(os.path.join(report_dir, "job*-ffmpeg.log"))):
+                with open(path, errors="replace") as f:
+                    prof.parse_log(f)
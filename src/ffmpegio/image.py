@@ -1,9 +1,18 @@
+from __future__ import annotations
+
 import logging
 from fractions import Fraction
 
 from . import configure, utils
 from . import filtergraph as fgb
-from ._typing import Any, DTypeString, ProgressCallable, RawDataBlob, ShapeTuple
+from ._typing import (
+    TYPE_CHECKING,
+    Any,
+    DTypeString,
+    ProgressCallable,
+    RawDataBlob,
+    ShapeTuple,
+)
 from .configure import (
     FFmpegInputOptionTuple,
     FFmpegInputUrlComposite,
@@ -15,6 +24,9 @@ from .configure import (
 from .errors import FFmpegioError
 from .std_runners import run_and_return_encoded, run_and_return_raw
 
+if TYPE_CHECKING:
+    from .streams.pool import FilterPool
+
 __all__ = ["create", "read", "write", "filter", "detect"]
 
 logger = logging.getLogger("ffmpegio")
@@ -220,6 +232,7 @@ def filter(
     progress: ProgressCallable | None = None,
     show_log: bool | None = None,
     sp_kwargs: dict[str, Any] | None = None,
+    pool: FilterPool | None = None,
     **options,
 ) -> tuple[Fraction | int, RawDataBlob]:
     """Filter image pixels.
@@ -232,6 +245,10 @@ def filter(
     :param sp_kwargs: dictionary with keywords passed to `subprocess.run()` or
                       `subprocess.Popen()` call used to run the FFmpeg, defaults
                       to None
+    :param pool: :py:class:`streams.FilterPool` to run a stateless SISO filter
+                 on a warm FFmpeg process, defaults to None (run a new FFmpeg
+                 process). ``progress``, ``show_log``, and ``sp_kwargs`` are
+                 ignored if pooled.
     :param options: FFmpeg options, append '_in' for input option names (see :doc:`options`)
     :return data: video data object specified by selected `bytes_to_video` plugin hook.
                   The output shape is 3D (row x column x comp) if colored/transparent.
@@ -239,6 +256,13 @@ def filter(
 
     """
 
+    if pool is not None:
+        if extra_inputs is not None or extra_outputs is not None:
+            raise ValueError("Pooled filtering does not support extra inputs or outputs.")
+        return pool.filter(
+            expr, 1, input, media_type="video", squeeze=True, **options
+        )[1]
+
     if expr is not None:
         if extra_inputs is None and extra_outputs is None:
             # guaranteed SISO filtering
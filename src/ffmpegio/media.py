@@ -32,10 +32,11 @@ from .configure import (
 )
 from .errors import FFmpegError
 from .filtergraph.abc import FilterGraphObject
+from .threading import ReaderThread
 
 logger = logging.getLogger("ffmpegio")
 
-__all__ = ["read", "write", "filter"]
+__all__ = ["read", "read_renditions", "write", "filter"]
 
 
 def _runner(
@@ -65,9 +66,6 @@ def _runner(
         input_pipes, output_pipes, input_info, output_info, queue_size=0
     )
 
-    def on_exit(rc):
-        stack.close()
-
     # run the FFmpeg
     try:
         proc = ffmpegprocess.Popen(
@@ -76,15 +74,24 @@ def _runner(
             progress=progress,
             capture_log=capture_log,
             sp_kwargs=sp_kwargs,
-            on_exit=on_exit,
         )
     except:
-        # if Popen failed to start FFmpeg process, need to call the callback
+        # if Popen failed to start FFmpeg process, need to close the pipes
         stack.close()
         raise
 
     # wait for the FFmpeg to finish processing
-    proc.wait()
+    try:
+        proc.wait()
+
+        # let the readers drain their pipes before closing them
+        if not proc.returncode:
+            for pinfo in output_pipes.values():
+                reader = pinfo.get("reader", None)
+                if isinstance(reader, ReaderThread):
+                    reader.wait_till_eof()
+    finally:
+        stack.close()
 
     # throw error if failed
     if proc.returncode:
@@ -177,6 +184,81 @@ def read(
     return _gather_outputs(output_info, output_pipes)
 
 
+def read_renditions(
+    *urls: tuple[tuple[FFmpegInputUrlComposite, FFmpegOptionDict]],
+    renditions: Sequence[FFmpegOptionDict],
+    squeeze: bool = False,
+    show_log: bool | None = None,
+    progress: ProgressCallable | None = None,
+    sp_kwargs: dict | None = None,
+    **options: Unpack[FFmpegOptionDict],
+) -> tuple[list[Fraction | int], list[RawDataBlob]]:
+    """Read multiple renditions of media streams, decoding each stream once
+
+    :param *urls: URLs of the media files to read or a tuple of the URL and its input option dict.
+    :param renditions: a list of output option dicts, one per rendition. Each dict
+                must contain the `'map'` item with the stream type of the input
+                stream (e.g., `'0:v:0'` or `'0:a'`), and it may contain a simple
+                filtergraph option (`'vf'`, `'af'`, or `'filter'`) to apply to the
+                rendition only.
+    :param squeeze: False to return 4D data for video and 2D data for audio. True
+                    eliminates any dimensions which only has the length of one.
+    :param show_log: True to show FFmpeg log messages on the console,
+                     defaults to None (no show/capture)
+    :param progress: progress callback function, defaults to None
+    :param sp_kwargs: dictionary with keywords passed to `subprocess.Popen()` call
+                      used to run the FFmpeg, defaults to None
+    :param options: FFmpeg options, append '_in[input_url_id]' for input option names for specific
+                        input url or '_in' to be applied to all inputs. The output options
+                        are applied to all the renditions, and the `'vf'` and `'af'`
+                        options filter the input streams before they are split.
+    :return: frame/sampling rates and raw data of the renditions
+
+    Each mapped input stream is decoded once and split (`split` or `asplit` filter)
+    into its renditions in a single FFmpeg run, instead of running `read()` for
+    each rendition:
+
+        rates, data = media.read_renditions(
+            "input.mp4",
+            renditions=[
+                {"map": "0:v:0", "s": (640, 360)},
+                {"map": "0:v:0", "s": (96, 54), "pix_fmt": "gray"},
+                {"map": "0:a:0", "ar": 16000, "ac": 1},
+            ],
+        )
+
+    """
+
+    options = {**options}
+    if utils.find_filter_complex_option(options):
+        raise ValueError("Renditions cannot be read with a complex filtergraph.")
+
+    shared_filters = {}
+    for media_type in ("video", "audio"):
+        name = utils.find_filter_simple_option(options, media_type)
+        if name is not None:
+            shared_filters[media_type] = options.pop(name)
+
+    fg, streams = configure.config_renditions(
+        [(r["map"], {k: v for k, v in r.items() if k != "map"}) for r in renditions],
+        shared_filters,
+    )
+
+    rates, data = read(
+        *urls,
+        streams=streams,
+        squeeze=squeeze,
+        show_log=show_log,
+        progress=progress,
+        sp_kwargs=sp_kwargs,
+        filter_complex=fg,
+        **options,
+    )
+
+    labels = [opts["map"][1:-1] for opts in streams]
+    return [rates[label] for label in labels], [data[label] for label in labels]
+
+
 def write(
     urls: (
         FFmpegOutputUrlComposite
@@ -2,26 +2,41 @@ from __future__ import annotations
 
 import json
 import logging
+import os
 import re
-from collections.abc import Sequence
+from collections import deque
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from fractions import Fraction
-from io import IOBase
+from io import IOBase, TextIOWrapper
+from itertools import islice
 from numbers import Number
-from typing import Any, BinaryIO, Literal, Union
+from subprocess import Popen
+from tempfile import TemporaryFile
+from threading import Thread
+from typing import TYPE_CHECKING, Any, BinaryIO, Iterator, Literal, NamedTuple, Union
 
 from typing_extensions import Buffer
 
+from . import _headers
+from ._utils import DEFAULT_PROBESIZE
 from .errors import FFmpegError
 from .path import PIPE, ffprobe
 from .stream_spec import StreamSpecDict
 from .stream_spec import stream_spec as compose_stream_spec
 
+if TYPE_CHECKING:
+    from numpy import ndarray
+
 logger = logging.getLogger("ffmpegio")
 
 
 # fmt:off
 __all__ = ['full_details', 'format_basic', 'streams_basic',
-'video_streams_basic', 'audio_streams_basic', 'query', 'frames', 'packets']
+'video_streams_basic', 'audio_streams_basic', 'query', 'frames', 'packets',
+'iter_frames', 'iter_packets', 'frames_array', 'packets_array',
+'bitrate_profile', 'gop_structure', 'BitrateProfile', 'GOPStructure',
+'full_details_many', 'query_many', 'ProbeResult']
 # fmt:on
 
 _re_ratio = re.compile(r"^(\d+)\:(\d+)$")
@@ -281,6 +296,89 @@ DataHashLiteral = Literal[
 ]
 
 
+def _compose_args(
+    of: str,
+    entries: EntrySequence | EntryDict,
+    streams: str | int | StreamSpecDict | None = None,
+    intervals: IntervalSpec | Sequence[IntervalSpec] | None = None,
+    *,
+    count_frames: bool = False,
+    count_packets: bool = False,
+    data: bool = False,
+    data_hash: DataHashLiteral | None = None,
+    data_dump_format: Literal["xxd", "base64"] | None = None,
+    log: Literal[-8, 0, 8, 16, 24, 32, 40, 48, 56] | None = None,
+    private_data: bool = False,
+    keep_optional_fields: bool = False,
+    analyze_frames: bool = False,
+    bitexact: bool = False,
+    find_stream_info: bool = False,
+    f: str | None = None,
+    **kwargs,
+) -> list[str]:
+    """compose ffprobe arguments except for the input url (see :py:func:`run`)
+
+    :param of: ffprobe output format
+    :return: ffprobe argument list
+    """
+
+    args = ["-hide_banner", "-of", of, "-show_entries", _compose_entries(entries)]
+
+    if f is not None:
+        args.extend(("-f", f))
+
+    if streams is not None:
+        _add_select_streams(args, streams)
+
+    if intervals is not None:
+        _add_read_intervals(args, intervals)
+
+    if count_frames:
+        args.append("-count_frames")
+        # returns "nb_read_frames" item in each stream
+
+    if count_packets:
+        args.append("-count_packets")
+        # returns "nb_read_packets" item in each stream
+
+    if data is True:
+        args.append("-show_data")
+
+    if data_hash is not None:
+        args.extend(("-show_data_hash", data_hash))
+
+    if data_dump_format is not None:
+        args.extend(("-data_dump_format", data_dump_format))
+
+    if log is not None:
+        args.extend(("-log", log))
+
+    if private_data is True:
+        args.append("-show_private_data")
+
+    if keep_optional_fields is not None:
+        args.extend(
+            ("-show_optional_fields", "always" if keep_optional_fields else "auto")
+        )
+
+    if analyze_frames is True:
+        args.append("analyze_frames")
+
+    if bitexact is True:
+        args.append("-bitexact")
+
+    if find_stream_info is True:
+        args.append("-find_stream_info")
+
+    for k, v in kwargs.items():
+        if v is None:
+            args.append(f"-{k}")
+        else:
+            args.extend((f"-{k}", str(v)))
+
+    return args
+
+
 def run(
     url: str | BinaryIO | memoryview,
     entries: EntrySequence | EntryDict,
@@ -372,62 +470,41 @@ def run(
     if sp_kwargs is not None:
         sp_opts = {**dict(sp_kwargs), **sp_opts}
 
-    args = ["-hide_banner", "-of", "json", "-show_entries", _compose_entries(entries)]
-
-    if f is not None:
-        args.extend(("-f", f))
-
-    if streams is not None:
-        _add_select_streams(args, streams)
-
-    if intervals is not None:
-        _add_read_intervals(args, intervals)
-
-    if count_frames:
-        args.append("-count_frames")
-        # returns "nb_read_frames" item in each stream
-
-    if count_packets:
-        args.append("-count_packets")
-        # returns "nb_read_packets" item in each stream
-
-    if data is True:
-        args.append("-show_data")
-
-    if data_hash is not None:
-        args.extend(("-show_data_hash", data_hash))
-
-    if data_dump_format is not None:
-        args.extend(("-data_dump_format", data_dump_format))
-
-    if log is not None:
-        args.extend(("-log", log))
-
-    if private_data is True:
-        args.append("-show_private_data")
-
-    if keep_optional_fields is not None:
-        args.extend(
-            ("-show_optional_fields", "always" if keep_optional_fields else "auto")
-        )
-
-    if analyze_frames is True:
-        args.append("analyze_frames")
-
-    if bitexact is True:
-        args.append("-bitexact")
-
-    if find_stream_info is True:
-        args.append("-find_stream_info")
-
-    for k, v in kwargs.items():
-        if v is None:
-            args.append(f"-{k}")
-        else:
-            args.extend((f"-{k}", str(v)))
+    args = _compose_args(
+        "json",
+        entries,
+        streams,
+        intervals,
+        count_frames=count_frames,
+        count_packets=count_packets,
+        data=data,
+        data_hash=data_hash,
+        data_dump_format=data_dump_format,
+        log=log,
+        private_data=private_data,
+        keep_optional_fields=keep_optional_fields,
+        analyze_frames=analyze_frames,
+        bitexact=bitexact,
+        find_stream_info=find_stream_info,
+        f=f,
+        **kwargs,
+    )
 
+    windows = [None]
     if isinstance(url, Buffer):
-        sp_opts["input"] = url
+        # only the headers are needed unless frames or packets are probed
+        header_only = not (
+            intervals is not None
+            or count_frames
+            or count_packets
+            or analyze_frames
+            or re.search(r"(?:^|:)(?:packet|frame)s?\b", args[4])
+        )
+        windows = (
+            _buffer_windows(url, kwargs.get("probesize", None))
+            if header_only
+            else [url]
+        )
         url = "pipe:0"
     elif isinstance(url, IOBase):
         sp_opts["stdin"] = url
@@ -437,8 +514,14 @@ def run(
 
     args.append(url)
 
-    # run ffprobe
-    ret = ffprobe(args, **sp_opts)
+    # run ffprobe (on a growing window of the buffer until the stream info is complete)
+    for data in windows:
+        if data is not None:
+            sp_opts["input"] = data
+        ret = ffprobe(args, **sp_opts)
+        if ret.returncode == 0 and b"Could not find codec parameters" not in ret.stderr:
+            break
+
     if ret.returncode != 0:
         raise FFmpegError(f"ffprobe execution failed\n\n{ret.stderr.decode('utf8')}\n")
 
@@ -446,6 +529,29 @@ def run(
     return json.loads(ret.stdout)
 
 
+def _buffer_windows(buffer: Buffer, probesize: int | str | None) -> Iterator[Buffer]:
+    """bounded prefixes of in-memory media data to pipe to ffprobe
+
+    :param buffer: media data
+    :param probesize: ffprobe's probesize option value
+    :yield: the prefix, starting with twice the probesize and quadrupling its
+            size every iteration until the entire data is covered
+
+    An MP4/MOV data with its moov box at the end is relocated so the moov box
+    precedes the media data (see :py:func:`_headers.faststart`) as the pipe
+    input is not seekable.
+    """
+
+    data = memoryview(buffer).cast("B")
+    head, start, end = _headers.faststart(data) or (b"", 0, len(data))
+
+    n = 2 * (probesize if isinstance(probesize, int) else DEFAULT_PROBESIZE)
+    while start + n < end:
+        yield head + data[start : start + n] if head else data[:n]
+        n *= 4
+    yield head + data[start:end] if head else data
+
+
 def full_details(
     url: str | BinaryIO | memoryview,
     show_format: bool = True,
@@ -516,6 +622,69 @@ def _resolve_entries(info_type, entries, default_entries, default_dep_entries={}
     return list(query)
 
 
+def _query_basic(
+    url: str | BinaryIO | memoryview,
+    streams: str | bool | None,
+    fields: Sequence[str],
+    keep_optional_fields: bool | None,
+    keep_str_values: bool | None,
+    sp_kwargs: dict[str, Any] | None,
+    f: str | None,
+) -> dict[str, Any] | list[dict[str, Any]]:
+    """query() which first tries to read the container headers of a local file
+
+    Falls back to :py:func:`query()` (i.e., ffprobe) unless the file format is
+    supported by :py:mod:`._headers` and all the requested fields are found.
+    """
+
+    native = not (f or sp_kwargs or keep_optional_fields or keep_str_values)
+    if native and isinstance(url, (str, os.PathLike)) and os.path.isfile(url):
+        info = _headers.probe(url)
+        results = info and _select_header_fields(info, url, streams, fields)
+        if results is not None:
+            return results
+
+    return query(
+        url, streams, fields, keep_optional_fields, keep_str_values, sp_kwargs, f=f
+    )
+
+
+def _select_header_fields(
+    info: dict[str, Any],
+    url: str | os.PathLike,
+    streams: str | bool | None,
+    fields: Sequence[str],
+) -> dict[str, Any] | list[dict[str, Any]] | None:
+    """pick the fields from the output of _headers.probe() like query() does
+
+    Returns None if the stream specifier is not supported or a field is unknown.
+    """
+
+    if streams is None:
+        items = [{**info["format"], "filename": os.fspath(url)}]
+    elif streams is True:
+        items = info["streams"]
+    else:
+        m = re.fullmatch(r"([va])(?::(\d+))?", streams)
+        if m is None:
+            return None
+        media_type = "video" if m[1] == "v" else "audio"
+        items = [st for st in info["streams"] if st["codec_type"] == media_type]
+        if m[2] is not None:
+            items = items[int(m[2]) : int(m[2]) + 1]
+        if not items:
+            return None  # let ffprobe raise the error
+
+    if any(k not in item for item in items for k in fields):
+        return None
+
+    results = [
+        _items_to_numeric({k: item[k] for k in fields if item[k] is not None})
+        for item in items
+    ]
+    return results[0] if streams is None else results
+
+
 def format_basic(
     url: str | BinaryIO | memoryview,
     entries: Sequence[str] | None = None,
@@ -563,14 +732,14 @@ def format_basic(
         "duration",
     )
 
-    return query(
+    return _query_basic(
         url,
         None,
         _resolve_entries("basic format", entries, default_entries),
         keep_optional_fields,
         keep_str_values,
         sp_kwargs,
-        f=f,
+        f,
     )
 
 
@@ -615,14 +784,14 @@ def streams_basic(
 
     default_entries = ("index", "codec_name", "codec_type")
 
-    return query(
+    return _query_basic(
         url,
         stream_spec or True,
         _resolve_entries("basic streams", entries, default_entries),
         keep_optional_fields,
         keep_str_values,
         sp_kwargs,
-        f=f,
+        f,
     )
 
 
@@ -697,14 +866,14 @@ def video_streams_basic(
         nb_frames=("nb_frames", *durpara, *fspara),
     )
 
-    results = query(
+    results = _query_basic(
         url,
         "v" if index is None else f"v:{index}",
         _resolve_entries("basic video", entries, default_entries, default_dep_entries),
         keep_optional_fields,
         keep_str_values,
         sp_kwargs,
-        f=f,
+        f,
     )
 
     def adjust(res):
@@ -802,14 +971,14 @@ def audio_streams_basic(
         nb_samples=("sample_rate", *durpara),
     )
 
-    results = query(
+    results = _query_basic(
         url,
         "a" if index is None else f"a:{index}",
         _resolve_entries("basic audio", entries, default_entries, default_dep_entries),
         keep_optional_fields,
         keep_str_values,
         sp_kwargs,
-        f=f,
+        f,
     )
 
     def adjust(res):
@@ -1109,3 +1278,804 @@ def packets(
         return [d[entry] for d in out] if is_single else out
     except KeyError:
         raise ValueError(f"invalid packet attribute: {entry}")
+
+
+_re_compact_field = re.compile(r"((?:[^|\\]|\\.)*)(\||$)")
+_re_compact_escape = re.compile(r"\\(.)")
+_compact_escapes = {"b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+def _split_compact(line: str) -> list[str]:
+    """split a line of ffprobe's compact output to unescaped fields"""
+
+    if "\\" not in line:
+        return line.split("|")
+    fields = []
+    for m in _re_compact_field.finditer(line):
+        fields.append(
+            _re_compact_escape.sub(lambda e: _compact_escapes.get(e[1], e[1]), m[1])
+        )
+        if not m[2]:
+            break
+    return fields
+
+
+def _write_input(stdin, data):
+    """feed in-memory input to ffprobe"""
+    try:
+        stdin.write(data)
+    except BrokenPipeError:
+        pass  # ffprobe exited before reading all
+    finally:
+        stdin.close()
+
+
+def _iter_compact(
+    url: str | BinaryIO | memoryview,
+    entries: EntrySequence | EntryDict,
+    sp_kwargs: dict[str, Any] | None = None,
+    **kwargs,
+) -> Iterator[tuple[str, dict[str, str | list[dict[str, str]]]]]:
+    """run ffprobe and parse its compact output as ffprobe produces it
+
+    :param url: media url to be probed
+    :param entries: entries to show (see :py:func:`run`)
+    :param sp_kwargs: Additional keyword arguments for :py:class:`subprocess.Popen`,
+                      default to None
+    :param \\**kwargs: other :py:func:`run` options
+    :yield: section name and its entries as str. The entries of the nested
+            sections (e.g., ``side_data``) are listed under their name with the
+            ``'_list'`` suffix (e.g., ``side_data_list``) like the JSON output.
+
+    Closing the generator early terminates ffprobe.
+    """
+
+    args = _compose_args("compact", entries, **kwargs)
+
+    with TemporaryFile() as stderr:
+        # stderr to a file, so ffprobe never blocks on a full pipe
+        sp_opts = {**(sp_kwargs or {}), "stdout": PIPE, "stderr": stderr}
+
+        data = None
+        if isinstance(url, Buffer):
+            data = url
+            sp_opts["stdin"] = PIPE
+            url = "pipe:0"
+        elif isinstance(url, IOBase):
+            sp_opts["stdin"] = url
+            url = "pipe:0"
+        else:
+            url = str(url)
+
+        proc = ffprobe([*args, url], Popen, **sp_opts)
+        writer = None
+        if data is not None:
+            writer = Thread(target=_write_input, args=(proc.stdin, data), daemon=True)
+            writer.start()
+
+        exhausted = False
+        try:
+            for line in TextIOWrapper(proc.stdout, "utf-8"):
+                fields = _split_compact(line.rstrip("\r\n"))
+                if not fields[0]:
+                    continue  # blank line after nested sections
+
+                section = fields[0]
+                entry = d = {}
+                for field in fields[1:]:
+                    key, sep, value = field.partition("=")
+                    if sep:
+                        d[key] = value
+                    elif key:  # nested section
+                        d = {}
+                        entry.setdefault(f"{key}_list", []).append(d)
+                yield section, entry
+            exhausted = True
+        finally:
+            if not exhausted and proc.poll() is None:
+                proc.terminate()  # generator closed early
+            proc.stdout.close()
+            proc.wait()
+            if writer is not None:
+                writer.join()
+
+        if exhausted and proc.returncode != 0:
+            stderr.seek(0)
+            log = stderr.read().decode("utf8")
+            raise FFmpegError(f"ffprobe execution failed\n\n{log}\n")
+
+
+def _resolve_time_entries(
+    section: str, entries: Sequence[str] | None, accurate_time: bool
+) -> tuple[EntryDict, list[str] | None, set[str]]:
+    """resolve the entries to query to compute '*_time' entries from timestamps
+
+    :return: ffprobe entries, requested '*_time' entries (None if all), and the
+             timestamp entries to drop from the outcome
+    """
+
+    query = {section: (entries is None) or entries}
+    if not accurate_time:
+        return query, [], set()
+
+    if entries is None:
+        query["stream"] = ["index", "time_base"]
+        return query, None, set()
+
+    time_entries = [e for e in entries if e.endswith("_time")]
+    if not time_entries:
+        return query, [], set()
+
+    other_entries = {"stream_index", *(e for e in entries if not e.endswith("_time"))}
+    ts_entries = {e[:-5] for e in time_entries}
+    query[section] = [*other_entries, *ts_entries]
+    query["stream"] = ["index", "time_base"]
+    return query, time_entries, ts_entries - set(entries)
+
+
+def _iter_entries(
+    section: Literal["frame", "packet"],
+    url: str | BinaryIO | memoryview,
+    entries: Sequence[str] | None,
+    accurate_time: bool,
+    sp_kwargs: dict[str, Any] | None,
+    **kwargs,
+) -> Iterator[dict]:
+    """iterate over frames or packets (see :py:func:`iter_frames`)"""
+
+    pick_entries = entries is not None
+    query, time_entries, drop_entries = _resolve_time_entries(
+        section, entries, accurate_time
+    )
+
+    time_bases = None
+    if "stream" in query:
+        # stream sections follow the frames/packets, query them first
+        if isinstance(url, (Buffer, IOBase)):
+            raise ValueError("accurate_time requires the url of the media.")
+        del query["stream"]
+        res = run(
+            url,
+            {"stream": ["index", "time_base"]},
+            kwargs.get("streams", None),
+            f=kwargs.get("f", None),
+            sp_kwargs=sp_kwargs,
+        )
+        time_bases = {int(d["index"]): Fraction(d["time_base"]) for d in res["streams"]}
+
+    for name, d in _iter_compact(url, query, sp_kwargs, **kwargs):
+        if name != section:
+            continue
+        d = _items_to_numeric(d)
+        if pick_entries:
+            # make sure side_data_list is not included
+            d.pop("side_data_list", None)
+
+        if time_bases:
+            tb = time_bases[d["stream_index"]]
+            for e in time_entries or [e for e in d if e.endswith("_time")]:
+                ts = d[e[:-5]]
+                d[e] = None if ts is None else ts * tb
+            for e in drop_entries:
+                del d[e]
+
+        yield d
+
+
+def iter_frames(
+    url: str | BinaryIO | memoryview,
+    entries: Sequence[str] | None = None,
+    streams: str | int | StreamSpecDict | None = None,
+    intervals: IntervalSpec | Sequence[IntervalSpec] | None = None,
+    accurate_time: bool | None = False,
+    sp_kwargs: dict[str, Any] | None = None,
+    *,
+    f: str | None = None,
+) -> Iterator[dict]:
+    """iterate over frame information as ffprobe produces it
+
+    :param url: URL of the media file/stream
+    :param entries: names of frame attributes, defaults to None (get all attributes)
+    :param stream: stream specifier of the stream to retrieve the data of, defaults to None to get all streams
+    :param intervals: time intervals to retrieve the data, see below for the details, defaults to None (get all)
+    :param accurate_time: True to return all '\\*_time' attributes to be computed from associated timestamps and
+                          stream timebase, defaults to False (= us accuracy). Requires
+                          ``url`` to be a media url (not a buffer or file object).
+    :param sp_kwargs: Additional keyword arguments for :py:class:`subprocess.Popen`,
+                      default to None
+    :param f: Use the specified media container format, defaults to None (auto-detect)
+    :yield: frame information dict
+
+    Same as :py:func:`frames`, but ffprobe's compact output is parsed and
+    yielded one frame at a time, so the memory usage does not grow with the
+    number of frames. Closing the iterator early terminates ffprobe.
+    """
+
+    if isinstance(entries, str):
+        entries = [entries]
+    return _iter_entries(
+        "frame",
+        url,
+        entries,
+        accurate_time,
+        sp_kwargs,
+        streams=streams,
+        intervals=intervals,
+        f=f,
+    )
+
+
+def iter_packets(
+    url: str | BinaryIO | memoryview,
+    entries: Sequence[str] | None = None,
+    streams: str | int | StreamSpecDict | None = None,
+    intervals: IntervalSpec | Sequence[IntervalSpec] | None = None,
+    accurate_time: bool | None = False,
+    data_hash: DataHashLiteral | None = None,
+    sp_kwargs: dict[str, Any] | None = None,
+    *,
+    f: str | None = None,
+) -> Iterator[dict]:
+    """iterate over packet information as ffprobe produces it
+
+    :param url: URL of the media file/stream
+    :param entries: names of packet attributes, defaults to None (get all attributes)
+    :param stream: stream specifier of the stream to retrieve the data of,
+        defaults to None to get all streams
+    :param intervals: time intervals to retrieve the data, see below for the
+        details, defaults to None (get all)
+    :param accurate_time: True to return all '\\*_time' attributes to be computed
+        from associated timestamps and stream timebase, defaults to False
+        (= us accuracy). Requires ``url`` to be a media url (not a buffer or
+        file object).
+    :param data_hash: When specified, a hash of payload data is included.
+        Hashes are not provided by default.
+    :param sp_kwargs: Additional keyword arguments for :py:class:`subprocess.Popen`,
+                      default to None
+    :param f: Use the specified media container format, defaults to None (auto-detect)
+    :yield: packet information dict
+
+    Same as :py:func:`packets`, but ffprobe's compact output is parsed and
+    yielded one packet at a time, so the memory usage does not grow with the
+    number of packets. Closing the iterator early terminates ffprobe.
+    """
+
+    if isinstance(entries, str):
+        entries = [entries]
+    return _iter_entries(
+        "packet",
+        url,
+        entries,
+        accurate_time,
+        sp_kwargs,
+        streams=streams,
+        intervals=intervals,
+        data_hash=data_hash,
+        f=f,
+    )
+
+
+def _to_array(values: list[str | None]) -> ndarray:
+    """convert a chunk of entry values to an array: int64 if all integers,
+    float64 (NaN if N/A) if all numeric, or object (None if N/A) otherwise"""
+
+    import numpy as np
+
+    a = np.array(["N/A" if v is None else v for v in values])
+    try:
+        return a.astype(np.int64)
+    except ValueError:
+        pass
+    na = a == "N/A"
+    try:
+        return np.where(na, "nan", a).astype(np.float64)
+    except ValueError:
+        out = a.astype(object)
+        out[na] = None
+        return out
+
+
+def _pad_array(a: ndarray, before: int, after: int) -> ndarray:
+    """pad missing values (NaN or None) to an entry array"""
+
+    import numpy as np
+
+    if not (before or after):
+        return a
+    if a.dtype.kind in "iuf":
+        fill = np.full(before + after, np.nan)
+    else:
+        fill = np.full(before + after, None, object)
+    return np.concatenate([fill[:before], a, fill[before:]])
+
+
+def _iter_array_chunks(
+    section: Literal["frame", "packet"],
+    url: str | BinaryIO | memoryview,
+    query: EntryDict,
+    sp_kwargs: dict[str, Any] | None,
+    chunk_size: int = 65536,
+    time_bases: dict[int, Fraction] | None = None,
+    **kwargs,
+) -> Iterator[tuple[int, dict[str, ndarray]]]:
+    """stream frame or packet information in chunks of arrays
+
+    :param time_bases: dict to store the time bases of the streams if
+                       ``query`` includes the stream section, defaults to None
+    :yield: number of entries and the arrays of the entries in the chunk. An
+            array of an attribute which is missing in a part of the chunk is
+            padded by NaN or None.
+    """
+
+    n = 0  # number of entries in the current chunk
+    columns = {}  # key -> [first row, list of values]
+
+    def flush():
+        return n, {
+            k: _pad_array(_to_array(values), start, n - start - len(values))
+            for k, (start, values) in columns.items()
+        }
+
+    for name, d in _iter_compact(url, query, sp_kwargs, **kwargs):
+        if name == "stream":
+            if time_bases is not None:
+                time_bases[int(d["index"])] = Fraction(d["time_base"])
+            continue
+        if name != section:
+            continue
+
+        for k, v in d.items():
+            try:
+                columns[k][1].append(v)
+            except KeyError:
+                if k.endswith("_list"):
+                    continue  # nested sections are not columnar
+                columns[k] = [n, [v]]
+        n += 1
+
+        if len(d) != len(columns):
+            # pad the missing entries of this row
+            for col in columns.values():
+                if col[0] + len(col[1]) < n:
+                    col[1].append(None)
+
+        if n == chunk_size:
+            # convert the values (str) in chunks to limit the memory usage
+            yield flush()
+            n = 0
+            columns = {}
+
+    if n:
+        yield flush()
+
+
+def _entries_array(
+    section: Literal["frame", "packet"],
+    url: str | BinaryIO | memoryview,
+    entries: str | Sequence[str] | None,
+    accurate_time: bool,
+    sp_kwargs: dict[str, Any] | None,
+    chunk_size: int = 65536,
+    **kwargs,
+) -> dict[str, ndarray] | ndarray:
+    """columnar frame or packet information (see :py:func:`frames_array`)"""
+
+    import numpy as np
+
+    is_single = isinstance(entries, str)
+    if is_single:
+        entry = entries
+        entries = [entries]
+
+    query, time_entries, drop_entries = _resolve_time_entries(
+        section, entries, accurate_time
+    )
+
+    time_bases = {}
+    chunks = list(
+        _iter_array_chunks(
+            section, url, query, sp_kwargs, chunk_size, time_bases, **kwargs
+        )
+    )
+    n = sum(c[0] for c in chunks)
+
+    out = {}
+    for k in {k: None for _, arrays in chunks for k in arrays}:
+        parts = []
+        missing = 0
+        for nc, arrays in chunks:
+            try:
+                a = arrays[k]
+            except KeyError:
+                missing += nc
+            else:
+                parts.append(_pad_array(a, missing, 0))
+                missing = 0
+        a = np.concatenate(parts) if len(parts) > 1 else parts[0]
+        out[k] = _pad_array(a, 0, missing)
+
+    if n and time_bases and "stream_index" in out:
+        # vectorized timestamp to time conversion
+        nidx = max(time_bases) + 1
+        num = np.ones(nidx, np.int64)
+        den = np.ones(nidx, np.int64)
+        for i, tb in time_bases.items():
+            num[i] = tb.numerator
+            den[i] = tb.denominator
+        si = out["stream_index"]
+        for e in time_entries or [e for e in out if e.endswith("_time")]:
+            ts = out.get(e[:-5], None)
+            if ts is not None and ts.dtype.kind in "iuf":
+                out[e] = ts * num[si] / den[si]
+        for e in drop_entries:
+            del out[e]
+        if entries is not None and "stream_index" not in entries:
+            del out["stream_index"]
+
+    if is_single:
+        try:
+            return out[entry] if n else np.empty(0)
+        except KeyError:
+            raise ValueError(f"invalid {section} attribute: {entry}")
+    return out
+
+
+def frames_array(
+    url: str | BinaryIO | memoryview,
+    entries: str | Sequence[str] | None = None,
+    streams: str | int | StreamSpecDict | None = None,
+    intervals: IntervalSpec | Sequence[IntervalSpec] | None = None,
+    accurate_time: bool | None = False,
+    sp_kwargs: dict[str, Any] | None = None,
+    *,
+    f: str | None = None,
+) -> dict[str, ndarray] | ndarray:
+    """get frame information as NumPy arrays
+
+    :param url: URL of the media file/stream
+    :param entries: names of frame attributes, defaults to None (get all attributes)
+    :param stream: stream specifier of the stream to retrieve the data of, defaults to None to get all streams
+    :param intervals: time intervals to retrieve the data, see below for the details, defaults to None (get all)
+    :param accurate_time: True to return all '\\*_time' attributes to be computed from associated timestamps and
+                          stream timebase, defaults to False (= us accuracy)
+    :param sp_kwargs: Additional keyword arguments for :py:class:`subprocess.Popen`,
+                      default to None
+    :param f: Use the specified media container format, defaults to None (auto-detect)
+    :return: frame information: a dict of arrays keyed by the attribute names if
+             entries is None or a sequence; the array of the selected entry if
+             entries is str (i.e., a single entry)
+
+    Unlike :py:func:`frames`, ffprobe's compact output is parsed as ffprobe
+    produces it and the values of each attribute are converted to an array in
+    chunks, so no per-frame dict is created. An attribute array is int64 if all
+    of its values are integers, float64 if all are numeric (NaN if N/A), or
+    object of str (None if N/A) otherwise (e.g., ``pix_fmt`` and
+    ``sample_aspect_ratio``). The nested sections (``side_data_list``) are not
+    included. With ``accurate_time=True``, the float64 ``'*_time'`` arrays are
+    computed from the timestamp arrays and the stream time bases at once.
+    Requires NumPy.
+    """
+
+    return _entries_array(
+        "frame",
+        url,
+        entries,
+        accurate_time,
+        sp_kwargs,
+        streams=streams,
+        intervals=intervals,
+        f=f,
+    )
+
+
+def packets_array(
+    url: str | BinaryIO | memoryview,
+    entries: str | Sequence[str] | None = None,
+    streams: str | int | StreamSpecDict | None = None,
+    intervals: IntervalSpec | Sequence[IntervalSpec] | None = None,
+    accurate_time: bool | None = False,
+    sp_kwargs: dict[str, Any] | None = None,
+    *,
+    f: str | None = None,
+) -> dict[str, ndarray] | ndarray:
+    """get packet information as NumPy arrays
+
+    :param url: URL of the media file/stream
+    :param entries: names of packet attributes, defaults to None (get all attributes)
+    :param stream: stream specifier of the stream to retrieve the data of,
+        defaults to None to get all streams
+    :param intervals: time intervals to retrieve the data, see below for the
+        details, defaults to None (get all)
+    :param accurate_time: True to return all '\\*_time' attributes to be computed
+        from associated timestamps and stream timebase, defaults to False
+        (= us accuracy)
+    :param sp_kwargs: Additional keyword arguments for :py:class:`subprocess.Popen`,
+                      default to None
+    :param f: Use the specified media container format, defaults to None (auto-detect)
+    :return: packet information: a dict of arrays keyed by the attribute names
+             if entries is None or a sequence; the array of the selected entry
+             if entries is str (i.e., a single entry)
+
+    See :py:func:`frames_array` for the array conversion. Requires NumPy.
+    """
+
+    return _entries_array(
+        "packet",
+        url,
+        entries,
+        accurate_time,
+        sp_kwargs,
+        streams=streams,
+        intervals=intervals,
+        f=f,
+    )
+
+
+class BitrateProfile(NamedTuple):
+    """bitrate statistics of a stream, returned by :py:func:`bitrate_profile`"""
+
+    time: ndarray  #: start times of the windows in seconds
+    bitrate: ndarray  #: average bitrates of the windows in bits/second
+    average: float  #: average bitrate over the stream in bits/second
+    peak: float  #: peak bitrate over ``peak_window`` in bits/second
+    peak_time: float  #: start time of the peak window in seconds
+
+
+class GOPStructure(NamedTuple):
+    """group-of-pictures statistics of a video stream, returned by
+    :py:func:`gop_structure`"""
+
+    keyframe_time: ndarray  #: presentation times of the keyframes in seconds
+    length: ndarray  #: number of frames (packets) in each GOP
+    interval: ndarray  #: time intervals between consecutive keyframes in seconds
+    histogram: tuple[ndarray, ndarray]  #: distinct GOP lengths and their counts
+
+
+def _packet_time(arrays: dict[str, ndarray]) -> ndarray:
+    """presentation times of a chunk of packets (decoding time if unknown)"""
+
+    import numpy as np
+
+    t = arrays["pts_time"]
+    dts = arrays.get("dts_time", None)
+    if dts is not None:
+        t = np.where(np.isnan(t), dts, t)
+    return t
+
+
+def bitrate_profile(
+    url: str | BinaryIO | memoryview,
+    streams: str | int | StreamSpecDict = "v:0",
+    window: float = 1.0,
+    peak_window: float | None = None,
+    intervals: IntervalSpec | Sequence[IntervalSpec] | None = None,
+    sp_kwargs: dict[str, Any] | None = None,
+    *,
+    f: str | None = None,
+) -> BitrateProfile:
+    """get bitrate over time of a stream from its packets
+
+    :param url: URL of the media file/stream
+    :param streams: stream specifier of the stream, defaults to ``'v:0'``
+    :param window: length of the windows in seconds, defaults to 1.0
+    :param peak_window: length of the sliding window to find the peak bitrate in
+                        seconds, rounded to a multiple of ``window``, defaults to
+                        None (same as ``window``)
+    :param intervals: time intervals to analyze, defaults to None (analyze all)
+    :param sp_kwargs: Additional keyword arguments for :py:class:`subprocess.Popen`,
+                      default to None
+    :param f: Use the specified media container format, defaults to None (auto-detect)
+    :return: bitrate statistics
+
+    The packets are streamed from ffprobe in chunks, and their sizes are summed
+    over consecutive windows of their presentation timestamps, so the memory usage
+    only grows with the number of the windows. The peak bitrate is the maximum
+    of the sliding (in steps of ``window``) averages over ``peak_window``.
+    Requires NumPy.
+    """
+
+    import numpy as np
+
+    if window <= 0:
+        raise ValueError("window must be positive.")
+    k = max(round(peak_window / window), 1) if peak_window else 1
+
+    t0 = None  # start time of the first window
+    bits = np.zeros(0)  # bits per window
+    total = 0
+    t_end = None
+    query = {"packet": ["dts_time", "pts_time", "duration_time", "size"]}
+    for _, arrays in _iter_array_chunks(
+        "packet", url, query, sp_kwargs, streams=streams, intervals=intervals, f=f
+    ):
+        t = _packet_time(arrays)
+        valid = ~np.isnan(t)
+        t = t[valid]
+        size = arrays["size"][valid] * 8
+        if not len(t):
+            continue
+
+        if t0 is None:
+            t0 = np.floor(t.min() / window) * window
+        i = np.maximum(((t - t0) // window).astype(np.int64), 0)
+        b = np.bincount(i, weights=size)
+        if len(b) > len(bits):
+            bits = np.concatenate([bits, np.zeros(len(b) - len(bits))])
+        bits[: len(b)] += b
+
+        total += size.sum()
+        d = arrays["duration_time"][valid]
+        te = np.nanmax(t + np.where(np.isnan(d), 0.0, d))
+        t_end = te if t_end is None else max(t_end, te)
+
+    if t0 is None:
+        raise ValueError("no packet with a valid timestamp found.")
+
+    nbins = len(bits)
+    time = t0 + window * np.arange(nbins)
+    bitrate = bits / window
+
+    # average over the packets' time span
+    average = total / (t_end - t0) if t_end > t0 else float(bitrate.mean())
+
+    k = min(k, nbins)
+    rolling = np.convolve(bits, np.ones(k), "valid") / (k * window)
+    ipeak = int(rolling.argmax())
+
+    return BitrateProfile(
+        time, bitrate, float(average), float(rolling[ipeak]), float(time[ipeak])
+    )
+
+
+def gop_structure(
+    url: str | BinaryIO | memoryview,
+    streams: str | int | StreamSpecDict = "v:0",
+    intervals: IntervalSpec | Sequence[IntervalSpec] | None = None,
+    sp_kwargs: dict[str, Any] | None = None,
+    *,
+    f: str | None = None,
+) -> GOPStructure:
+    """get the group-of-pictures (GOP) structure of a video stream from its packets
+
+    :param url: URL of the media file/stream
+    :param streams: stream specifier of the video stream, defaults to ``'v:0'``
+    :param intervals: time intervals to analyze, defaults to None (analyze all)
+    :param sp_kwargs: Additional keyword arguments for :py:class:`subprocess.Popen`,
+                      default to None
+    :param f: Use the specified media container format, defaults to None (auto-detect)
+    :return: GOP statistics
+
+    A GOP starts at a keyframe packet and lasts until the next keyframe packet
+    (in decoding order), and its length is the number of the packets (i.e.,
+    frames). The frames before the first keyframe are not counted. The packets
+    are streamed from ffprobe in chunks, so the memory usage only grows with
+    the number of the keyframes. Requires NumPy.
+    """
+
+    import numpy as np
+
+    key_index = []  # packet indices of the keyframes
+    key_time = []
+    n = 0
+    query = {"packet": ["pts_time", "flags"]}
+    for nc, arrays in _iter_array_chunks(
+        "packet", url, query, sp_kwargs, streams=streams, intervals=intervals, f=f
+    ):
+        flags = arrays["flags"].astype(str)
+        i = np.flatnonzero(np.char.startswith(flags, "K"))
+        key_index.append(i + n)
+        key_time.append(arrays["pts_time"][i])
+        n += nc
+
+    key_index = np.concatenate(key_index) if key_index else np.zeros(0, np.int64)
+    key_time = np.concatenate(key_time) if key_time else np.zeros(0)
+
+    length = np.diff(np.append(key_index, n))
+    return GOPStructure(
+        key_time, length, np.diff(key_time), np.unique(length, return_counts=True)
+    )
+
+
+class ProbeResult(NamedTuple):
+    """outcome of probing a url, yielded by :py:func:`full_details_many` and
+    :py:func:`query_many`"""
+
+    index: int  #: position of the url in the input urls
+    url: str  #: probed url
+    info: Any  #: probed information (None if failed)
+    error: Exception | None  #: exception if failed, else None
+
+
+def _probe_many(
+    probe: Callable, urls: Iterable, jobs: int | None, ordered: bool
+) -> Iterator[ProbeResult]:
+    """run a probe function on urls concurrently
+
+    At most ``2 * jobs`` urls are in flight at a time, so ``urls`` may be a
+    long or lazy iterable.
+    """
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs < 1:
+        raise ValueError("jobs must be a positive integer.")
+
+    def run_one(i, url):
+        try:
+            return ProbeResult(i, str(url), probe(url), None)
+        except Exception as e:
+            return ProbeResult(i, str(url), None, e)
+
+    it = enumerate(urls)
+    executor = ThreadPoolExecutor(jobs)
+    try:
+        pending = deque(executor.submit(run_one, *a) for a in islice(it, 2 * jobs))
+        while pending:
+            if ordered:
+                yield pending.popleft().result()
+                nnew = 1
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    yield future.result()
+                nnew = len(done)
+            pending.extend(executor.submit(run_one, *a) for a in islice(it, nnew))
+    finally:
+        # generator may be closed early
+        executor.shutdown(cancel_futures=True)
+
+
+def full_details_many(
+    urls: Iterable[str],
+    jobs: int | None = None,
+    ordered: bool = True,
+    **kwargs,
+) -> Iterator[ProbeResult]:
+    """Retrieve full details of multiple media files concurrently
+
+    :param urls: URLs of the media files
+    :param jobs: maximum number of concurrent ffprobe processes, defaults to
+                 None (the number of CPUs)
+    :param ordered: True to yield the results in the order of ``urls``, False
+                    to yield them as they complete, defaults to True
+    :param \\**kwargs: :py:func:`full_details` keyword arguments
+    :yield: probe results, each with the output of :py:func:`full_details` as
+            its ``info``
+
+    Failing to probe a file does not stop the others; its exception is
+    reported in the ``error`` field of its result. ``urls`` is consumed
+    lazily, up to twice as many urls as ``jobs`` ahead of the yielded results.
+    Closing the generator early cancels the urls that are yet to be probed.
+    """
+
+    return _probe_many(lambda url: full_details(url, **kwargs), urls, jobs, ordered)
+
+
+def query_many(
+    urls: Iterable[str],
+    streams: str | int | StreamSpecDict | bool | None = None,
+    fields: Sequence[str] | None = None,
+    jobs: int | None = None,
+    ordered: bool = True,
+    **kwargs,
+) -> Iterator[ProbeResult]:
+    """Query specific fields of media format or stream of multiple media files
+    concurrently
+
+    :param urls: URLs of the media files
+    :param streams: stream specifier, defaults to None to get format
+    :param fields: list of format/stream fields to retrieve, defaults to None (all fields)
+    :param jobs: maximum number of concurrent ffprobe processes, defaults to
+                 None (the number of CPUs)
+    :param ordered: True to yield the results in the order of ``urls``, False
+                    to yield them as they complete, defaults to True
+    :param \\**kwargs: other :py:func:`query` keyword arguments
+    :yield: probe results, each with the output of :py:func:`query` as its
+            ``info``
+
+    See :py:func:`full_details_many` for the concurrency and error handling.
+    """
+
+    return _probe_many(
+        lambda url: query(url, streams, fields, **kwargs), urls, jobs, ordered
+    )
@@ -23,11 +23,15 @@ from .runners import (
     SISOFFmpegFilter,
     StdFFmpegRunner,
 )
+from .pool import FilterPool
+from .latency import LatencyMonitor
+from .shm import SharedFrameRing, SharedMemoryFFmpegReader
 
 # TODO multi-stream write
 # TODO Buffered reverse video read
 
 # fmt: off
 __all__ = ['StdFFmpegRunner', 'PipedFFmpegRunner', 'BaseFFmpegRunner',
-           "SISOFFmpegFilter", "open"]
+           "SISOFFmpegFilter", "SharedMemoryFFmpegReader", "SharedFrameRing",
+           "FilterPool", "LatencyMonitor", "open"]
 # fmt: on
@@ -0,0 +1,169 @@
+"""End-to-end latency instrumentation of streaming runners
+
+:py:class:`LatencyMonitor` timestamps each block of frames/samples written to
+a runner and matches it to the output frames/samples which it produces. Input
+and output are matched by their positions in time (frame/sample counts scaled
+by the input and output rates), so the monitor assumes the filtergraph neither
+drops nor delays frames beyond its rate conversion.
+"""
+
+from __future__ import annotations
+
+import builtins
+from bisect import bisect_right
+from collections import deque
+from fractions import Fraction
+from math import ceil
+from time import perf_counter
+
+from .._typing import Sequence
+
+__all__ = ["LatencyMonitor"]
+
+
+class LatencyMonitor:
+    """Per-block latency recorder of a streaming runner
+
+    :param maxlen: maximum number of latency measurements to retain, defaults
+        to ``None`` (unlimited)
+
+    Each :py:meth:`on_write()` call timestamps a written block. The block's
+    latency is recorded when :py:meth:`on_read()` reports that the output
+    frame/sample matching the last input frame/sample of the block has been
+    read. Writing and reading one video frame at a time yields one latency
+    measurement per frame.
+    """
+
+    def __init__(self, maxlen: int | None = None):
+        self._pending: deque[tuple[int, float]] = deque()
+        self._latencies: deque[float] = deque(maxlen=maxlen)
+        self._ratio: Fraction | None = None
+        self._nin = 0
+        self._nout = 0
+
+    def set_rates(self, rate_in: int | Fraction, rate_out: int | Fraction):
+        """set the input and output rates to match the frames/samples
+
+        :param rate_in: input frame or sample rate
+        :param rate_out: output frame or sample rate
+        """
+        self._ratio = Fraction(rate_out) / Fraction(rate_in)
+
+    @property
+    def ready(self) -> bool:
+        """``True`` if the rates have been set"""
+        return self._ratio is not None
+
+    def on_write(self, n: int, timestamp: float | None = None):
+        """timestamp a written block
+
+        :param n: number of frames/samples in the block
+        :param timestamp: ``time.perf_counter()`` time of the write, defaults
+            to now
+        """
+        if n <= 0:
+            return
+        self._nin += n
+        self._pending.append(
+            (self._nin, perf_counter() if timestamp is None else timestamp)
+        )
+
+    def on_read(self, n: int, timestamp: float | None = None):
+        """record the latencies of the blocks completed by a read
+
+        :param n: number of frames/samples read
+        :param timestamp: ``time.perf_counter()`` time of the read, defaults
+            to now
+        """
+        if n <= 0:
+            return
+        self._nout += n
+        if self._ratio is None:
+            return
+
+        t = perf_counter() if timestamp is None else timestamp
+        pending = self._pending
+        while pending and ceil(pending[0][0] * self._ratio) <= self._nout:
+            self._latencies.append(t - pending.popleft()[1])
+
+    def reset(self):
+        """clear all the measurements and pending blocks"""
+        self._pending.clear()
+        self._latencies.clear()
+        self._nin = self._nout = 0
+
+    @property
+    def latencies(self) -> list[float]:
+        """recorded latencies in seconds"""
+        return list(self._latencies)
+
+    def summary(self) -> dict[str, float | int]:
+        """latency statistics
+
+        :return: dict with ``count``, and ``min``, ``mean``, ``median``, ``p95``,
+            ``p99``, and ``max`` latencies in seconds (``nan`` if no measurement)
+        """
+
+        x = sorted(self._latencies)
+        n = len(x)
+        if not n:
+            nan = float("nan")
+            return {
+                "count": 0,
+                **{k: nan for k in ("min", "mean", "median", "p95", "p99", "max")},
+            }
+
+        def pct(p):
+            return x[min(n - 1, max(0, ceil(p * n / 100) - 1))]
+
+        return {
+            "count": n,
+            "min": x[0],
+            "mean": sum(x) / n,
+            "median": pct(50),
+            "p95": pct(95),
+            "p99": pct(99),
+            "max": x[-1],
+        }
+
+    def histogram(
+        self,
+        bins: int | Sequence[float] = 10,
+        range: tuple[float, float] | None = None,
+    ) -> tuple[list[int], list[float]]:
+        """latency histogram
+
+        :param bins: number of equal-width bins or a monotonically increasing
+            sequence of bin edges in seconds, defaults to 10
+        :param range: lower and upper range of equal-width bins, defaults to
+            the minimum and maximum latencies. Ignored if ``bins`` is a sequence.
+        :return: a pair of the bin counts and bin edges (one more than the
+            counts). Like ``numpy.histogram()``, the last bin includes its
+            upper edge and the latencies outside of the edges are not counted.
+        """
+
+        x = self._latencies
+
+        if isinstance(bins, int):
+            if bins < 1:
+                raise ValueError("bins must be a positive integer.")
+            lo, hi = range or ((min(x), max(x)) if len(x) else (0.0, 1.0))
+            if hi <= lo:
+                lo, hi = lo - 0.5, hi + 0.5
+            width = (hi - lo) / bins
+            edges = [lo + i * width for i in builtins.range(bins)] + [hi]
+        else:
+            edges = [float(e) for e in bins]
+            if len(edges) < 2 or any(b <= a for a, b in zip(edges, edges[1:])):
+                raise ValueError("bins must be a monotonically increasing sequence.")
+
+        counts = [0] * (len(edges) - 1)
+        lo, hi = edges[0], edges[-1]
+        nbins = len(counts)
+        for v in x:
+            if v < lo or v > hi:
+                continue
+            i = bisect_right(edges, v) - 1
+            counts[min(i, nbins - 1)] += 1
+
+        return counts, edges
@@ -142,6 +142,7 @@ from ..configure import (
 )
 from ..filtergraph.abc import FilterGraphObject
 from .runners import PipedFFmpegRunner, SISOFFmpegFilter, StdFFmpegRunner
+from .shm import SharedMemoryFFmpegReader
 
 logger = logging.getLogger("ffmpegio")
 
@@ -264,8 +265,10 @@ def open(
     progress: ProgressCallable | None = None,
     show_log: bool = False,
     sp_kwargs: dict | None = None,
+    low_latency: bool = False,
+    shm_slots: int | None = None,
     **options: Unpack[FFmpegOptionDict],
-) -> StdFFmpegRunner:
+) -> StdFFmpegRunner | SharedMemoryFFmpegReader:
     """open a single-stream reader
 
     :param urls_fgs: Specify encoded input file(s)/devices/filters in one of the
@@ -304,6 +307,14 @@ def open(
         defaults to ``False``, hiding the logged messages
     :param sp_kwargs: keyword dict to be passed to ``subprocess.run()`` or
         ``subprocess.Popen()`` call used to run the FFmpeg, defaults to ``None``
+    :param low_latency: ``True`` to disable input probing (and the demuxer
+        buffering of network and device inputs), to flush every output packet,
+        and to shorten the pipe queues for live streams. Defaults to ``False``
+    :param shm_slots: number of slots of a shared-memory ring buffer, defaults
+        to ``None`` (no ring buffer). If specified, a
+        :py:class:`SharedMemoryFFmpegReader` is returned, which reads the
+        frames directly into the ring buffer with ``blocksize`` frames/samples
+        per slot to share them with worker processes without copying.
     :param options: optional FFmpeg options including input, output, and
         global options. For input options, append ``'_in'`` to the end of
         FFmpeg option names.
@@ -327,6 +338,7 @@ def open(
     show_log: bool = False,
     overwrite: bool = False,
     sp_kwargs: dict | None = None,
+    low_latency: bool = False,
     **options: Unpack[FFmpegOptionDict],
 ) -> StdFFmpegRunner:
     """open a single-stream media writer
@@ -358,6 +370,9 @@ def open(
         defaults to ``False``
     :param sp_kwargs: keyword dict to be passed to ``subprocess.run()`` or
         ``subprocess.Popen()`` call used to run the FFmpeg, defaults to ``None``
+    :param low_latency: ``True`` to disable input probing (and the demuxer
+        buffering of network and device inputs), to flush every output packet,
+        and to shorten the pipe queues for live streams. Defaults to ``False``
     :param options: optional FFmpeg options including input, output, and
         global options. For input options, append ``'_in'`` to the end of
         FFmpeg option names.
@@ -387,6 +402,7 @@ def open(
     progress: ProgressCallable | None = None,
     show_log: bool = False,
     sp_kwargs: dict | None = None,
+    low_latency: bool = False,
     **options: Unpack[FFmpegOptionDict],
 ) -> SISOFFmpegFilter:
     """open a single-input single-output media filter
@@ -432,6 +448,10 @@ def open(
         defaults to ``False``, hiding the logged messages
     :param sp_kwargs: keyword dict to be passed to ``subprocess.run()`` or
         ``subprocess.Popen()`` call used to run the FFmpeg, defaults to ``None``
+    :param low_latency: ``True`` to disable input probing, to flush every
+        output packet, and to shorten the pipe queues for live streams. The
+        end-to-end latency of each written block is recorded in the
+        ``latency`` monitor of the returned object. Defaults to ``False``
     :param options: optional FFmpeg options including input, output, and
         global options. For input options, append ``'_in'`` to the end of
         FFmpeg option names.
@@ -459,6 +479,7 @@ def open(
     progress: ProgressCallable | None = None,
     show_log: bool = False,
     sp_kwargs: dict | None = None,
+    low_latency: bool = False,
     **options: Unpack[FFmpegOptionDict],
 ) -> PipedFFmpegRunner:
     """open a multi-stream reader
@@ -525,6 +546,9 @@ def open(
         defaults to ``False``
     :param sp_kwargs: keyword dict to be passed to ``subprocess.run()`` or
         ``subprocess.Popen()`` call used to run the FFmpeg, defaults to ``None``
+    :param low_latency: ``True`` to disable input probing (and the demuxer
+        buffering of network and device inputs), to flush every output packet,
+        and to shorten the pipe queues for live streams. Defaults to ``False``
     :param options: optional FFmpeg options including input, output, and
         global options. For input options, append ``'_in'`` to the end of
         FFmpeg option names.
@@ -552,6 +576,7 @@ def open(
     show_log: bool = False,
     overwrite: bool = False,
     sp_kwargs: dict | None = None,
+    low_latency: bool = False,
     **options: Unpack[FFmpegOptionDict],
 ) -> PipedFFmpegRunner:
     """open a multi-stream media writer
@@ -598,6 +623,9 @@ def open(
         defaults to ``False``
     :param sp_kwargs: keyword dict to be passed to ``subprocess.run()`` or
         ``subprocess.Popen()`` call used to run the FFmpeg, defaults to ``None``
+    :param low_latency: ``True`` to disable input probing (and the demuxer
+        buffering of network and device inputs), to flush every output packet,
+        and to shorten the pipe queues for live streams. Defaults to ``False``
     :param options: optional FFmpeg options including input, output, and
         global options. For input options, append ``'_in'`` to the end of
         FFmpeg option names.
@@ -630,6 +658,7 @@ def open(
     progress: ProgressCallable | None = None,
     show_log: bool = False,
     sp_kwargs: dict | None = None,
+    low_latency: bool = False,
     **options: Unpack[FFmpegOptionDict],
 ) -> PipedFFmpegRunner:
     """Open a multiple-input-multiple-output media filter
@@ -705,6 +734,10 @@ def open(
         defaults to ``False``, hiding the logged messages
     :param sp_kwargs: keyword dict to be passed to ``subprocess.run()`` or
         ``subprocess.Popen()`` call used to run the FFmpeg, defaults to ``None``
+    :param low_latency: ``True`` to disable input probing, to flush every
+        output packet, and to shorten the pipe queues for live streams. The
+        end-to-end latency of each written block is recorded in the
+        ``latency`` monitor of the returned object. Defaults to ``False``
     :param options: global/default FFmpeg options. For output and global options,
         use FFmpeg option names as is. For input options, append "_in" to the
         option name. For example, r_in=2000 to force the input frame rate
@@ -736,6 +769,7 @@ def open(
     progress: ProgressCallable | None = None,
     show_log: bool = False,
     sp_kwargs: dict | None = None,
+    low_latency: bool = False,
     **options: Unpack[FFmpegOptionDict],
 ) -> PipedFFmpegRunner:
     """open a media decoder (encoded streams in, raw streams out)
@@ -789,6 +823,9 @@ def open(
         defaults to ``False``
     :param sp_kwargs: keyword dict to be passed to ``subprocess.run()`` or
         ``subprocess.Popen()`` call used to run the FFmpeg, defaults to ``None``
+    :param low_latency: ``True`` to disable input probing (and the demuxer
+        buffering of network and device inputs), to flush every output packet,
+        and to shorten the pipe queues for live streams. Defaults to ``False``
     :param options: global/default FFmpeg options. For output and global options,
         use FFmpeg option names as is. For input options, append "_in" to the
         option name. For example, r_in=2000 to force the input frame rate
@@ -820,6 +857,7 @@ def open(
     progress: ProgressCallable | None = None,
     show_log: bool = False,
     sp_kwargs: dict | None = None,
+    low_latency: bool = False,
     **options: FFmpegOptionDict,
 ) -> PipedFFmpegRunner:
     """open a media encoder (raw streams in, encoded streams out)
@@ -860,6 +898,9 @@ def open(
         defaults to ``False``, hiding the logged messages
     :param sp_kwargs: keyword dict to be passed to ``subprocess.run()`` or
         ``subprocess.Popen()`` call used to run the FFmpeg, defaults to ``None``
+    :param low_latency: ``True`` to disable input probing (and the demuxer
+        buffering of network and device inputs), to flush every output packet,
+        and to shorten the pipe queues for live streams. Defaults to ``False``
     :param options: global/default FFmpeg options. For output and global options,
                     use FFmpeg option names as is. For input options, append "_in" to the
                     option name. For example, r_in=2000 to force the input frame rate
@@ -888,6 +929,7 @@ def open(
     progress: ProgressCallable | None = None,
     show_log: bool = False,
     sp_kwargs: dict | None = None,
+    low_latency: bool = False,
     **options: Unpack[FFmpegOptionDict],
 ) -> PipedFFmpegRunner:
     """open a media transcoder (encoded streams in, encoded streams out)
@@ -920,6 +962,9 @@ def open(
         defaults to ``False``, hiding the logged messages
     :param sp_kwargs: keyword dict to be passed to ``subprocess.run()`` or
         ``subprocess.Popen()`` call used to run the FFmpeg, defaults to ``None``
+    :param low_latency: ``True`` to disable input probing (and the demuxer
+        buffering of network and device inputs), to flush every output packet,
+        and to shorten the pipe queues for live streams. Defaults to ``False``
     :param options: global/default FFmpeg options. For output and global options,
         use FFmpeg option names as is. For input options, append "_in" to the
         option name. For example, r_in=2000 to force the input frame rate
@@ -967,6 +1012,8 @@ def open(
             "show_log",
             "overwrite",
             "sp_kwargs",
+            "low_latency",
+            "shm_slots",
         )
         if k in kwargs
     }
@@ -1227,6 +1274,20 @@ def _open_reader(
     if "overwrite" in runner_kws and runner_kws["overwrite"] is not None:
         raise TypeError("'overwrite' keyword is not supported in the reader mode.")
 
+    nslots = runner_kws.pop("shm_slots", None)
+    if nslots is not None:
+        if not single_output:
+            raise ValueError("'shm_slots' keyword only supports a single output stream.")
+        return SharedMemoryFFmpegReader.open_shared_memory_reader(
+            urls,
+            output_streams[0],
+            kwargs,
+            squeeze,
+            extra_outputs,
+            nslots=nslots,
+            **runner_kws,
+        )
+
     return (
         StdFFmpegRunner.open_simple_reader(
             urls,
@@ -0,0 +1,383 @@
+"""Pool of warm SISO filter runners for repeated stateless filtering
+
+Each :py:func:`video.filter`, :py:func:`audio.filter`, or :py:func:`image.filter`
+call configures and spawns a new FFmpeg process. When the same stateless
+filtergraph (e.g., ``scale``, ``format``, ``crop``, ``colorspace``) is applied to
+many small batches of frames, the process startup dominates the run time.
+:py:class:`FilterPool` keeps long-lived :py:class:`SISOFFmpegFilter` runners
+alive, keyed by the filtergraph and the input and output formats, and streams
+successive batches through them.
+
+Output frames are routed back to the callers by their frame counts: each
+request is assigned the range of input frames it wrote, and the same range is
+read back from the runner output. Hence, the pooled filtergraphs must be
+stateless and preserve the frame/sample rate.
+"""
+
+from __future__ import annotations
+
+import logging
+from fractions import Fraction
+from threading import Condition, Event, Lock, Thread
+from time import monotonic
+
+from .. import plugins
+from .._typing import Any, MediaType, RawDataBlob
+from ..errors import FFmpegioError
+from ..filtergraph.abc import FilterGraphObject
+from .runners import SISOFFmpegFilter
+
+logger = logging.getLogger("ffmpegio")
+
+__all__ = ["FilterPool"]
+
+
+def _audio_flush_samples(rate: int) -> int:
+    """number of padding samples to push a batch through FFmpeg's PCM demuxer
+
+    The raw PCM demuxer emits fixed-size packets (at most 1/10 of a second),
+    holding back the tail of a batch until the packet is filled. Padding each
+    batch with a power-of-two number of samples, no shorter than 1/10 second,
+    flushes the tail.
+    """
+    n = -(-int(rate) // 10)
+    return 1 << (n - 1).bit_length()
+
+
+class _PooledFilter:
+    """warm SISO filter runner shared by successive filtering requests
+
+    :param runner: unopened filter runner
+    :param media_type: input media type
+    """
+
+    def __init__(self, runner: SISOFFmpegFilter, media_type: MediaType):
+        self.runner = runner
+        self.media_type = media_type
+        self._count = (
+            plugins.get_hook().audio_samples
+            if media_type == "audio"
+            else plugins.get_hook().video_frames
+        )
+        self.last_used = monotonic()
+        self.pending = 0  #: number of requests in flight
+        self.broken = False  #: True if input and output are no longer in sync
+        self._write_lock = Lock()
+        self._read_cond = Condition()
+        self._nrequests = 0  # number of requests which have written their batches
+        self._turn = 0  # index of the request to read its frames next
+        self._nwritten = 0  # frames/samples written to FFmpeg, including padding
+        self._nread = 0  # frames/samples read from FFmpeg, including padding
+
+    def filter(self, data: RawDataBlob, n: int) -> RawDataBlob:
+        """write a batch and read its filtered frames
+
+        :param data: input data blob
+        :param n: number of frames/samples in ``data``
+        :return: filtered data blob with ``n`` frames/samples
+        """
+
+        runner = self.runner
+        padding = (
+            _audio_flush_samples(runner.rate_in or 0)
+            if self.media_type == "audio"
+            else 0
+        )
+
+        # reserve the range of output frames while writing the batch
+        with self._write_lock:
+            if self.broken:
+                raise FFmpegioError("Pooled filter runner is no longer usable.")
+            turn = self._nrequests
+            start = self._nwritten
+            try:
+                runner.write(data)
+                if start == 0 and runner.rate != runner.rate_in:
+                    raise FFmpegioError(
+                        "FilterPool only supports filtergraphs which retain the frame/sample rate."
+                    )
+                # zero padding, its output is discarded by the next request
+                runner.write_padding(padding)
+            except:
+                self.broken = True
+                raise
+            finally:
+                self._nrequests += 1
+            self._nwritten = start + n + padding
+
+        # read the reserved range once the preceding requests are served
+        with self._read_cond:
+            self._read_cond.wait_for(lambda: self._turn == turn)
+            try:
+                if self.broken:
+                    raise FFmpegioError("Pooled filter runner is no longer usable.")
+                if start > self._nread:
+                    # drop the output of the previous padding
+                    runner.read(start - self._nread)
+                out = runner.read(n)
+                if self._count(obj=out) != n:
+                    raise runner.lasterror or FFmpegioError(
+                        "FFmpeg did not produce the expected number of frames."
+                    )
+                self._nread = start + n
+            except:
+                self.broken = True
+                raise
+            finally:
+                self._turn += 1
+                self._read_cond.notify_all()
+
+        return out
+
+    def close(self):
+        """terminate the FFmpeg process"""
+        self.runner.close()
+
+
+class FilterPool:
+    """Pool of long-lived FFmpeg filter processes for stateless filtergraphs
+
+    :param max_workers: maximum number of concurrent FFmpeg processes per
+        filter configuration, defaults to 1. Concurrent requests are pipelined
+        through a process until the limit is reached.
+    :param idle_timeout: seconds of inactivity before a process is terminated,
+        defaults to 60 seconds. Use ``None`` to keep the processes until
+        :py:meth:`close()` is called. A background thread checks for the idle
+        processes every ``idle_timeout / 2`` seconds (at most once a second).
+    :param queuesize: depth of the reader and writer queues of each process,
+        defaults to None (16)
+    :param show_log: ``True`` to show FFmpeg log messages on the console,
+        defaults to ``None`` (no show/capture)
+
+    A pooled filter is keyed by the filtergraph expression, media type, input
+    rate, input frame/sample shape and data type, ``squeeze``, and the other
+    FFmpeg options. The filtergraph must not carry any state from one frame
+    to the next, and it must retain the frame/sample rate.
+
+    Examples
+    --------
+
+    .. code-block::python
+
+        with ffmpegio.streams.FilterPool(idle_timeout=10) as pool:
+            for batch in batches:
+                rate, out = ffmpegio.video.filter("scale=320:-2", 30, batch, pool=pool)
+
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 1,
+        idle_timeout: float | None = 60.0,
+        *,
+        queuesize: int | None = None,
+        show_log: bool | None = None,
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be a positive integer.")
+
+        self.max_workers = max_workers
+        self.idle_timeout = idle_timeout
+        self._runner_kws = {"queuesize": queuesize, "show_log": show_log}
+        self._workers: dict[tuple, list[_PooledFilter]] = {}
+        self._lock = Lock()
+        self._reaper: Thread | None = None
+        self._closing = Event()
+
+    def __enter__(self) -> FilterPool:
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __len__(self) -> int:
+        """number of warm FFmpeg processes"""
+        with self._lock:
+            return sum(len(workers) for workers in self._workers.values())
+
+    def filter(
+        self,
+        expr: str | FilterGraphObject | None,
+        rate_in: int | Fraction,
+        data: RawDataBlob,
+        *,
+        media_type: MediaType = "video",
+        squeeze: bool = True,
+        **options,
+    ) -> tuple[int | Fraction, RawDataBlob]:
+        """filter a batch of frames/samples through a pooled FFmpeg process
+
+        :param expr: SISO filtergraph or None if implicit filtering via output
+            options.
+        :param rate_in: input frame rate (video) or sampling rate (audio)
+        :param data: input data blob
+        :param media_type: input media type, defaults to ``'video'``
+        :param squeeze: ``True`` to eliminate the singleton dimensions of the
+            output data, defaults to ``True``
+        :param options: FFmpeg options, append '_in' for input option names
+            (see :doc:`options`)
+        :return: output rate and filtered data blob
+        """
+
+        hook = plugins.get_hook()
+        if media_type == "audio":
+            info = hook.audio_info(obj=data)
+            n = hook.audio_samples(obj=data)
+        else:
+            info = hook.video_info(obj=data)
+            n = hook.video_frames(obj=data)
+        if info is None or n is None:
+            raise FFmpegioError("Input data blob is not supported by any plugin.")
+
+        key = (
+            media_type,
+            None if expr is None else str(expr),
+            rate_in,
+            tuple(info[0]),
+            info[1],
+            squeeze,
+            repr(sorted(options.items())),
+        )
+
+        self.evict_idle()
+
+        worker = self._acquire(key, expr, rate_in, media_type, squeeze, options)
+        try:
+            out = worker.filter(data, n)
+        finally:
+            with self._lock:
+                worker.pending -= 1
+                worker.last_used = monotonic()
+                if worker.broken:
+                    self._discard(key, worker)
+
+        return worker.runner.rate, out
+
+    def _acquire(
+        self,
+        key: tuple,
+        expr: str | FilterGraphObject | None,
+        rate_in: int | Fraction,
+        media_type: MediaType,
+        squeeze: bool,
+        options: dict[str, Any],
+    ) -> _PooledFilter:
+        """get the least busy process of the key, starting a new one if needed"""
+
+        with self._lock:
+            workers = self._workers.setdefault(key, [])
+            worker = min(workers, key=lambda w: w.pending, default=None)
+            if worker is None or (worker.pending and len(workers) < self.max_workers):
+                worker = _PooledFilter(
+                    self._create_runner(expr, rate_in, media_type, squeeze, options),
+                    media_type,
+                )
+                workers.append(worker)
+                self._start_reaper()
+            worker.pending += 1
+            return worker
+
+    def _start_reaper(self):
+        """start the idle process reaper thread (must be called with the pool lock)"""
+
+        if self.idle_timeout is None or self._reaper is not None:
+            return
+
+        interval = max(self.idle_timeout / 2, 1.0)
+
+        def reap():
+            while not self._closing.wait(interval):
+                self.evict_idle()
+
+        self._closing.clear()
+        self._reaper = Thread(target=reap, name="FilterPool reaper", daemon=True)
+        self._reaper.start()
+
+    def _create_runner(
+        self,
+        expr: str | FilterGraphObject | None,
+        rate_in: int | Fraction,
+        media_type: MediaType,
+        squeeze: bool,
+        options: dict[str, Any],
+    ) -> SISOFFmpegFilter:
+        """open a new filter runner (FFmpeg starts on the first write)"""
+
+        options = {**options}
+        if media_type == "audio":
+            input_options = {"ar": rate_in}
+            output_stream = {"map": "0:a:0"}
+            if expr is not None:
+                options["filter:a"] = expr
+        else:
+            input_options = {"r": rate_in}
+            output_stream = {"map": "0:V:0"}
+            if expr is not None:
+                options["filter:v"] = expr
+
+        # deliver each output frame as soon as it is filtered
+        output_stream["flush_packets"] = options.pop("flush_packets", 1)
+
+        logger.info("FilterPool: starting a new %s filter runner", media_type)
+        return SISOFFmpegFilter.create_and_open(
+            input_options,
+            output_stream,
+            options,
+            squeeze,
+            **self._runner_kws,
+        )
+
+    def _discard(self, key: tuple, worker: _PooledFilter):
+        """remove a worker from the pool (must be called with the pool lock)"""
+
+        workers = self._workers.get(key, [])
+        if worker in workers:
+            workers.remove(worker)
+            if not workers:
+                del self._workers[key]
+        if not worker.pending:
+            worker.close()
+
+    def evict_idle(self, idle_timeout: float | None = None) -> int:
+        """terminate the processes which have been idle for too long
+
+        :param idle_timeout: idle time in seconds, defaults to the
+            ``idle_timeout`` of the pool
+        :return: number of evicted processes
+        """
+
+        if idle_timeout is None:
+            idle_timeout = self.idle_timeout
+            if idle_timeout is None:
+                return 0
+
+        tlimit = monotonic() - idle_timeout
+        with self._lock:
+            evicted = [
+                (key, worker)
+                for key, workers in self._workers.items()
+                for worker in workers
+                if not worker.pending and worker.last_used <= tlimit
+            ]
+            for key, worker in evicted:
+                self._discard(key, worker)
+
+        if evicted:
+            logger.info("FilterPool: evicted %d idle filter runners", len(evicted))
+
+        return len(evicted)
+
+    def close(self):
+        """terminate all the pooled FFmpeg processes"""
+
+        with self._lock:
+            workers = [w for ws in self._workers.values() for w in ws]
+            self._workers = {}
+            reaper, self._reaper = self._reaper, None
+
+        if reaper is not None:
+            self._closing.set()
+            reaper.join()
+
+        for worker in workers:
+            worker.close()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import re
 from abc import ABCMeta
 from contextlib import ExitStack
 from enum import IntEnum
@@ -38,6 +39,7 @@ from ..configure import (
 )
 from ..errors import FFmpegError, FFmpegioError, FFmpegioInsufficientInputData
 from ..threading import LoggerThread
+from .latency import LatencyMonitor
 
 logger = logging.getLogger("ffmpegio")
 
@@ -48,6 +50,35 @@ __all__ = [
     "SISOFFmpegFilter",
 ]
 
+# live sources whose demuxer buffering adds latency (fflags=+nobuffer)
+_re_live_url = re.compile(
+    r"(?:rtsps?|rtmp[est]*|srt|udp|tcp|rtp|mms[ht]?|https?|wss?|zmq)://", re.I
+)
+_live_formats = {
+    "alsa",
+    "avfoundation",
+    "decklink",
+    "dshow",
+    "fbdev",
+    "gdigrab",
+    "jack",
+    "kmsgrab",
+    "openal",
+    "oss",
+    "pulse",
+    "sndio",
+    "v4l2",
+    "video4linux2",
+    "x11grab",
+}
+
+
+def _is_live_input(url: Any, opts: dict[str, Any]) -> bool:
+    """True if the input is a network stream or a capture device"""
+    return opts.get("f", None) in _live_formats or (
+        isinstance(url, str) and _re_live_url.match(url) is not None
+    )
+
 
 class FFmpegStatus(IntEnum):
     """FFmpeg runner status enum
@@ -286,6 +317,7 @@ class BaseFFmpegRunner(metaclass=ABCMeta):
     Status = FFmpegStatus
 
     _probesize: int = 32
+    _low_latency_queuesize: int = 2
     _dynamic_output: bool = False
     _use_std_pipes: bool = False
     _use_named_pipes: bool = False
@@ -299,6 +331,8 @@ class BaseFFmpegRunner(metaclass=ABCMeta):
     _pipe_kws: dict[str, Any]
     _primary_output: int | None = None
     _blocksize: int | None  # read/queue blocksize in primary output's
+    _low_latency: bool = False
+    _latency: LatencyMonitor | None = None
 
     # ffmpeg arguments and associated input/output information
     _args: dict[str, Any]
@@ -326,6 +360,7 @@ class BaseFFmpegRunner(metaclass=ABCMeta):
         show_log: bool | None = None,
         overwrite: bool | None = None,
         sp_kwargs: dict | None = None,
+        low_latency: bool = False,
     ):
         """Streaming FFmpeg runner using std pipes and/or named pipes
 
@@ -355,8 +390,18 @@ class BaseFFmpegRunner(metaclass=ABCMeta):
         :param sp_kwargs: dictionary with keywords passed to `subprocess.run()` or
                         `subprocess.Popen()` call used to run the FFmpeg, defaults
                         to None
+        :param low_latency: ``True`` to minimize the end-to-end latency of live
+                            streams by disabling input probing (and the
+                            buffering of network and device inputs), flushing
+                            every output packet, and shortening the pipe
+                            queues (unless ``queuesize`` is given). Filters
+                            also measure the latency of each written block (see
+                            :py:attr:`latency`). Defaults to ``False``
         """
 
+        if low_latency and queuesize is None:
+            queuesize = self._low_latency_queuesize
+
         self._init_func = staticmethod(init_func)
         self._init_kws = InitMediaKeywordsWithInputBuffer(init_kws)
         self._pipe_kws = {
@@ -366,6 +411,15 @@ class BaseFFmpegRunner(metaclass=ABCMeta):
         }
         self._primary_output = primary_output
         self._blocksize = blocksize
+        self._low_latency = low_latency
+        # latency is only measurable from raw input to raw output
+        self._latency = (
+            LatencyMonitor()
+            if low_latency
+            and self._init_kws.num_raw_inputs
+            and "output_streams" in self._init_kws
+            else None
+        )
 
         self._stack: ExitStack = ExitStack()
 
@@ -451,11 +505,78 @@ class BaseFFmpegRunner(metaclass=ABCMeta):
             if "probesize" not in opts:
                 opts["probesize"] = self._probesize
 
+        if self._low_latency:
+            self._set_low_latency_options(ffmpeg_args)
+
         # ready to run
         self._status = FFmpegStatus.ANALYSIS_DONE
 
         return True
 
+    def _set_low_latency_options(self, ffmpeg_args: dict[str, Any]):
+        """add the low-latency FFmpeg options unless user specified
+
+        :param ffmpeg_args: configured FFmpeg arguments (modified in place)
+
+        Each input skips the stream analysis (``probesize=32``,
+        ``analyzeduration=0``), and each output muxer flushes every packet
+        immediately (``flush_packets=1``). Live network streams and capture
+        devices also bypass the demuxer buffering (``fflags=+nobuffer``).
+        Other inputs (files, pipes, and filtergraphs) are excluded as
+        ``nobuffer`` discards the packets read during the analysis. The depth
+        of the named pipe queues is also reduced to 2 blocks at the
+        construction unless ``queuesize`` is given.
+        """
+
+        for url, opts in ffmpeg_args["inputs"]:
+            if opts is None:
+                continue
+            opts.setdefault("probesize", self._probesize)
+            opts.setdefault("analyzeduration", 0)
+            if not _is_live_input(url, opts):
+                continue
+            fflags = opts.get("fflags", None)
+            if fflags is None:
+                opts["fflags"] = "+nobuffer"
+            elif "nobuffer" not in fflags:
+                opts["fflags"] = f"{fflags}+nobuffer"
+
+        for _, opts in ffmpeg_args["outputs"]:
+            if opts is not None:
+                opts.setdefault("flush_packets", 1)
+
+    @property
+    def latency(self) -> LatencyMonitor | None:
+        """end-to-end latency monitor (``None`` unless ``low_latency=True`` and
+        the runner has both raw inputs and raw outputs, i.e., filters)
+
+        The monitor timestamps each block written to the first raw input
+        stream and records its latency when the matching frames/samples of the
+        primary output stream are read. Use its ``summary()`` and
+        ``histogram()`` methods to report the latency distribution.
+        """
+        return self._latency
+
+    def _record_write(self, stream: int, data: RawDataBlob):
+        """timestamp a written block for the latency monitor"""
+
+        mon = self._latency
+        if mon is None or stream != 0:
+            return
+        if not mon.ready and self.readable:
+            rate_out = self.primary_output_rate
+            if rate_out:
+                mon.set_rates(self.input_rates[0], rate_out)
+        mon.on_write(self._input_info[0]["data_count"](obj=data))
+
+    def _record_read(self, stream: int, data: RawDataBlob):
+        """record the latency of the blocks completed by a read"""
+
+        mon = self._latency
+        if mon is None or stream != self.primary_output:
+            return
+        mon.on_read(self._output_info[stream]["data_count"](obj=data))
+
     def _on_exit(self, rc):
         if self._status == FFmpegStatus.RUNNING:
             logger.debug("FFmpeg process has stopped")
@@ -726,6 +847,7 @@ class BaseFFmpegRunner(metaclass=ABCMeta):
             b = data2bytes(obj=data)
             writer = self._input_pipes[stream]["writer"]
             if len(b):
+                self._record_write(stream, data)
                 writer.write(b)
             if last:
                 writer.write(None)  # write the sentinel
@@ -918,6 +1040,7 @@ class BaseFFmpegRunner(metaclass=ABCMeta):
         data = info["bytes2data"](
             b=b, dtype=dtype, shape=shape, squeeze=info["squeeze"]
         )
+        self._record_read(stream, data)
 
         return data
 
@@ -1277,6 +1400,7 @@ class StdFFmpegRunner(SISOMixin, BaseFFmpegRunner):
         show_log: bool | None = None,
         overwrite: bool | None = None,
         sp_kwargs: dict | None = None,
+        low_latency: bool = False,
     ):
         """FFmpeg runner with only 1 buffered std pipe
 
@@ -1292,6 +1416,8 @@ class StdFFmpegRunner(SISOMixin, BaseFFmpegRunner):
         :param sp_kwargs: dictionary with keywords passed to `subprocess.run()` or
                         `subprocess.Popen()` call used to run the FFmpeg, defaults
                         to None
+        :param low_latency: ``True`` to minimize the end-to-end latency of live
+                            streams, defaults to ``False``
 
         """
         super().__init__(
@@ -1302,6 +1428,7 @@ class StdFFmpegRunner(SISOMixin, BaseFFmpegRunner):
             show_log=show_log,
             overwrite=overwrite,
             sp_kwargs=sp_kwargs,
+            low_latency=low_latency,
         )
 
     def _try_config_ffmpeg(
@@ -1392,6 +1519,7 @@ class StdFFmpegRunner(SISOMixin, BaseFFmpegRunner):
         show_log: bool | None = None,
         overwrite: bool | None = None,
         sp_kwargs: dict | None = None,
+        low_latency: bool = False,
     ) -> StdFFmpegRunner:
         """create a single-pipe media reader
 
@@ -1421,6 +1549,9 @@ class StdFFmpegRunner(SISOMixin, BaseFFmpegRunner):
         :param sp_kwargs: keyword dict to be passed to ``subprocess.run()`` or
             ``subprocess.Popen()`` call used to run the FFmpeg, defaults to
             ``None``
+        :param low_latency: ``True`` to disable input probing (and the buffering
+            of network and device inputs) and to flush every output packet,
+            defaults to ``False``
         """
 
         init_kws: MediaReadKwsDict = {
@@ -1440,6 +1571,7 @@ class StdFFmpegRunner(SISOMixin, BaseFFmpegRunner):
             show_log=show_log,
             overwrite=overwrite,
             sp_kwargs=sp_kwargs,
+            low_latency=low_latency,
         )
         runner.open()
         return runner
@@ -1461,6 +1593,7 @@ class StdFFmpegRunner(SISOMixin, BaseFFmpegRunner):
         show_log: bool | None = None,
         overwrite: bool | None = None,
         sp_kwargs: dict | None = None,
+        low_latency: bool = False,
     ) -> StdFFmpegRunner:
         """single-pipe media writer
 
@@ -1493,6 +1626,9 @@ class StdFFmpegRunner(SISOMixin, BaseFFmpegRunner):
         :param sp_kwargs: keyword dict to be passed to ``subprocess.run()`` or
             ``subprocess.Popen()`` call used to run the FFmpeg, defaults to
             ``None``
+        :param low_latency: ``True`` to disable input probing (and the buffering
+            of network and device inputs) and to flush every output packet,
+            defaults to ``False``
         """
 
         init_kws: MediaWriteKwsDict = {
@@ -1512,6 +1648,7 @@ class StdFFmpegRunner(SISOMixin, BaseFFmpegRunner):
             show_log=show_log,
             overwrite=overwrite,
             sp_kwargs=sp_kwargs,
+            low_latency=low_latency,
         )
         runner.open()
         return runner
@@ -1543,6 +1680,7 @@ class PipedFFmpegRunner(BaseFFmpegRunner):
         data = info["bytes2data"](
             b=b, dtype=dtype, shape=shape, squeeze=info["squeeze"]
         )
+        self._record_read(stream, data)
 
         return data
 
@@ -1637,6 +1775,7 @@ class PipedFFmpegRunner(BaseFFmpegRunner):
         show_log: bool | None = None,
         overwrite: bool | None = None,
         sp_kwargs: dict | None = None,
+        low_latency: bool = False,
     ) -> PipedFFmpegRunner:
         output_streams = utils.expand_raw_output_streams(
             output_streams, input_urls, options
@@ -1662,6 +1801,7 @@ class PipedFFmpegRunner(BaseFFmpegRunner):
             show_log=show_log,
             overwrite=overwrite,
             sp_kwargs=sp_kwargs,
+            low_latency=low_latency,
         )
         runner.open()
         return runner
@@ -1686,6 +1826,7 @@ class PipedFFmpegRunner(BaseFFmpegRunner):
         show_log: bool | None = None,
         overwrite: bool | None = None,
         sp_kwargs: dict | None = None,
+        low_latency: bool = False,
     ) -> PipedFFmpegRunner:
         init_kws: MediaWriteKwsDict = {
             "output_urls": [output_urls]
@@ -1707,6 +1848,7 @@ class PipedFFmpegRunner(BaseFFmpegRunner):
             show_log=show_log,
             overwrite=overwrite,
             sp_kwargs=sp_kwargs,
+            low_latency=low_latency,
         )
         runner.open()
         return runner
@@ -1731,6 +1873,7 @@ class PipedFFmpegRunner(BaseFFmpegRunner):
         show_log: bool | None = None,
         overwrite: bool | None = None,
         sp_kwargs: dict | None = None,
+        low_latency: bool = False,
     ) -> PipedFFmpegRunner:
         init_kws: MediaFilterKwsDict = {
             "input_options": input_options,
@@ -1754,6 +1897,7 @@ class PipedFFmpegRunner(BaseFFmpegRunner):
             show_log=show_log,
             overwrite=overwrite,
             sp_kwargs=sp_kwargs,
+            low_latency=low_latency,
         )
         runner.open()
         return runner
@@ -1777,6 +1921,7 @@ class PipedFFmpegRunner(BaseFFmpegRunner):
         show_log: bool | None = None,
         overwrite: bool | None = None,
         sp_kwargs: dict | None = None,
+        low_latency: bool = False,
     ) -> PipedFFmpegRunner:
         output_urls: list[FFmpegOutputOptionTuple] = [
             ("-", opts) for opts in output_options
@@ -1804,6 +1949,7 @@ class PipedFFmpegRunner(BaseFFmpegRunner):
             show_log=show_log,
             overwrite=overwrite,
             sp_kwargs=sp_kwargs,
+            low_latency=low_latency,
         )
         runner.open()
         return runner
@@ -1826,6 +1972,7 @@ class PipedFFmpegRunner(BaseFFmpegRunner):
         show_log: bool | None = None,
         overwrite: bool | None = None,
         sp_kwargs: dict | None = None,
+        low_latency: bool = False,
     ) -> PipedFFmpegRunner:
         input_urls: list[FFmpegInputOptionTuple] = [
             ("-", opts) for opts in input_options
@@ -1852,6 +1999,7 @@ class PipedFFmpegRunner(BaseFFmpegRunner):
             show_log=show_log,
             overwrite=overwrite,
             sp_kwargs=sp_kwargs,
+            low_latency=low_latency,
         )
         runner.open()
         return runner
@@ -1871,6 +2019,7 @@ class PipedFFmpegRunner(BaseFFmpegRunner):
         show_log: bool | None = None,
         overwrite: bool | None = None,
         sp_kwargs: dict | None = None,
+        low_latency: bool = False,
     ) -> PipedFFmpegRunner:
         input_urls = [("pipe", opts) for opts in input_options]
         output_urls = [("pipe", opts) for opts in output_options]
@@ -1895,6 +2044,7 @@ class PipedFFmpegRunner(BaseFFmpegRunner):
             show_log=show_log,
             overwrite=overwrite,
             sp_kwargs=sp_kwargs,
+            low_latency=low_latency,
         )
         runner.open()
         return runner
@@ -1931,6 +2081,7 @@ class SISOFFmpegFilter(SISOMixin, PipedFFmpegRunner):
         show_log: bool | None = None,
         overwrite: bool | None = None,
         sp_kwargs: dict | None = None,
+        low_latency: bool = False,
     ) -> SISOFFmpegFilter:
         runner = SISOFFmpegFilter(
             input_options,
@@ -1949,6 +2100,7 @@ class SISOFFmpegFilter(SISOMixin, PipedFFmpegRunner):
             show_log=show_log,
             overwrite=overwrite,
             sp_kwargs=sp_kwargs,
+            low_latency=low_latency,
             options=options,
         )
         runner.open()
@@ -1978,6 +2130,7 @@ class SISOFFmpegFilter(SISOMixin, PipedFFmpegRunner):
         show_log: bool | None = None,
         overwrite: bool | None = None,
         sp_kwargs: dict | None = None,
+        low_latency: bool = False,
     ):
         init_func = configure.init_media_filter
         init_kws: MediaFilterKwsDict = {
@@ -2002,6 +2155,7 @@ class SISOFFmpegFilter(SISOMixin, PipedFFmpegRunner):
             show_log=show_log,
             overwrite=overwrite,
             sp_kwargs=sp_kwargs,
+            low_latency=low_latency,
         )
 
     def _try_config_ffmpeg(
@@ -2040,6 +2194,25 @@ class SISOFFmpegFilter(SISOMixin, PipedFFmpegRunner):
 
         return ok
 
+    def write_padding(self, n: int):
+        """write zero-valued frames/samples to the running FFmpeg
+
+        :param n: number of frames/samples to write
+
+        The padding is not recorded by the :py:attr:`latency` monitor. Use it
+        to push buffered frames/samples through FFmpeg, and discard the
+        corresponding output.
+        """
+
+        try:
+            info = self._input_info[0]
+            writer = self._input_pipes[0]["writer"]
+        except AttributeError as e:
+            raise FFmpegioError("FFmpeg is not running yet.") from e
+
+        if n > 0:
+            writer.write(bytes(n * info["item_size"]))
+
     # def filter(self, data: RawDataBlob, *, last: bool = False) -> RawDataBlob:
     #     """filter a raw media data blob to the specified stream
 
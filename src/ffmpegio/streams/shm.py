@@ -0,0 +1,486 @@
+"""Shared-memory frame fan-out to worker processes
+
+:py:class:`SharedMemoryFFmpegReader` reads the raw FFmpeg output directly into
+the slots of a :py:class:`SharedFrameRing`, a ring buffer allocated in
+:py:mod:`multiprocessing.shared_memory`. Instead of pickling the frames to the
+worker processes, only the slot indices are passed. Each worker attaches to
+the ring with its :py:attr:`SharedFrameRing.spec`, accesses the frames
+in-place, and releases the slot when it is done with it.
+
+Examples
+--------
+
+.. code-block::python
+
+    from concurrent.futures import ProcessPoolExecutor
+    from ffmpegio.streams.shm import SharedFrameRing
+
+    ring = None
+
+    def attach(spec):
+        global ring
+        ring = SharedFrameRing.attach(spec)
+
+    def work(slot, nframes):
+        frames = ring.array(slot, nframes)  # NumPy view, no copy
+        result = frames.mean()
+        del frames
+        ring.release(slot)  # ack to free the slot for the next frames
+        return result
+
+    with ffmpegio.open("video.mp4", "rv", shm_slots=8, blocksize=4) as reader:
+        with ProcessPoolExecutor(
+            initializer=attach, initargs=(reader.ring.spec,)
+        ) as executor:
+            futures = [executor.submit(work, *item) for item in reader]
+            results = [f.result() for f in futures]
+
+"""
+
+from __future__ import annotations
+
+import logging
+from multiprocessing.shared_memory import SharedMemory
+from threading import Event
+from time import sleep
+
+from .. import configure, utils
+from .._typing import (
+    TYPE_CHECKING,
+    Any,
+    DTypeString,
+    FFmpegOptionDict,
+    Iterator,
+    ProgressCallable,
+    RawDataBlob,
+    Sequence,
+    ShapeTuple,
+    override,
+)
+from ..configure import (
+    FFmpegInputOptionTuple,
+    FFmpegInputUrlComposite,
+    FFmpegOutputOptionTuple,
+    FFmpegOutputUrlComposite,
+    MediaReadKwsDict,
+)
+from ..errors import FFmpegioError
+from ..threading import SharedMemoryReaderThread
+from .runners import StdFFmpegRunner
+
+if TYPE_CHECKING:
+    from numpy import ndarray
+
+logger = logging.getLogger("ffmpegio")
+
+__all__ = ["SharedFrameRing", "SharedMemoryFFmpegReader"]
+
+_ALIGN = 64  # byte alignment of the slots
+
+_FREE = 0
+_IN_USE = 1
+
+
+def _align(n: int) -> int:
+    return -(-n // _ALIGN) * _ALIGN
+
+
+class SharedFrameRing:
+    """Ring buffer of fixed-size frame blocks in a shared memory block
+
+    :param shm: shared memory block
+    :param nslots: number of slots
+    :param slot_frames: maximum number of frames/samples per slot
+    :param shape: shape of a video frame or an audio sample
+    :param dtype: data type of the frames/samples
+    :param owner: ``True`` if this object created the shared memory block
+
+    Use :py:meth:`create()` to allocate a new ring buffer in the producer
+    process and :py:meth:`attach()` to access it from the worker processes.
+
+    The shared memory block starts with one state byte per slot, followed by
+    the slots, each aligned to 64 bytes. A slot is in use from the time the
+    producer acquires it until a consumer calls :py:meth:`release()`.
+    """
+
+    def __init__(
+        self,
+        shm: SharedMemory,
+        nslots: int,
+        slot_frames: int,
+        shape: ShapeTuple,
+        dtype: DTypeString,
+        owner: bool = False,
+    ):
+        self.shm = shm
+        self.nslots = nslots
+        self.slot_frames = slot_frames
+        self.shape = tuple(shape)
+        self.dtype = dtype
+        self.itemsize = utils.get_samplesize(shape, dtype)
+        self.slot_nbytes = slot_frames * self.itemsize
+        self._offset = _align(nslots)
+        self._stride = _align(self.slot_nbytes)
+        self._owner = owner
+        self._next = 0
+
+    @classmethod
+    def _nbytes(cls, nslots: int, slot_nbytes: int) -> int:
+        return _align(nslots) + nslots * _align(slot_nbytes)
+
+    @classmethod
+    def create(
+        cls,
+        nslots: int,
+        slot_frames: int,
+        shape: ShapeTuple,
+        dtype: DTypeString,
+    ) -> SharedFrameRing:
+        """allocate a new ring buffer
+
+        :param nslots: number of slots
+        :param slot_frames: maximum number of frames/samples per slot
+        :param shape: shape of a video frame or an audio sample
+        :param dtype: data type of the frames/samples
+        :return: the ring buffer, which owns the shared memory block
+        """
+
+        if nslots < 1 or slot_frames < 1:
+            raise ValueError("nslots and slot_frames must be positive integers.")
+
+        slot_nbytes = slot_frames * utils.get_samplesize(shape, dtype)
+        shm = SharedMemory(create=True, size=cls._nbytes(nslots, slot_nbytes))
+        shm.buf[:nslots] = bytes(nslots)  # all free
+        return cls(shm, nslots, slot_frames, shape, dtype, owner=True)
+
+    @classmethod
+    def attach(cls, spec: dict[str, Any]) -> SharedFrameRing:
+        """attach to an existing ring buffer (e.g., in a worker process)
+
+        :param spec: :py:attr:`spec` of the ring buffer
+        :return: the ring buffer
+        """
+
+        spec = {**spec}
+        shm = SharedMemory(name=spec.pop("name"))
+        return cls(shm, **spec)
+
+    @property
+    def spec(self) -> dict[str, Any]:
+        """picklable specification to attach to the ring buffer"""
+        return {
+            "name": self.shm.name,
+            "nslots": self.nslots,
+            "slot_frames": self.slot_frames,
+            "shape": self.shape,
+            "dtype": self.dtype,
+        }
+
+    def __enter__(self) -> SharedFrameRing:
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def close(self):
+        """detach from the shared memory block (and free it if owner)"""
+
+        self.shm.close()
+        if self._owner:
+            self._owner = False
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+    def in_use(self, slot: int) -> bool:
+        """``True`` if the slot has been acquired but not yet released"""
+        return self.shm.buf[slot] != _FREE
+
+    @property
+    def num_in_use(self) -> int:
+        """number of slots in use"""
+        return self.nslots - self.shm.buf[: self.nslots].tobytes().count(_FREE)
+
+    def acquire(
+        self, halt: Event | None = None, retry_delay: float = 1e-3
+    ) -> int | None:
+        """acquire a free slot (producer only)
+
+        :param halt: event to stop waiting, defaults to None (wait indefinitely)
+        :param retry_delay: polling interval in seconds while all the slots are
+                            in use, defaults to 1 ms
+        :return: slot index or ``None`` if ``halt`` is set while waiting
+
+        The slots are acquired in the ring order, so the consumers see the
+        frames in order as long as they release the slots in order.
+        """
+
+        states = self.shm.buf
+        nslots = self.nslots
+        while True:
+            for i in range(nslots):
+                slot = (self._next + i) % nslots
+                if states[slot] == _FREE:
+                    states[slot] = _IN_USE
+                    self._next = (slot + 1) % nslots
+                    return slot
+            if halt is not None and halt.is_set():
+                return None
+            sleep(retry_delay)
+
+    def release(self, slot: int):
+        """release a slot so the producer can refill it (the ack)
+
+        :param slot: slot index
+        """
+        self.shm.buf[slot] = _FREE
+
+    def view(self, slot: int, nframes: int | None = None) -> memoryview:
+        """memoryview of a slot
+
+        :param slot: slot index
+        :param nframes: number of frames/samples, defaults to the slot size
+        :return: byte memoryview of the slot data (release it before closing
+                 the ring buffer)
+        """
+
+        if slot < 0 or slot >= self.nslots:
+            raise IndexError(f"{slot=} is out of range.")
+        nbytes = (
+            self.slot_nbytes if nframes is None else nframes * self.itemsize
+        )
+        start = self._offset + slot * self._stride
+        return self.shm.buf[start : start + nbytes]
+
+    def array(self, slot: int, nframes: int | None = None) -> ndarray:
+        """NumPy array view of a slot (no copy)
+
+        :param slot: slot index
+        :param nframes: number of frames/samples, defaults to the slot size
+        :return: array of the shape ``(nframes, *shape)``. Delete the array
+                 before closing the ring buffer.
+        """
+
+        import numpy as np
+
+        n = self.slot_frames if nframes is None else nframes
+        return np.ndarray(
+            (n, *self.shape),
+            self.dtype,
+            buffer=self.shm.buf,
+            offset=self._offset + slot * self._stride,
+        )
+
+
+class SharedMemoryFFmpegReader(StdFFmpegRunner):
+    """FFmpeg media reader which delivers its frames in a shared-memory ring buffer
+
+    The reader thread reads FFmpeg's stdout directly into the slots of a
+    :py:class:`SharedFrameRing` (:py:attr:`ring`). Iterating the reader or
+    calling :py:meth:`read_slot()` yields the filled slots. The slots must be
+    released, by the producer or the worker processes, to be refilled.
+    """
+
+    _ring: SharedFrameRing | None = None
+
+    def __init__(
+        self,
+        init_func,
+        init_kws: MediaReadKwsDict,
+        nslots: int = 8,
+        blocksize: int | None = None,
+        progress: ProgressCallable | None = None,
+        show_log: bool | None = None,
+        sp_kwargs: dict | None = None,
+        low_latency: bool = False,
+    ):
+        """Single-output FFmpeg reader using a shared-memory ring buffer
+
+        :param init_func: FFmpeg initialization function from :py:module:`configure`
+        :param init_kws: keyword arguments to call the FFmpeg initialization function
+        :param nslots: number of ring buffer slots, defaults to 8
+        :param blocksize: number of frames/samples per slot, defaults to use
+                          ``1`` (frame) for a video stream and ``1024`` (samples)
+                          for audio stream.
+        :param progress: progress callback function, defaults to None
+        :param show_log: True to show FFmpeg log messages on the console, defaults
+                         to None (no show/capture)
+        :param sp_kwargs: dictionary with keywords passed to `subprocess.run()` or
+                        `subprocess.Popen()` call used to run the FFmpeg, defaults
+                        to None
+        :param low_latency: ``True`` to minimize the end-to-end latency of live
+                            streams, defaults to ``False``
+        """
+
+        # validate before FFmpeg is spawned
+        if nslots < 1:
+            raise ValueError("nslots must be a positive integer.")
+        if blocksize is not None and blocksize < 1:
+            raise ValueError("blocksize must be a positive integer.")
+
+        super().__init__(
+            init_func,
+            init_kws,
+            blocksize=blocksize,
+            progress=progress,
+            show_log=show_log,
+            sp_kwargs=sp_kwargs,
+            low_latency=low_latency,
+        )
+        self._nslots = nslots
+
+    @override
+    def _run_ffmpeg(self):
+        super()._run_ffmpeg()
+
+        st = self.primary_output
+        info = self._output_info[st]
+        dtype, shape, _ = info["raw_info"]
+        try:
+            self._ring = SharedFrameRing.create(
+                self._nslots, self.primary_output_blocksize, shape, dtype
+            )
+        except:
+            self._terminate()
+            raise
+
+        # replace the StdReader with the shared-memory reader thread
+        reader = SharedMemoryReaderThread(
+            self._proc.stdout, self._ring, info["item_size"]
+        )
+        self._output_pipes[st]["reader"] = reader
+        reader.start()
+
+    @property
+    def ring(self) -> SharedFrameRing | None:
+        """shared-memory ring buffer (None if FFmpeg not started)"""
+        return self._ring
+
+    def read_slot(self, timeout: float | None = None) -> tuple[int, int] | None:
+        """get the next filled slot
+
+        :param timeout: timeout in seconds, defaults to wait indefinitely
+        :return: a pair of the slot index and the number of frames/samples in
+                 the slot or ``None`` if FFmpeg has finished
+        :raises queue.Empty: if timed out
+        """
+
+        try:
+            reader = self._output_pipes[self.primary_output]["reader"]
+        except AttributeError as e:
+            raise FFmpegioError("FFmpeg is not running yet.") from e
+        return reader.get(timeout)
+
+    def release(self, slot: int):
+        """release a slot (ack) so it can be refilled
+
+        :param slot: slot index
+        """
+        self._ring.release(slot)
+
+    @override
+    def read(self, n: int, stream: int = 0) -> RawDataBlob:
+        raise FFmpegioError(
+            "SharedMemoryFFmpegReader delivers frames via the ring buffer. Use read_slot()."
+        )
+
+    @override
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        """iterate over the filled slots
+
+        :yield: a pair of the slot index and the number of frames/samples in
+                the slot. The last slot may be partially filled.
+        """
+
+        item = self.read_slot()
+        while item is not None:
+            yield item
+            item = self.read_slot()
+
+    @override
+    def close(self):
+        """Kill FFmpeg process, stop the reader thread, and free the ring buffer
+
+        The worker processes must be done with the ring buffer.
+        """
+
+        super().close()
+
+        try:
+            reader = self._output_pipes[self.primary_output]["reader"]
+        except (AttributeError, KeyError):
+            reader = None
+        if isinstance(reader, SharedMemoryReaderThread):
+            reader.join()
+
+        if self._ring is not None:
+            self._ring.close()
+            self._ring = None
+
+    @staticmethod
+    def open_shared_memory_reader(
+        input_urls: Sequence[FFmpegInputUrlComposite | FFmpegInputOptionTuple],
+        output_stream: str | FFmpegOptionDict,
+        options: FFmpegOptionDict | None = None,
+        squeeze: bool = True,
+        extra_outputs: (
+            Sequence[FFmpegOutputUrlComposite | FFmpegOutputOptionTuple] | None
+        ) = None,
+        *,
+        nslots: int = 8,
+        blocksize: int | None = None,
+        progress: ProgressCallable | None = None,
+        show_log: bool | None = None,
+        sp_kwargs: dict | None = None,
+        low_latency: bool = False,
+    ) -> SharedMemoryFFmpegReader:
+        """create a single-output media reader with a shared-memory ring buffer
+
+        :param input_urls: URL string of the file or format/device object or
+            a list thereof.
+        :param output_stream: Either an FFmpeg map option value or a dict of
+            FFmpeg output options. If dict, it must include a ``'map'`` key. The
+            ``'map'`` must resolve to only one stream.
+        :param options: optional FFmpeg option dict including input, output, and
+            global options. For input options, append ``'_in'`` to the end of
+            FFmpeg option names.
+        :param squeeze: unused, kept for the compatibility with
+            :py:meth:`StdFFmpegRunner.open_simple_reader`
+        :param extra_outputs: extra encoded output urls, Each element is a tuple
+            pair of url and output option dict. The url must be a url and not
+            pipes or pipe objects.
+        :param nslots: number of ring buffer slots, defaults to 8
+        :param blocksize: number of frames/samples per slot, defaults to 1
+            frame for video or 1024 samples for audio
+        :param progress: progress callback function, defaults to ``None``
+        :param show_log: ``True`` to show FFmpeg log messages on the console,
+            defaults to ``False``, hiding the logged messages
+        :param sp_kwargs: keyword dict to be passed to ``subprocess.run()`` or
+            ``subprocess.Popen()`` call used to run the FFmpeg, defaults to
+            ``None``
+        :param low_latency: ``True`` to disable input probing and buffering and
+            to flush every output packet for live streams, defaults to ``False``
+        """
+
+        init_kws: MediaReadKwsDict = {
+            "input_urls": [input_urls]
+            if utils.is_valid_input(input_urls)
+            else input_urls,
+            "output_streams": [output_stream],
+            "options": options,
+            "extra_outputs": extra_outputs,
+            "squeeze": squeeze,
+        }
+        runner = SharedMemoryFFmpegReader(
+            init_func=configure.init_media_read,
+            init_kws=init_kws,
+            nslots=nslots,
+            blocksize=blocksize,
+            progress=progress,
+            show_log=show_log,
+            sp_kwargs=sp_kwargs,
+            low_latency=low_latency,
+        )
+        runner.open()
+        return runner
@@ -23,7 +23,8 @@ logger = logging.getLogger("ffmpegio")
 
 # fmt:off
 __all__ = ['FFmpegError', 'ThreadNotActive', 'ProgressMonitorThread',
- 'LoggerThread', 'ReaderThread', 'WriterThread', 'Empty', 'Full']
+ 'LoggerThread', 'ReaderThread', 'WriterThread', 'SharedMemoryReaderThread',
+ 'Empty', 'Full']
 # fmt:on
 
 
@@ -321,6 +322,7 @@ class ReaderThread(Thread):
         self._halt = Event()
         self._cooling = Event()
         self._running = Event()
+        self._eof = Event()
         self._retry_delay = 0.01 if retry_delay is None else retry_delay
         self._timeout = float(timeout) if timeout else None
 
@@ -372,6 +374,14 @@ class ReaderThread(Thread):
     def wait_till_running(self, timeout: float | None = None) -> bool:
         return self._running.wait(timeout or self._timeout)
 
+    def wait_till_eof(self, timeout: float | None = None) -> bool:
+        """wait till all the data written to the pipe are queued
+
+        :param timeout: timeout in seconds, defaults to wait indefinitely
+        :return: True if the end of the stream is reached
+        """
+        return self._eof.wait(timeout or self._timeout)
+
     def __enter__(self):
         self.start()
         return self
@@ -430,11 +440,14 @@ class ReaderThread(Thread):
                 self._halt.set()
                 break
             else:
+                if data == b"":  # the writer closed the pipe
+                    self._eof.set()
                 # pause a bit then try again
                 # logger.info("ReaderThread no data, reader thread pausing")
                 sleep(self._retry_delay)
 
         logger.debug("stopping to read")
+        self._eof.set()
         logger.info("ReaderThread sending the sentinel")
         while not self._halt.is_set():
             try:
@@ -792,6 +805,126 @@ class WriterThread(Thread):
         return self._queue.full()
 
 
+class SharedMemoryReaderThread(Thread):
+    """a thread to read fixed-size blocks of a stream directly into ring buffer slots
+
+    :param stdout: readable stream (e.g., FFmpeg's stdout)
+    :param ring: ring buffer object with ``acquire(halt, retry_delay)``,
+                 ``view(slot)``, and ``release(slot)`` methods (see
+                 :py:class:`ffmpegio.streams.shm.SharedFrameRing`)
+    :param itemsize: number of bytes per frame/sample
+    :param retry_delay: polling interval in seconds while waiting for a free
+                        slot, defaults to None (1 ms)
+
+    Each filled slot is announced as a ``(slot, nframes)`` pair which can be
+    retrieved with :py:meth:`get()`. The last slot may be partially filled.
+    ``None`` is returned after the stream is exhausted.
+    """
+
+    def __init__(
+        self,
+        stdout: BinaryIO,
+        ring,
+        itemsize: int,
+        retry_delay: float | None = None,
+    ):
+        super().__init__()
+        self.stdout = stdout
+        self.ring = ring
+        self.itemsize = itemsize
+        self._queue = Queue()  # depth is limited by the ring buffer
+        self._halt = Event()
+        self._retry_delay = 1e-3 if retry_delay is None else retry_delay
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *_):
+        self.join()
+        return False
+
+    def cool_down(self):
+        """stop reading and close the stream"""
+        self._halt.set()
+        try:
+            self.stdout.close()
+        except Exception:
+            pass
+
+    def join(self, timeout: float | None = None):
+        self.cool_down()
+        super().join(timeout)
+
+    def run(self):
+        logger.info("SharedMemoryReaderThread starting")
+
+        stream = self.stdout
+        ring = self.ring
+        queue = self._queue
+
+        eof = False
+        while not (eof or self._halt.is_set()):
+            slot = ring.acquire(self._halt, self._retry_delay)
+            if slot is None:
+                break  # halted while waiting for a free slot
+
+            # fill the slot directly from the stream
+            nbytes = 0
+            with ring.view(slot) as buf:
+                nslot = len(buf)
+                while nbytes < nslot:
+                    with buf[nbytes:] as dst:
+                        try:
+                            n = stream.readinto(dst)
+                        except Exception:  # I/O operation on closed file
+                            n = 0
+                    if not n:
+                        eof = True
+                        break
+                    nbytes += n
+
+            nframes = nbytes // self.itemsize
+            if nframes:
+                logger.debug(
+                    "SharedMemoryReaderThread filled slot %d (%d frames)", slot, nframes
+                )
+                queue.put((slot, nframes))
+            else:
+                ring.release(slot)
+
+        queue.put(None)  # sentinel
+        logger.info("SharedMemoryReaderThread exiting")
+
+    def get(self, timeout: float | None = None) -> tuple[int, int] | None:
+        """get the next filled slot
+
+        :param timeout: timeout in seconds, defaults to wait indefinitely
+        :return: a pair of the slot index and the number of frames/samples in
+                 the slot or ``None`` if the stream is exhausted
+        """
+        item = self._queue.get(True, timeout)
+        if item is None:
+            self._queue.put(None)  # keep the sentinel for subsequent calls
+        return item
+
+    def clear(self):
+        """release all the filled slots which have not been retrieved"""
+
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except Empty:
+                break
+            if item is None:
+                self._queue.put(None)
+                break
+            self.ring.release(item[0])
+
+    def full(self) -> bool:
+        return False
+
+
 class CopyFileObjThread(Thread):
     """run shutil.copyfileobj in the thread
 
@@ -2,13 +2,19 @@
 
 from __future__ import annotations
 
+import io
 import logging
+import os
 import re
+import shutil
 from collections import defaultdict
-from collections.abc import Callable, Sequence
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
 from fractions import Fraction
 from math import cos, radians, sin
 from numbers import Number
+from threading import Thread
 
 from .. import caps, plugins, probe, stream_spec
 from .. import filtergraph as fgb
@@ -29,6 +35,7 @@ from .._typing import (
     ShapeTuple,
 )
 from .._utils import (
+    DEFAULT_PROBESIZE,
     as_multi_option,
     escape,
     get_samplesize,
@@ -469,6 +476,78 @@ def array_to_video_options(
     )
 
 
+class SniffedReader(io.RawIOBase):
+    """read-once wrapper of a non-seekable file object
+
+    :param fileobj: readable file object
+    :param probesize: maximum number of bytes to be buffered for probing,
+                      defaults to None (:py:data:`DEFAULT_PROBESIZE`)
+
+    The head of the source data (up to `probesize` bytes) is buffered in
+    memory on the first :py:meth:`head()` call so ffprobe can analyze the input
+    without consuming it. Reading the wrapper object replays the buffered head,
+    followed by the rest of the source data. Closing the wrapper leaves the
+    source file object open.
+    """
+
+    def __init__(self, fileobj: IO, probesize: int | None = None):
+        super().__init__()
+        self._fileobj = fileobj
+        self._probesize = probesize or DEFAULT_PROBESIZE
+        self._head: bytes | None = None
+        self._pos = 0  # read position in the head buffer
+
+    def head(self) -> bytes:
+        """the first `probesize` bytes of the source data (or all if shorter)"""
+        if self._head is None:
+            chunks = []
+            nleft = self._probesize
+            while nleft > 0:
+                chunk = self._fileobj.read(nleft)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                nleft -= len(chunk)
+            self._head = b"".join(chunks)
+        return self._head
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        if self._head is not None and self._pos < len(self._head):
+            n = min(len(b), len(self._head) - self._pos)
+            b[:n] = self._head[self._pos : self._pos + n]
+            self._pos += n
+            if self._pos == len(self._head):
+                self._head = b""  # release the buffer
+                self._pos = 0
+            return n
+
+        data = self._fileobj.read(len(b))
+        n = len(data)
+        b[:n] = data
+        return n
+
+    def open_pipe(self) -> IO:
+        """feed the data to a new OS pipe in a background thread
+
+        :return: read end of the pipe, which can be passed to a subprocess as its stdin
+        """
+
+        fd_r, fd_w = os.pipe()
+
+        def copy():
+            with open(fd_w, "wb") as f:
+                try:
+                    shutil.copyfileobj(self, f)
+                except OSError:  # reader terminated early
+                    pass
+
+        Thread(target=copy, daemon=True).start()
+        return open(fd_r, "rb")
+
+
 def set_sp_kwargs_stdin(
     url: str | None, info: InputInfoDict, sp_kwargs: dict = {}
 ) -> tuple[str, dict | None, Callable]:
@@ -491,6 +570,9 @@ def set_sp_kwargs_stdin(
                 sp_kwargs = {**sp_kwargs, "input": info["buffer"]}
         elif src_type == "fileobj":
             f = info["fileobj"]
+            if isinstance(f, SniffedReader):
+                # probe only the buffered head of the source data
+                return url, {**sp_kwargs, "input": f.head()}, exit_fcn
             sp_kwargs = {**sp_kwargs, "stdin": f}
             if f.readable() and f.seekable():
                 pos = f.tell()
@@ -504,6 +586,131 @@ def set_sp_kwargs_stdin(
     return url, sp_kwargs, exit_fcn
 
 
+class ProbePlan:
+    """per-configuration cache of the ffprobe stream information of the inputs
+
+    While a plan is active (see :py:func:`probe_plan`), :py:func:`analyze_input_file`
+    runs ffprobe only once per input, retrieving all the stream fields used by
+    the input analyzers of all the streams, and answers the subsequent queries
+    on the same input from the cached result.
+    """
+
+    fields = (
+        "index",
+        "codec_type",
+        "pix_fmt",
+        "width",
+        "height",
+        "r_frame_rate",
+        "avg_frame_rate",
+        "sample_rate",
+        "sample_fmt",
+        "channels",
+    )
+
+    def __init__(self):
+        # id(input_info) -> (input_info, streams)
+        self._streams: dict[int, tuple[InputInfoDict, list[dict]]] = {}
+
+    def query(
+        self,
+        fields: list[str],
+        input_url: str | None,
+        input_opts: dict,
+        input_info: InputInfoDict,
+        stream: str | StreamSpecDict | None,
+    ) -> list[dict] | None:
+        """answer the analyze_input_file() query from the cached streams
+
+        :return: the requested field values of the matching streams or None
+                 if the query cannot be answered by the plan
+        """
+
+        if input_info.get("src_type", None) not in ("url", "buffer", "fileobj"):
+            return None  # filtergraph outputs vary by the query
+        if not set(fields).issubset(self.fields):
+            return None
+
+        select = _stream_selector(stream)
+        if select is None:
+            return None
+
+        key = id(input_info)
+        try:
+            streams = self._streams[key][1]
+        except KeyError:
+            streams = _probe_input_file(
+                list(self.fields), input_url, input_opts, input_info, None
+            )
+            # keep input_info referenced so its id is not recycled
+            self._streams[key] = (input_info, streams)
+
+        out = [{k: st[k] for k in fields if k in st} for st in select(streams)]
+        if not out:
+            raise ValueError(f"Unknown or invalid stream specifier: {stream}")
+        return out
+
+
+def _stream_selector(
+    stream: str | StreamSpecDict | None,
+) -> Callable[[list[dict]], list[dict]] | None:
+    """stream selection function of a simple stream specifier
+
+    :param stream: stream specifier
+    :return: function to pick the matching streams out of all streams or None
+             if the specifier requires ffprobe to resolve
+    """
+
+    if stream is None:
+        return lambda streams: streams
+
+    try:
+        spec = (
+            stream_spec.parse_stream_spec(stream) if isinstance(stream, str) else stream
+        )
+    except ValueError:
+        return None
+    if not set(spec).issubset(("stream_type", "index")):
+        return None
+
+    stream_type = spec.get("stream_type", None)
+    if stream_type not in (None, "v", "a", "s", "d"):
+        return None  # "V" & "t" need disposition or codec info
+    media_type = stream_spec.stream_type_to_media_type(stream_type)
+    index = spec.get("index", None)
+
+    def select(streams):
+        if media_type is not None:
+            streams = [st for st in streams if st.get("codec_type") == media_type]
+            return streams if index is None else streams[index : index + 1]
+        return streams if index is None else [s for s in streams if s["index"] == index]
+
+    return select
+
+
+_probe_plan: ContextVar[ProbePlan | None] = ContextVar("probe_plan", default=None)
+
+
+@contextmanager
+def probe_plan() -> Iterator[ProbePlan]:
+    """activate a probe plan for the duration of a configuration
+
+    Nested calls share the outermost plan.
+    """
+
+    plan = _probe_plan.get()
+    if plan is not None:
+        yield plan
+        return
+
+    plan = ProbePlan()
+    token = _probe_plan.set(plan)
+    try:
+        yield plan
+    finally:
+        _probe_plan.reset(token)
+
+
 def analyze_input_file(
     fields: list[str],
     input_url: str | None,
@@ -519,9 +726,34 @@ def analyze_input_file(
     :param input_info: input infomration
     :param stream: stream specifier, defaults to None to return all streams
     :return values of the requested fields of the stream
+
+    If a probe plan is active (see :py:func:`probe_plan`), the input is probed
+    only once per configuration.
     """
 
-    input_url, sp_kwargs, exit_fcn = set_sp_kwargs_stdin(input_url, input_info)
+    plan = _probe_plan.get()
+    if plan is not None:
+        out = plan.query(fields, input_url, input_opts, input_info, stream)
+        if out is not None:
+            return out
+
+    return _probe_input_file(fields, input_url, input_opts, input_info, stream)
+
+
+def _probe_input_file(
+    fields: list[str],
+    input_url: str | None,
+    input_opts: dict,
+    input_info: InputInfoDict,
+    stream: str | StreamSpecDict | None,
+) -> list[dict]:
+    """run ffprobe for analyze_input_file()"""
+
+    if input_info["src_type"] == "buffer" and "buffer" in input_info:
+        # let probe pipe in only the bounded head of the buffer
+        input_url, sp_kwargs, exit_fcn = input_info["buffer"], None, lambda: None
+    else:
+        input_url, sp_kwargs, exit_fcn = set_sp_kwargs_stdin(input_url, input_info)
     try:
         return probe.query(
             input_url,
@@ -1005,22 +1237,18 @@ def input_file_stream_specs(
         return {0: f"{info['media_type'][0]}:0"}
 
     # file/network input - process only if seekable
-    # get ffprobe subprocess keywords
-    url, sp_kwargs, exit_fcn = set_sp_kwargs_stdin(url, info)
-    if sp_kwargs is None:
-        # something failed (warning logged)
+    if info["src_type"] not in ("url", "buffer", "fileobj", "filtergraph"):
+        # unknown input source type
+        logger.warning("unknown input source type.")
         return {}
 
-    try:
-        streams = [
-            st
-            for st in analyze_input_file(
-                ["index", "codec_type"], url, opts, {"src_type": "url"}, stream_spec
-            )
-            if st["codec_type"] in ("audio", "video")
-        ]
-    finally:
-        exit_fcn()
+    streams = [
+        st
+        for st in analyze_input_file(
+            ["index", "codec_type"], url, opts, info, stream_spec
+        )
+        if st["codec_type"] in ("audio", "video")
+    ]
 
     specs = {}
     counts = defaultdict(int)
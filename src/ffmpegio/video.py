@@ -1,10 +1,13 @@
+from __future__ import annotations
+
 import logging
 import warnings
 from fractions import Fraction
 
-from . import analyze, configure, utils
+from . import analyze, configure, media, utils
 from . import filtergraph as fgb
 from ._typing import (
+    TYPE_CHECKING,
     Any,
     DTypeString,
     FFmpegOptionDict,
@@ -22,8 +25,12 @@ from .configure import (
 )
 from .errors import FFmpegioError
 from .std_runners import run_and_return_encoded, run_and_return_raw
+from .stream_spec import parse_map_option, stream_type_to_media_type
+
+if TYPE_CHECKING:
+    from .streams.pool import FilterPool
 
-__all__ = ["create", "read", "write", "filter", "detect"]
+__all__ = ["create", "read", "read_renditions", "write", "filter", "detect"]
 
 logger = logging.getLogger("ffmpegio")
 
@@ -161,6 +168,60 @@ def read(
     )
 
 
+def read_renditions(
+    url: FFmpegInputUrlComposite | FFmpegInputOptionTuple,
+    renditions: list[FFmpegOptionDict],
+    *,
+    squeeze: bool = True,
+    progress: ProgressCallable | None = None,
+    show_log: bool | None = None,
+    sp_kwargs: dict[str, Any] | None = None,
+    **options,
+) -> tuple[list[Fraction | int], list[RawDataBlob]]:
+    """Read multiple renditions of video frames, decoding the video once
+
+    :param url: URL of the video file to read. The url may be accompanied by its
+                own input options (a tuple pair of url and its option dict).
+    :param renditions: list of output option dicts, one per rendition (e.g.,
+                       `{'s': (320, 180)}` or `{'pix_fmt': 'gray', 'vf': 'crop=64:64'}`)
+    :param squeeze: False to return 4D data, defaults to True to remove the
+                    dimensions with length 1
+    :param progress: progress callback function, defaults to None
+    :param show_log: True to show FFmpeg log messages on the console,
+                     defaults to None (no show/capture)
+    :param sp_kwargs: dictionary with keywords passed to `subprocess.Popen()` call
+                      used to run the FFmpeg, defaults to None
+    :param options: FFmpeg options, append '_in' for input option names (see
+                    :doc:`options`). The output options apply to all the
+                    renditions, and the `vf` option filters the video before it
+                    is split into the renditions.
+    :return: frame rates and video frame data of the renditions, created by
+             `bytes_to_video` plugin hook
+
+    The video stream is decoded once and fed to all the renditions by the
+    `split` filter, which is significantly faster than calling :py:func:`read`
+    for each rendition.
+
+    """
+
+    # use user-specified map or default '0:V:0' map
+    output_map = options.pop("map", "0:V:0")
+    stream_spec = parse_map_option(output_map, input_file_id=0, parse_stream=True)
+    stream_type = stream_spec.get("stream_specifier", {}).get("stream_type", None)
+    if stream_type_to_media_type(stream_type) != "video":
+        raise ValueError("Mapped stream must be specified as a video stream.")
+
+    return media.read_renditions(
+        url,
+        renditions=[{**r, "map": output_map} for r in renditions],
+        squeeze=squeeze,
+        show_log=show_log,
+        progress=progress,
+        sp_kwargs=sp_kwargs,
+        **options,
+    )
+
+
 def write(
     url: (
         FFmpegInputUrlComposite
@@ -255,6 +316,7 @@ def filter(
     progress: ProgressCallable | None = None,
     show_log: bool | None = None,
     sp_kwargs: dict[str, Any] | None = None,
+    pool: FilterPool | None = None,
     **options,
 ) -> tuple[Fraction | int, RawDataBlob]:
     """Filter video frames.
@@ -268,11 +330,22 @@ def filter(
     :param sp_kwargs: dictionary with keywords passed to `subprocess.run()` or
                       `subprocess.Popen()` call used to run the FFmpeg, defaults
                       to None
+    :param pool: :py:class:`streams.FilterPool` to run a stateless SISO filter
+                 on a warm FFmpeg process, defaults to None (run a new FFmpeg
+                 process). ``progress``, ``show_log``, and ``sp_kwargs`` are
+                 ignored if pooled.
     :param options: FFmpeg options, append '_in' for input option names (see :doc:`options`)
     :return: output frame rate and video frame data, created by `bytes_to_video` plugin hook
 
     """
 
+    if pool is not None:
+        if extra_inputs is not None or extra_outputs is not None:
+            raise ValueError("Pooled filtering does not support extra inputs or outputs.")
+        return pool.filter(
+            expr, input_rate, input, media_type="video", squeeze=squeeze, **options
+        )
+
     if expr is not None:
         if extra_inputs is None and extra_outputs is None:
             # guaranteed SISO filtering
@@ -312,6 +385,8 @@ def detect(
     progress=None,
     show_log=None,
     scene_all_scores=False,
+    cache=None,
+    analysis_profile=None,
     **options,
 ):
     """detect video frame features
@@ -348,6 +423,14 @@ def detect(
     :type show_log: bool, optional
     :param scene_all_scores: (only for 'scene' feature) True to return scores for all frames, defaults to False
     :type scene_all_scores: bool, optional
+    :param cache: analysis cache to reuse the outcomes of the previous calls
+                  with the same input file and settings, defaults to None
+    :type cache: analyze.AnalysisCache, optional
+    :param analysis_profile: reduced-cost analysis profile (e.g., ``'fast'``
+                             to detect on a 320-pixel-wide 5-fps proxy), see
+                             :py:func:`analyze.run`, defaults to None (full
+                             resolution, every frame)
+    :type analysis_profile: str or dict, optional
     :param \**options: FFmpeg detector filter options. For a single-feature call, the FFmpeg filter options
         of the specified feature can be specified directly as keyword arguments. For a multiple-feature call,
         options for each individual FFmpeg filter can be specified with <feature>_options dict keyword argument.
@@ -452,6 +535,8 @@ def detect(
         time_units=time_units,
         progress=progress,
         show_log=show_log,
+        cache=cache,
+        analysis_profile=analysis_profile,
         **input_opts,
     )
 
@@ -0,0 +1,51 @@
+"""benchmark analyze.run() metadata parsers
+
+Compares the bulk decoder (default) against the per-line regular expression
+parser. The CPU time is of the Python process only (i.e., the parsing cost
+excluding FFmpeg's decoding and filtering).
+
+usage: python tests/_bench_analyze.py [duration_in_seconds] [repeat]
+"""
+
+import sys
+from time import perf_counter, process_time
+
+from ffmpegio import analyze
+
+audio_src = "aevalsrc='0.1*sin(2*PI*360*t)|0.1*sin(2*PI*440*t)':s=44100:d={}"
+video_src = "testsrc2=r=30:s=320x240:d={}"
+
+cases = {
+    "astats": (audio_src, lambda: [analyze.AStats()]),
+    "aspectralstats": (audio_src, lambda: [analyze.ASpectralStats()]),
+    "scdet+bbox": (
+        video_src,
+        lambda: [analyze.ScDet(all_scores=True), analyze.BBox()],
+    ),
+}
+
+
+def bench(src, make_loggers, parser, repeat):
+    best = (float("inf"), float("inf"))
+    for _ in range(repeat):
+        loggers = make_loggers()
+        t0, c0 = perf_counter(), process_time()
+        analyze.run(src, *loggers, f="lavfi", parser=parser)
+        best = min(best, (perf_counter() - t0, process_time() - c0))
+    return best, loggers
+
+
+if __name__ == "__main__":
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 60
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    print(f"{'case':<16}{'parser':<8}{'wall [s]':>10}{'cpu [s]':>10}")
+    for name, (src, make_loggers) in cases.items():
+        outputs = []
+        for parser in ("regex", "bulk"):
+            (wall, cpu), loggers = bench(
+                src.format(duration), make_loggers, parser, repeat
+            )
+            outputs.append(repr([l.output for l in loggers]))  # nan-safe
+            print(f"{name:<16}{parser:<8}{wall:>10.3f}{cpu:>10.3f}")
+        assert outputs[0] == outputs[1], f"{name}: parsers disagree"
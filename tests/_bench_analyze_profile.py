@@ -0,0 +1,88 @@
+"""benchmark analyze.run() reduced-cost analysis profiles
+
+Encodes a synthetic testsrc2 video whose colors are inverted every 5 seconds
+(i.e., a scene change every 5 seconds) and runs the video detectors on it
+with each of the predefined analysis profiles. Reported are the wall time,
+the speedup over the full analysis, the number of analyzed frames, the
+recall of the full analysis' scene changes (matched within the profile's
+frame interval), and the mean blur level.
+
+usage: python tests/_bench_analyze_profile.py [duration_in_seconds] [size]
+"""
+
+import sys
+from os import path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+import ffmpegio as ff
+from ffmpegio import analyze
+
+video_src = "testsrc2=r=30:s={}:d={},negate=enable='mod(floor(t/5),2)'"
+gop = 30  # keyframe interval in frames (1 second)
+
+
+def make_loggers():
+    return [
+        analyze.ScDet(),
+        analyze.BlackDetect(),
+        analyze.FreezeDetect(),
+        analyze.BBox(),
+        analyze.BlurDetect(),
+    ]
+
+
+def bench(url, profile):
+    loggers = make_loggers()
+    t0 = perf_counter()
+    analyze.run(url, *loggers, analysis_profile=profile)
+    return perf_counter() - t0, loggers
+
+
+def recall(ref, test, tol):
+    if not len(ref):
+        return float("nan")
+    return sum(any(abs(t - r) <= tol for t in test) for r in ref) / len(ref)
+
+
+def mean(x):
+    return sum(x) / len(x) if len(x) else float("nan")
+
+
+if __name__ == "__main__":
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 60
+    size = sys.argv[2] if len(sys.argv) > 2 else "1280x720"
+
+    with TemporaryDirectory() as tmpdir:
+        url = path.join(tmpdir, "testsrc.mp4")
+        ff.transcode(
+            video_src.format(size, duration),
+            url,
+            f_in="lavfi",
+            vcodec="libx264",
+            preset="ultrafast",
+            g=gop,
+        )
+
+        print(
+            f"{'profile':<12}{'wall [s]':>10}{'speedup':>10}{'frames':>8}"
+            f"{'scenes':>8}{'recall':>8}{'blur':>8}"
+        )
+        ref = None
+        for name, profile in analyze.analysis_profiles.items():
+            wall, (scdet, *_, blur) = bench(url, profile)
+            if ref is None:
+                ref = wall, scdet.output.time
+
+            # time resolution of the profile
+            tol = (
+                gop / 30
+                if profile.get("keyframes_only", False)
+                else 1 / profile.get("fps", 30)
+            )
+            print(
+                f"{name:<12}{wall:>10.3f}{ref[0] / wall:>10.2f}"
+                f"{len(blur.output.time):>8}{len(scdet.output.time):>8}"
+                f"{recall(ref[1], scdet.output.time, tol):>8.2f}"
+                f"{mean(blur.output.blur):>8.3f}"
+            )
@@ -0,0 +1,94 @@
+"""benchmark construction of very large filtergraphs
+
+Builds a per-segment trim/concat graph and an xstack mosaic with ~1k and ~10k
+filters by three methods:
+
+- ``operator``: ``fg = fg | chain``, a new graph for every chain (skipped above
+  2000 filters as its cost grows quadratically)
+- ``inplace``: ``fg |= chain`` (and ``fg.stack(..., inplace=True)``)
+- ``add_chain``: ``Graph.add_chain()`` builder
+
+usage: python tests/_bench_filtergraph_build.py [nfilters ...]
+"""
+
+import sys
+from time import perf_counter
+
+import ffmpegio.filtergraph as fgb
+
+
+def segments_operator(n):
+    fg = fgb.Graph()
+    for i in range(n):
+        fg = fg | f"[0:v]trim={i}:{i + 1},setpts=PTS-STARTPTS[s{i}]"
+    concat = f"{''.join(f'[s{i}]' for i in range(n))}concat=n={n}[out]"
+    return fg.stack(concat, auto_link=True)
+
+
+def segments_inplace(n):
+    fg = fgb.Graph()
+    for i in range(n):
+        fg |= f"[0:v]trim={i}:{i + 1},setpts=PTS-STARTPTS[s{i}]"
+    concat = f"{''.join(f'[s{i}]' for i in range(n))}concat=n={n}[out]"
+    fg.stack(concat, auto_link=True, inplace=True)
+    return fg
+
+
+def segments_add_chain(n):
+    fg = fgb.Graph()
+    for i in range(n):
+        fg.add_chain(f"trim={i}:{i + 1},setpts=PTS-STARTPTS", ["0:v"], [f"s{i}"])
+    fg.add_chain(f"concat=n={n}", [f"s{i}" for i in range(n)], ["out"])
+    return fg
+
+
+def mosaic_operator(n):
+    fg = fgb.Graph()
+    for i in range(n):
+        fg = fg | f"[{i}:v]scale=32:18[v{i}]"
+    xstack = f"{''.join(f'[v{i}]' for i in range(n))}xstack=inputs={n}[out]"
+    return fg.stack(xstack, auto_link=True)
+
+
+def mosaic_inplace(n):
+    fg = fgb.Graph()
+    for i in range(n):
+        fg |= f"[{i}:v]scale=32:18[v{i}]"
+    xstack = f"{''.join(f'[v{i}]' for i in range(n))}xstack=inputs={n}[out]"
+    fg.stack(xstack, auto_link=True, inplace=True)
+    return fg
+
+
+def mosaic_add_chain(n):
+    fg = fgb.Graph()
+    for i in range(n):
+        fg.add_chain("scale=32:18", [f"{i}:v"], [f"v{i}"])
+    fg.add_chain(f"xstack=inputs={n}", [f"v{i}" for i in range(n)], ["out"])
+    return fg
+
+
+cases = {
+    "segments": (2, [segments_operator, segments_inplace, segments_add_chain]),
+    "mosaic": (1, [mosaic_operator, mosaic_inplace, mosaic_add_chain]),
+}
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or [1000, 10000]
+
+    print(f"{'case':<10}{'filters':>8}{'method':>12}{'build [s]':>12}{'str [s]':>10}")
+    for name, (nfilters, funcs) in cases.items():
+        for size in sizes:
+            n = size // nfilters
+            exprs = []
+            for func in funcs:
+                method = func.__name__.split("_", 1)[1]
+                if method == "operator" and size > 2000:
+                    print(f"{name:<10}{size:>8}{method:>12}{'-':>12}{'-':>10}")
+                    continue
+                t0 = perf_counter()
+                fg = func(n)
+                t1 = perf_counter()
+                exprs.append(str(fg))
+                t2 = perf_counter()
+                print(f"{name:<10}{size:>8}{method:>12}{t1 - t0:>12.3f}{t2 - t1:>10.3f}")
+            assert all(expr == exprs[-1] for expr in exprs), f"{name}: graphs differ"
@@ -0,0 +1,85 @@
+"""benchmark filtergraph parse/compose throughput
+
+Constructs ``Graph`` objects from a small set of recurring filtergraph
+expressions and composes them back to ``str``, the pattern of a service
+building the same graphs over and over. ``cold`` clears the parse cache
+before every construction (i.e., the cost of an actual parse).
+
+usage: python tests/_bench_filtergraph_parse.py [iterations] [repeat]
+"""
+
+import sys
+from time import perf_counter
+
+import ffmpegio.filtergraph as fgb
+from ffmpegio.filtergraph import Graph
+
+exprs = [
+    "scale=1280:-2,format=yuv420p",
+    "[0:v]split=2[a][b];[a]crop=iw/2:ih:0:0,hflip[l];[b]crop=iw/2:ih:iw/2:0[r];[l][r]hstack=inputs=2[out]",
+    "sws_flags=lanczos;[0:v]scale=w=640:h=360:force_original_aspect_ratio=decrease,pad=640:360:(ow-iw)/2:(oh-ih)/2,setsar=1[v]",
+    "[0:a]aresample=48000,aformat=sample_fmts=fltp:channel_layouts=stereo,volume='0.5*(1+sin(t))':eval=frame[a]",
+    ";".join(f"[in{i}]scale=320:240,fps=30[out{i}]" for i in range(16)),
+]
+
+
+def bench(func, n, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = perf_counter()
+        for _ in range(n):
+            for expr in exprs:
+                func(expr)
+        best = min(best, perf_counter() - t0)
+    return n * len(exprs) / best
+
+
+def parse_cold(expr):
+    fgb.parse_cache_clear()
+    return Graph(expr)
+
+
+def compose_cold(expr):
+    fgb.parse_cache_clear()
+    return str(Graph(expr))
+
+
+graphs = {}
+
+
+def compose_repeat(expr):
+    # compose the same graph object over and over
+    fg = graphs.get(expr)
+    if fg is None:
+        fg = graphs[expr] = Graph(expr)
+    return str(fg)
+
+
+def compose_mutated(expr):
+    # compose the same graph object after modifying it
+    fg = graphs.get(expr)
+    if fg is None:
+        fg = graphs[expr] = Graph(expr)
+    fg.sws_flags = "bilinear" if fg.sws_flags != "bilinear" else None
+    return str(fg)
+
+
+cases = {
+    "parse (cold)": parse_cold,
+    "parse (cached)": Graph,
+    "parse+compose (cold)": compose_cold,
+    "parse+compose (cached)": lambda expr: str(Graph(expr)),
+    "compose (repeat)": compose_repeat,
+    "compose (mutated)": compose_mutated,
+}
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    for expr in exprs:  # sanity check: round-trip
+        assert Graph(str(Graph(expr))) == Graph(expr)
+
+    print(f"{'case':<24}{'graphs/s':>12}")
+    for name, func in cases.items():
+        print(f"{name:<24}{bench(func, n, repeat):>12.0f}")
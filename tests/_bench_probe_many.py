@@ -0,0 +1,46 @@
+"""benchmark probe.full_details_many() throughput
+
+Probes the test assets repeatedly, serially with probe.full_details() and
+concurrently with probe.full_details_many() for a range of job counts, and
+reports the throughput in files per second.
+
+usage: python tests/_bench_probe_many.py [number_of_files] [max_jobs]
+"""
+
+import os
+import sys
+from time import perf_counter
+
+from ffmpegio import probe
+
+assets = [
+    "tests/assets/testmulti-1m.mp4",
+    "tests/assets/testvideo-1m.mp4",
+    "tests/assets/testaudio-1m.mp3",
+    "tests/assets/ffmpeg-logo.png",
+]
+
+if __name__ == "__main__":
+    nfiles = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    max_jobs = int(sys.argv[2]) if len(sys.argv) > 2 else 2 * (os.cpu_count() or 1)
+    urls = [assets[i % len(assets)] for i in range(nfiles)]
+
+    print(f"{'method':<24}{'wall [s]':>10}{'files/s':>10}")
+
+    t0 = perf_counter()
+    serial = [probe.full_details(url) for url in urls]
+    wall = perf_counter() - t0
+    print(f"{'serial':<24}{wall:>10.3f}{nfiles / wall:>10.1f}")
+
+    jobs = 1
+    while jobs <= max_jobs:
+        for ordered in (True, False):
+            t0 = perf_counter()
+            results = list(probe.full_details_many(urls, jobs, ordered))
+            wall = perf_counter() - t0
+            name = f"jobs={jobs}{'' if ordered else ' (unordered)'}"
+            print(f"{name:<24}{wall:>10.3f}{nfiles / wall:>10.1f}")
+            assert not any(r.error for r in results)
+            results.sort(key=lambda r: r.index)
+            assert [r.info for r in results] == serial
+        jobs *= 2
@@ -1,3 +1,4 @@
+import os
 from pprint import pprint
 from ffmpegio import analyze, path as ffmpeg_path
 import logging
@@ -61,6 +62,257 @@ def test_astats():
     pprint(logger.output)
 
 
+def test_ebur128():
+    url = "tests/assets/testmulti-1m.mp4"
+    loggers = analyze.run(
+        url,
+        analyze.EBUR128(peak="sample+true"),
+        analyze.SilenceDetect(),
+        analyze.AStats(),
+        t=2,
+    )
+    out = loggers[0].output
+    assert len(out.time) == 20  # 100-ms frames
+    assert len(out.integrated) == len(out.time)
+    assert len(loggers[2].output.time) == len(out.time)
+    assert sorted(out.true_peaks) == [0, 1]
+
+    summary = loggers[0].summary
+    assert summary["integrated"] == out.integrated[-1]
+    assert summary["true_peak"] < 0 and summary["sample_peak"] <= summary["true_peak"]
+
+    assert analyze.EBUR128().summary == {}
+
+
+def test_iter_run():
+    url = "tests/assets/testmulti-1m.mp4"
+    logger = analyze.ScDet(all_scores=True)
+    times = []
+    for t, meta in analyze.iter_run(url, logger, t=1, time_units="frames"):
+        # logger is up to date with the yielded frame
+        assert logger.output.time[-1] == t
+        assert "scd.mafd" in meta
+        times.append(t)
+    assert times == list(logger.output.time)
+
+    # stop early
+    logger = analyze.ScDet(all_scores=True)
+    it = analyze.iter_run(url, logger)
+    next(it)
+    next(it)
+    it.close()
+    assert len(logger.output.time) == 2
+
+    # same result as run()
+    logger2 = analyze.ScDet(all_scores=True)
+    analyze.run(url, logger2, t=1, time_units="frames")
+    assert times == list(logger2.output.time)
+
+
+def test_iter_run_terminate(monkeypatch):
+    terminated = []
+
+    class Popen(analyze.fp.Popen):
+        def terminate(self):
+            terminated.append(self.pid)
+            super().terminate()
+
+    monkeypatch.setattr(analyze.fp, "Popen", Popen)
+    url = "tests/assets/testmulti-1m.mp4"
+
+    # FFmpeg exits on its own after its output is exhausted
+    for _ in range(5):
+        analyze.run(url, analyze.ScDet(), t=0.2)
+    assert not terminated
+
+    it = analyze.iter_run(url, analyze.ScDet(all_scores=True))
+    next(it)
+    it.close()
+    assert len(terminated) == 1
+
+
+@pytest.mark.parametrize(
+    "make_loggers",
+    [
+        lambda: [analyze.AStats(), analyze.ASpectralStats()],
+        lambda: [analyze.ScDet(all_scores=True), analyze.BBox()],
+    ],
+)
+def test_parsers(make_loggers):
+    url = "tests/assets/testmulti-1m.mp4"
+    outputs = []
+    for parser in ("regex", "bulk"):
+        loggers = make_loggers()
+        frames = list(analyze.iter_run(url, *loggers, t=1, parser=parser))
+        outputs.append(repr((frames, [l.output for l in loggers])))  # nan-safe
+    assert outputs[0] == outputs[1]
+
+    with pytest.raises(ValueError):
+        analyze.run(url, *make_loggers(), parser="json")
+
+
+def test_analysis_cache(monkeypatch):
+    import tempfile
+
+    url = "tests/assets/testmulti-1m.mp4"
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        cache = analyze.AnalysisCache(tmpdirname)
+        out = analyze.run(url, analyze.ScDet(all_scores=True), t=1, cache=cache)
+        assert len(cache) == 1
+
+        # repeated call is served from the cache without running FFmpeg
+        def no_ffmpeg(*_, **__):
+            raise AssertionError("FFmpeg should not run")
+
+        with monkeypatch.context() as m:
+            m.setattr(analyze, "iter_run", no_ffmpeg)
+            out2 = analyze.run(url, analyze.ScDet(all_scores=True), t=1, cache=cache)
+            assert out2[0].output == out[0].output
+
+            # a logger which already has results is keyed by its settings only
+            out3 = analyze.run(url, out[0], t=1, cache=cache)
+            assert out3[0].output == out2[0].output
+
+            # different settings or non-file input miss the cache
+            with pytest.raises(AssertionError):
+                analyze.run(url, analyze.ScDet(threshold=5), t=1, cache=cache)
+            with pytest.raises(AssertionError):
+                analyze.run(url, analyze.ScDet(), t=1, cache=cache)
+            with pytest.raises(AssertionError):
+                analyze.run(url, analyze.ScDet(), t=2, cache=cache)
+            with pytest.raises(AssertionError):
+                analyze.run("testsrc", analyze.ScDet(), f="lavfi", t=1, cache=cache)
+
+            # results of another cache format are not restored
+            m.setattr(analyze.AnalysisCache, "format_version", 0)
+            with pytest.raises(AssertionError):
+                analyze.run(url, analyze.ScDet(all_scores=True), t=1, cache=cache)
+
+        # least recently used result is evicted first
+        analyze.run(url, analyze.ScDet(), t=2, cache=cache)
+        analyze.run(url, analyze.ScDet(all_scores=True), t=1, cache=cache)  # touch
+        cache.evict(max(os.path.getsize(e.path) for e in os.scandir(tmpdirname)))
+        assert len(cache) == 1
+        with monkeypatch.context() as m:
+            m.setattr(analyze, "iter_run", no_ffmpeg)
+            analyze.run(url, analyze.ScDet(all_scores=True), t=1, cache=cache)
+
+
+def test_output_arrays():
+    np = pytest.importorskip("numpy")
+
+    url = "tests/assets/testmulti-1m.mp4"
+    scdet = analyze.ScDet(all_scores=True)
+    astats = analyze.AStats()
+    analyze.run(url, scdet, astats, t=1, time_units="frames")
+
+    out = scdet.output
+    arrays = scdet.output_arrays
+    assert arrays["time"].dtype == np.int64
+    i = np.argsort(arrays["time"])  # columns are in the logged order
+    assert np.array_equal(arrays["time"][i], out.time)
+    assert np.array_equal(arrays["score"][i], out.score)
+    assert np.array_equal(arrays["changed"][i].astype(bool), out.changed)
+
+    out = astats.output
+    arrays = astats.output_arrays
+    assert arrays["rms_level.1"].dtype == np.float64
+    assert np.array_equal(arrays["rms_level.1"], out.rms_level[1])
+    assert np.array_equal(arrays["peak_count.overall"], out.peak_count["overall"])
+    assert len(arrays["time"]) == len(out.time)
+
+    # interval loggers do not use the columns
+    assert analyze.BlackDetect().output_arrays == {}
+
+
+def test_analysis_profile():
+    url = "testsrc2=r=30:s=640x480:d=4"
+
+    (full,) = analyze.run(url, analyze.BBox(), f="lavfi", time_units="pts")
+    (fast,) = analyze.run(
+        url, analyze.BBox(), f="lavfi", time_units="pts", analysis_profile="fast"
+    )
+
+    # 5-fps proxy retains the original timestamps
+    assert len(fast.output.time) == 20
+    assert set(fast.output.time) <= set(full.output.time)
+    assert fast.output.position[0] == [0, 0, 320, 240]
+
+    (gray,) = analyze.run(
+        url,
+        analyze.BlurDetect(),
+        f="lavfi",
+        analysis_profile={"width": 160, "pix_fmt": "gray"},
+    )
+    assert len(gray.output.time) == 120
+
+    with pytest.raises(ValueError):
+        analyze.run(
+            url, analyze.BBox(), f="lavfi", time_units="frames", analysis_profile="fast"
+        )
+    with pytest.raises(ValueError):
+        analyze.run(url, analyze.BBox(), f="lavfi", analysis_profile={"height": 120})
+
+
+def test_iter_frames():
+    url = "tests/assets/testvideo-1m.mp4"
+    logger = analyze.ScDet(all_scores=True)
+    times = []
+    for t, meta, frame in analyze.iter_frames(
+        url, logger, width=64, pix_fmt="gray", t=2, time_units="pts"
+    ):
+        # logger has received the yielded frame's metadata
+        assert t in logger.output.time
+        assert frame["shape"][-2:] == (48, 64) and len(frame["buffer"]) == 48 * 64
+        times.append(t)
+    assert len(times) == 60
+
+    # single decode matches the separate detection and read
+    logger2 = analyze.ScDet(all_scores=True)
+    analyze.run(url, logger2, t=2, time_units="pts")
+    assert times == list(logger2.output.time)
+
+    # stop early
+    it = analyze.iter_frames(url, analyze.BlackFrame(), width=32, pix_fmt="gray")
+    next(it)
+    next(it)
+    it.close()
+
+    with pytest.raises(ValueError):
+        next(analyze.iter_frames(url, analyze.PSNR()))
+
+
+def test_score_quality():
+    pytest.importorskip("numpy")
+
+    url = "tests/assets/testvideo-1m.mp4"
+    encodes = ["tests/assets/testvideo-1m-lowres.mp4", url]
+
+    # one reference decode for both encodes
+    lowres, same = analyze.score_quality(url, encodes, ["psnr", "ssim"], t=0.5)
+    assert lowres.error is None and same.error is None
+    assert len(lowres.frames["psnr"]) == len(lowres.frames["ssim.y"]) == 15
+    assert lowres.aggregate["ssim"] < same.aggregate["ssim"] == 1.0
+    assert same.aggregate["mse"] == 0.0
+
+    # batches run concurrently and score the same
+    scores = analyze.score_quality(url, encodes, "psnr", batch_size=1, cores=2, t=0.5)
+    assert [s.aggregate["mse"] for s in scores] == [
+        lowres.aggregate["mse"],
+        same.aggregate["mse"],
+    ]
+
+    # failed batch is reported without failing the others
+    bad, good = analyze.score_quality(
+        url, ["nonexistent.mp4", url], "psnr", batch_size=1, t=0.1
+    )
+    assert bad.error is not None and bad.frames == {}
+    assert good.error is None
+
+    with pytest.raises(ValueError):
+        analyze.score_quality(url, encodes, ["vif"])
+
+
 if __name__ == "__main__":
     import logging
     import ffmpegio
@@ -1,5 +1,6 @@
 import logging
 import re
+import sys
 import tempfile
 from os import path
 
@@ -189,6 +190,43 @@ def test_read_fileobj():
         assert round(fs * T) == x["shape"][0]
 
 
+def test_read_nonseekable_fileobj():
+    import gc
+    import os
+    from threading import Thread
+
+    url = "tests/assets/testaudio-1m.mp3"
+    with open(url, "rb") as f:
+        data = f.read()
+    fs_ref, x_ref = audio.read(url)
+
+    def feed(fd):
+        with open(fd, "wb") as f:
+            try:
+                f.write(data)
+            except BrokenPipeError:
+                pass
+
+    # probed from the head, then the head is replayed to FFmpeg
+    for options in ({}, {"probesize_in": 65536}):
+        fd_r, fd_w = os.pipe()
+        Thread(target=feed, args=(fd_w,), daemon=True).start()
+        with open(fd_r, "rb") as f:
+            assert not f.seekable()
+            fs, x = audio.read(f, **options)
+            gc.collect()  # the reader wrapper must not close the file object
+            assert not f.closed
+        assert fs == fs_ref and x == x_ref
+
+    # partial read leaves the caller's file object open for further reading
+    fd_r, fd_w = os.pipe()
+    Thread(target=feed, args=(fd_w,), daemon=True).start()
+    with open(fd_r, "rb") as f:
+        audio.read(f, t=1)
+        gc.collect()
+        assert not f.closed
+
+
 def test_write_buffout():
 
     fs = 16000
@@ -215,6 +253,50 @@ def test_filter_empty():
     assert y["shape"] == (0, 1)
 
 
+def test_normalize_many():
+    urls = ["tests/assets/testaudio-1m.mp3", "tests/assets/testmulti-1m.mp4"]
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        outs = [path.join(tmpdirname, f"out{k}.wav") for k in range(len(urls) + 1)]
+        cache = path.join(tmpdirname, "stats.jsonl")
+        kws = dict(jobs=2, stats_cache=cache, i=-16, t_in=2, vn=None)
+
+        res = audio.normalize_many([*urls, "nonexistent.wav"], outs, **kws)
+        assert [r.error is None for r in res] == [True, True, False]
+        assert not any(r.cached for r in res)
+        assert res[0].analysis_time > 0 and res[0].transcode_time > 0
+        assert probe.audio_streams_basic(outs[0])[0]["sample_rate"] == 44100
+
+        # rerun reuses the measurements
+        res2 = audio.normalize_many(urls, outs[:2], overwrite=True, **kws)
+        assert all(r.cached and r.analysis_time == 0 for r in res2)
+        assert [r.stats for r in res2] == [r.stats for r in res[:2]]
+
+        with pytest.raises(ValueError):
+            audio.normalize_many(urls, outs[:1])
+
+
+def test_normalize_many_filter(monkeypatch):
+    transcoded = []
+
+    def transcode(url, out_url, **options):
+        transcoded.append(options)
+
+    monkeypatch.setattr(sys.modules["ffmpegio.transcode"], "transcode", transcode)
+
+    url = "tests/assets/testaudio-1m.mp3"
+    (res,) = audio.normalize_many(
+        [url], ["out.wav"], i=-16, dual_mono=True, linear=True, t_in=2
+    )
+    assert res.error is None
+
+    # second pass uses the same settings as the first pass
+    (options,) = transcoded
+    af = str(options["af"])
+    assert af.startswith("loudnorm=")
+    for opt in ("i=-16", "dual_mono=true", "linear=true", "measured_i="):
+        assert opt in af
+
+
 if __name__ == "__main__":
     import logging
 
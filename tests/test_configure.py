@@ -217,3 +217,56 @@ def test_resolve_raw_output_streams(
         args["global_options"] = {"filter_complex": filters_complex}
     out = configure.resolve_raw_output_streams(stream_opts, args, input_info)
     pprint(out)
+
+
+def test_init_media_read_probe_plan(monkeypatch):
+    from ffmpegio import probe
+
+    urls = []
+    query = probe.query
+
+    def counted_query(url, *args, **kwargs):
+        urls.append(url)
+        return query(url, *args, **kwargs)
+
+    monkeypatch.setattr(probe, "query", counted_query)
+
+    # one ffprobe run per input for all the output streams
+    args, _, output_info = configure.init_media_read(
+        [mul_url, aud_url], None, None, None, False
+    )
+    assert urls == [mul_url, aud_url]
+    assert [info["user_map"] for info in output_info] == [
+        "0:v:0",
+        "0:a:0",
+        "0:v:1",
+        "0:a:1",
+        "1:a:0",
+    ]
+
+    # file object input
+    urls.clear()
+    with open(aud_url, "rb") as f:
+        _, _, output_info = configure.init_media_read([f], None, None, None, False)
+        assert f.tell() == 0
+    assert urls == ["pipe:0"]
+    assert output_info[0]["raw_info"][2] == 44100
+
+
+def test_optimize_filtergraphs(monkeypatch):
+    vf = "null,scale=64:48,scale=64:48"
+    fc = "[0:v]split[a][b];[a]hflip[x];[b]hflip[y];[x][y]hstack[out]"
+
+    args = configure.init_media_read([vid_url], ["0:v:0"], {"vf": vf}, None, False)[0]
+    assert args["outputs"][0][1]["vf"] == vf
+
+    monkeypatch.setattr(configure, "OPTIMIZE_FILTERGRAPHS", True)
+    args = configure.init_media_read([vid_url], ["0:v:0"], {"vf": vf}, None, False)[0]
+    assert str(args["outputs"][0][1]["vf"]) == "scale=64:48"
+
+    args = configure.init_media_read(
+        [vid_url], ["[out]"], {"filter_complex": fc}, None, False
+    )[0]
+    assert [str(fg) for fg in args["global_options"]["filter_complex"]] == [
+        "[0:v]hflip,split=2[x][y];[x][y]hstack[out]"
+    ]
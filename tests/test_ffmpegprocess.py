@@ -1,4 +1,6 @@
 import logging
+import os
+
 from ffmpegio import configure, ffmpegprocess, utils
 
 # logging.basicConfig(level=logging.DEBUG)
@@ -125,3 +127,39 @@ def test_popen_progress():
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.DEBUG)
+
+
+def test_pipe_filtergraphs():
+    url = "tests/assets/testvideo-1m.mp4"
+
+    # longer than a single command-line argument may be on Linux (128 kB)
+    vf = "select=1" + "+0" * 70000 + ",scale=32:24"
+    args = {
+        "inputs": [(url, None)],
+        "outputs": [
+            ("-", {"vf": vf, "frames:v": 2, "f": "rawvideo", "pix_fmt": "rgb24"})
+        ],
+    }
+
+    new_args, pipes = ffmpegprocess._pipe_filtergraphs(args, 32768)
+    try:
+        assert args["outputs"][0][1]["vf"] == vf  # not modified
+        assert len(pipes) == 1 and pipes[0][2] == vf.encode()
+        opts = new_args["outputs"][0][1]
+        assert "vf" not in opts
+        assert opts[ffmpegprocess._script_option("vf")] == f"pipe:{pipes[0][0]}"
+    finally:
+        for fd_r, fd_w, _ in pipes:
+            os.close(fd_r)
+            os.close(fd_w)
+
+    out = ffmpegprocess.run(args, capture_log=True)
+    assert out.returncode == 0
+    assert len(out.stdout) == 2 * 24 * 32 * 3
+
+    with ffmpegprocess.Popen(args, capture_log=True) as proc:
+        assert len(proc.stdout.read()) == 2 * 24 * 32 * 3
+
+    # short filtergraph stays on the command line
+    args["outputs"][0][1]["vf"] = "scale=32:24"
+    assert ffmpegprocess._pipe_filtergraphs(args, 32768) == (args, [])
@@ -589,6 +589,72 @@ def test_ops(op, left, right, ret):
     assert (op(left, right)).compose() == ret
 
 
+def test_parse_cache():
+    expr = "[in]split[a][b];[a]scale=320:240[l];[b]hflip[r];[l][r]hstack[out]"
+    fgb.parse_cache_clear()
+    fg0 = fgb.Graph(expr)
+    fg1 = fgb.Graph(expr)
+
+    # parsed and composed once
+    assert fg0.compose() is fg1.compose()
+    assert str(fg0) == str(fg1) == fg0.compose(False, False)
+
+    # filters are shared
+    assert fg0[1][0] is fg1[1][0]
+    assert fgb.Chain("scale=320:240,hflip")[0] is fgb.Chain("scale=320:240")[0]
+
+    # copy-on-write: modifying one graph does not affect the other
+    fg0[1][0] = fgb.Filter("scale", 640, 480)
+    assert str(fg0) == expr.replace("320:240", "640:480")
+    assert str(fg1) == expr
+    fg2 = fg1.copy()
+    fg2.sws_flags = "lanczos"
+    assert str(fg2) == f"sws_flags=lanczos;{expr}"
+    fg2.links.rename("out", "out0")
+    assert str(fg2).endswith("[out0]")
+    fg2[2][0] = "vflip"
+    assert str(fg2).endswith("[b]vflip[r];[l][r]hstack[out0]")
+    assert str(fgb.Graph(expr)) == str(fg1) == expr
+
+
+def test_add_chain():
+    n = 3
+    fg = fgb.Graph()
+    segments = [
+        (fg.add_chain(f"trim={i}:{i + 1},setpts=PTS-STARTPTS", ["0:v"]), 1, 0)
+        for i in range(n)
+    ]
+    assert fg.add_chain(f"concat=n={n}", segments, ["out"]) == n
+    assert str(fg) == (
+        "[0:v]trim=0:1,setpts=PTS-STARTPTS[L0];[0:v]trim=1:2,setpts=PTS-STARTPTS[L1];"
+        "[0:v]trim=2:3,setpts=PTS-STARTPTS[L2];[L0][L1][L2]concat=n=3[out]"
+    )
+
+    # link by output label
+    fg.add_chain("split", ["out"], ["a", None])
+    assert str(fg).endswith("concat=n=3[out];[out]split[a]")
+
+    with pytest.raises(fgb.FiltergraphPadNotFoundError):
+        fg.add_chain("hflip", [(0, 1, 0)])  # already connected
+    with pytest.raises(fgb.Graph.Error):
+        fg.add_chain("hflip", outputs=["a"])  # duplicate label
+    assert len(fg) == n + 2
+
+    # in-place stacking produces the same graph as the operator
+    exprs = [f"[{i}:v]scale=32:18[v{i}]" for i in range(n)]
+    fg0 = fgb.Graph()
+    fg1 = fgb.Graph()
+    for expr in exprs:
+        fg0 = fg0 | expr
+        fg1 |= expr
+    assert str(fg0) == str(fg1)
+    fg2 = fg1
+    fg1 |= "[v0]hflip[v1]"
+    assert fg1 is fg2
+    assert str(fg1) == str(fg0 | "[v0]hflip[v1]")
+    assert str(fg1).endswith("[v2];[v3]hflip[v4]")
+
+
 def test_readme():
     """make sure readme example works as advertized"""
 
@@ -499,3 +499,41 @@ def test_combine(link_objs, cumsum_chains, res):
 )
 def test_pair_unconnected_labels(links, res):
     assert res == GraphLinks.pair_unconnected_labels(links)
+
+
+def test_merge():
+    links = GraphLinks(
+        {
+            "a": ((1, 0, 0), (0, 0, 0)),
+            "0:v": (((0, 0, 0),), None),
+            0: ((1, 0, 1), (0, 0, 1)),
+        }
+    )
+    other = GraphLinks(
+        {
+            "a": (None, (0, 0, 0)),
+            "0:v": (((0, 0, 0), (1, 0, 0)), None),
+            0: ((1, 0, 1), (0, 0, 1)),
+        }
+    )
+    mapping = links.merge(other, 2)
+    assert mapping == {"a": "a1", "0:v": "0:v", 0: 1}
+    assert links == {
+        "a": ((1, 0, 0), (0, 0, 0)),
+        "0:v": (((0, 0, 0), (2, 0, 0), (3, 0, 0)), None),
+        0: ((1, 0, 1), (0, 0, 1)),
+        "a1": (None, (2, 0, 0)),
+        1: ((3, 0, 1), (2, 0, 1)),
+    }
+
+    # the pad lookup tables follow every modification
+    assert links.find_inpad_label((3, 0, 0)) == "0:v"
+    assert links.find_outpad_label((2, 0, 0)) == "a1"
+    assert links.are_linked((1, 0, 0), (0, 0, 0))
+    assert links.are_linked((3, 0, 1), (2, 0, 1))
+    links.rename("a1", "b")
+    del links["a"]
+    assert links.find_outpad_label((2, 0, 0)) == "b"
+    assert links.find_inpad_label((1, 0, 0)) is None
+    assert links.find_outpad_label((0, 0, 0)) is None
+    assert not links.are_linked((1, 0, 0), (0, 0, 0))
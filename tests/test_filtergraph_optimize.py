@@ -0,0 +1,113 @@
+from hashlib import sha1
+
+import numpy as np
+import pytest
+
+import ffmpegio.filtergraph as fgb
+import ffmpegio.filtergraph.presets as presets
+from ffmpegio import audio, video
+
+url = "tests/assets/testvideo-1m.mp4"
+aurl = "tests/assets/testaudio-1m.mp3"
+
+
+def frame_hash(x):
+    return sha1(x["buffer"]).hexdigest()
+
+
+@pytest.mark.parametrize(
+    "expr, out",
+    [
+        ("null,hflip,null", "hflip"),
+        ("[in]null[a];[a]hflip[out]", "[in]hflip[out]"),
+        ("[in]hflip[a];[a]null[out]", "[in]hflip[out]"),
+        ("[in]null[out]", "[in]null[out]"),
+        ("format=yuv420p|rgb24,format=rgb24|gray", "format=rgb24"),
+        ("format=yuv420p,format=rgb24", "format=yuv420p,format=rgb24"),
+        ("scale=64:48,scale=64:48", "scale=64:48"),
+        ("scale=iw/2:-2,scale=iw/2:-2", "scale=iw/2:-2,scale=iw/2:-2"),
+        ("setsar=2,setsar=1/1", "setsar=1/1"),
+        (
+            "[in]split[a][b];[a]scale=64:48[o1];[b]scale=64:48[o2]",
+            "[in]scale=64:48,split=2[o1][o2]",
+        ),
+        (
+            "split=3[a][b][c];[a]hflip[x];[b]vflip[y];[c]hflip[z];[x][y][z]hstack=3",
+            "split=2[a][b];[a]hflip,split=2[x][z];[b]vflip[y];[x][y][z]hstack=3",
+        ),
+    ],
+)
+def test_optimize(expr, out):
+    fg = fgb.Graph(expr)
+    assert fg.optimize().compose() == fgb.Graph(out).compose()
+    assert str(fg) == str(fgb.Graph(expr))  # not modified
+
+
+def test_optimize_filter_id():
+    # filters with id may be targeted by commands
+    fc = fgb.Chain([fgb.Filter("hflip"), fgb.Filter(fgb.Filter("null"), filter_id="b")])
+    assert str(fgb.Graph(fc).optimize()) == "hflip,null@b"
+
+
+@pytest.mark.parametrize(
+    "expr, out",
+    [
+        ("scale=640:360,scale=320:180:flags=lanczos", "scale=320:180:flags=lanczos"),
+        (
+            "scale=320:180,crop=160:90:20:10",
+            "crop=w=160*iw/320:h=90*ih/180:x=20*iw/320:y=10*ih/180,scale=w=160:h=90",
+        ),
+    ],
+)
+def test_optimize_approximate(expr, out):
+    fg = fgb.Graph(expr)
+    assert fg.optimize().compose() == fg.compose()
+    assert fg.optimize(approximate=True).compose() == fgb.Graph(out).compose()
+
+
+@pytest.mark.parametrize(
+    "vf",
+    [
+        presets.filter_video_basic(scale="64x48", flip="horizontal")
+        + "null"
+        + "format=yuv420p|rgb24"
+        + "format=rgb24",
+        "split=3[a][b][c];[a]scale=64:48,hflip[x];[b]scale=64:48,vflip[y];"
+        "[c]scale=64:48,hflip[z];[x][y][z]hstack=3",
+        "scale=64:48,setsar=2,setsar=1,split[a][b];[a]null[x];[b]null[y];[x][y]vstack",
+    ],
+)
+def test_optimize_video_output(vf):
+    fg = fgb.as_filtergraph(vf)
+    opt = fg.optimize()
+    assert len(list(opt.iter_chains())) <= len(list(fg.iter_chains()))
+    assert str(opt) != str(fg)
+
+    _, x = video.read(url, vframes=3, vf=fg)
+    _, y = video.read(url, vframes=3, vf=opt)
+    assert x["shape"] == y["shape"]
+    assert frame_hash(x) == frame_hash(y)
+
+    # approximate: the same output shape
+    _, z = video.read(url, vframes=3, vf=fg.optimize(approximate=True))
+    assert x["shape"] == z["shape"]
+
+
+def test_optimize_audio_output():
+    af = "anull,aformat=sample_fmts=flt,aformat=sample_fmts=flt,volume=0.5,anull"
+    fg = fgb.Graph(af)
+    opt = fg.optimize()
+    assert str(opt) == "aformat=sample_fmts=flt,volume=0.5"
+
+    _, x = audio.read(aurl, t=1, af=fg)
+    _, y = audio.read(aurl, t=1, af=opt)
+    assert frame_hash(x) == frame_hash(y)
+
+
+def test_optimize_approximate_output():
+    vf = "scale=320:180,crop=160:90:20:10"
+    _, x = video.read(url, vframes=3, vf=vf)
+    _, y = video.read(url, vframes=3, vf=fgb.Graph(vf).optimize(approximate=True))
+    assert x["shape"] == y["shape"]
+    x, y = (np.frombuffer(a["buffer"], a["dtype"]).astype(float) for a in (x, y))
+    assert np.abs(x - y).mean() < 8
@@ -0,0 +1,71 @@
+import os
+
+import pytest
+
+import ffmpegio.filtergraph as fgb
+from ffmpegio import audio, configure, video
+
+url = "tests/assets/testvideo-1m.mp4"
+aurl = "tests/assets/testaudio-1m.mp3"
+
+
+def test_instrument():
+    prof = fgb.FilterProfile()
+    fg = prof.instrument("[0:v]split[a][b];[a]hflip[x];[b]vflip[y];[x][y]hstack[out]")
+    meta = [f"metadata@{tag}=mode=print:key=lavfi.bench.start_time" for tag in prof._units]
+    assert str(fg) == (
+        f"[0:v]split[a][b];[a]bench=start,hflip,{meta[0]},bench=stop[x];"
+        f"[b]bench=start,vflip,{meta[1]},bench=stop[y];[x][y]hstack[out]"
+    )
+    assert [(g, i) for g, i, _ in prof.unprofiled] == [(0, (0, 0)), (0, (3, 0))]
+
+    prof = fgb.FilterProfile("chain")
+    fg = prof.instrument("[in]aformat=sample_fmts=flt,volume=0.5[out]")
+    (tag,) = prof._units
+    assert str(fg) == (
+        "[in]abench=start,aformat=sample_fmts=flt,volume=0.5,"
+        f"ametadata@{tag}=mode=print:key=lavfi.bench.start_time,abench=stop[out]"
+    )
+
+
+def test_parse_log():
+    prof = fgb.FilterProfile(percentiles=[50])
+    prof.instrument("hflip,vflip")
+    t0, t1 = prof._units
+    log = []
+    for i, (t, u) in enumerate([(0.001, 0.002), (0.003, 0.004), (0.002, 0.009)]):
+        log += [
+            f"[{t0} @ 0x55a0] frame:{i}    pts:{i}       pts_time:{i/25}",
+            f"[{t0} @ 0x55a0] lavfi.bench.start_time=1792368809762076",
+            f"[bench @ 0x55b0] t:{t:f} avg:0.0 max:0.0 min:0.0",
+            f"[{t1} @ 0x56a0] frame:{i}    pts:{i}       pts_time:{i/25}",
+            f"[bench @ 0x56b0] t:{u:f} avg:0.0 max:0.0 min:0.0",
+            "[bench @ 0x57b0] t:1.000000 avg:0.0 max:0.0 min:0.0",  # not profiled
+        ]
+    prof.parse_log("\n".join(log))
+
+    t_vflip, t_hflip = prof.timings  # most time-consuming first
+    assert str(t_hflip.filter) == "hflip" and t_hflip.index == (0, 0)
+    assert t_hflip.frames == 3
+    assert t_hflip.total == pytest.approx(0.006)
+    assert t_hflip.mean == pytest.approx(0.002)
+    assert t_hflip.max == pytest.approx(0.003)
+    assert t_hflip.percentiles == {50: pytest.approx(0.002)}
+    assert t_vflip.total == pytest.approx(0.015)
+    assert "vflip" in str(prof)
+
+
+def test_profile_filters():
+    ffreport = os.environ.get("FFREPORT", None)
+    with fgb.profile_filters() as prof:
+        assert configure.FILTERGRAPH_PROFILER is prof
+        video.read(url, vframes=5, vf="scale=64:48,hflip")
+        audio.read(aurl, t=0.5, af="volume=0.5")
+    assert configure.FILTERGRAPH_PROFILER is None
+    assert os.environ.get("FFREPORT", None) == ffreport
+
+    timings = {str(t.filter): t for t in prof.timings}
+    assert set(timings) == {"scale=64:48", "hflip", "volume=0.5"}
+    assert timings["hflip"].frames >= 5
+    assert timings["volume=0.5"].frames > 0
+    assert all(t.total > 0 for t in timings.values())
@@ -40,6 +40,29 @@ def test_media_read_filter_complex():
     print([(k, x["shape"], x["dtype"]) for k, x in data.items()])
 
 
+def test_media_read_renditions():
+    rates, data = ff.media.read_renditions(
+        url,
+        renditions=[
+            {"map": "0:v:0", "s": (64, 48)},
+            {"map": "0:v:0", "pix_fmt": "gray"},
+            {"map": "0:a:0", "ar": 8000},
+            {"map": "0:a:0", "af": "volume=0.5", "sample_fmt": "s16"},
+        ],
+        t=1,
+    )
+    assert rates[2:] == [8000, rates[3]]
+    assert data[0]["shape"][1:] == (48, 64, 3)
+    assert data[1]["shape"][-1] == 1
+    assert data[0]["shape"][0] == data[1]["shape"][0]
+    assert data[2]["shape"][0] == 8000
+    assert data[3]["shape"][0] == rates[3]  # all samples of larger stream
+    assert data[3]["dtype"] == "<i2"
+
+    with pytest.raises(ValueError):
+        ff.media.read_renditions(url, renditions=[{"map": "0:0"}])
+
+
 def test_media_write():
     fs, x = ff.audio.read("tests/assets/testaudio-1m.mp3")
 
@@ -3,6 +3,8 @@ import logging
 logging.basicConfig(level=logging.DEBUG)
 
 import ffmpegio.probe as probe
+import pytest
+from fractions import Fraction
 
 # print(
 #     probe.inquire(
@@ -135,6 +137,183 @@ def test_packets():
     print(info)
 
 
+def test_iter_frames():
+    url = "tests/assets/testmulti-1m.mp4"
+
+    # same as frames()
+    info = probe.frames(url, streams="a:0", intervals=10)
+    assert list(probe.iter_frames(url, streams="a:0", intervals=10)) == info
+
+    info = list(
+        probe.iter_frames(
+            url, ["pts_time", "key_frame"], "v:0", intervals=3, accurate_time=True
+        )
+    )
+    assert set(info[0]) == {"stream_index", "pts_time", "key_frame"}
+    assert info[1]["pts_time"] == Fraction(1001, 15000)
+
+    # from bytes
+    with open("tests/assets/testaudio-1m.mp3", "rb") as f:
+        assert len(list(probe.iter_packets(f.read(), "size", intervals=1))) > 0
+
+    # stop early
+    it = probe.iter_packets(url)
+    next(it)
+    it.close()
+
+
+def test_frames_array():
+    np = pytest.importorskip("numpy")
+
+    url = "tests/assets/testmulti-1m.mp4"
+    info = probe.packets(url, ["size", "flags", "pts_time"], "v:0")
+    out = probe.packets_array(url, ["size", "flags", "pts_time"], "v:0")
+    assert out["size"].dtype == np.int64
+    assert out["size"].tolist() == [d["size"] for d in info]
+    assert out["flags"].tolist() == [d["flags"] for d in info]
+
+    pts_time = probe.frames_array(url, "pts_time", "v:0", accurate_time=True)
+    ref = probe.frames(url, "pts_time", "v:0", accurate_time=True)
+    assert np.allclose(pts_time, [float(t) for t in ref])
+
+    out = probe.frames_array(url, streams="v:0", intervals=1)
+    assert out["pix_fmt"][0] == "yuv444p"
+    assert np.isnan(out["pkt_dts"]).any()  # N/A
+
+    with pytest.raises(ValueError):
+        probe.frames_array(url, "not_an_entry", "v:0", intervals=1)
+
+
+def test_bitrate_profile():
+    np = pytest.importorskip("numpy")
+
+    url = "tests/assets/testmulti-1m.mp4"
+    size = probe.packets_array(url, "size", "v:0")
+
+    out = probe.bitrate_profile(url, window=2.0, peak_window=6.0)
+    assert out.time[0] == 0.0 and np.all(np.diff(out.time) == 2.0)
+    assert np.isclose(out.bitrate.sum() * 2.0, size.sum() * 8)
+    assert out.peak >= out.bitrate.max() / 3
+    bitrate = probe.query(url, "v:0", fields=("bit_rate",))[0]["bit_rate"]
+    assert abs(out.average - bitrate) / bitrate < 0.01
+
+
+def test_gop_structure():
+    np = pytest.importorskip("numpy")
+
+    url = "tests/assets/testmulti-1m.mp4"
+    flags = probe.packets_array(url, ["flags", "pts_time"], "v:0")
+    key = np.array([f.startswith("K") for f in flags["flags"]])
+
+    out = probe.gop_structure(url)
+    assert np.array_equal(out.keyframe_time, flags["pts_time"][key])
+    assert out.length.sum() == len(key) - np.argmax(key)
+    assert np.allclose(out.interval, np.diff(out.keyframe_time))
+    lengths, counts = out.histogram
+    assert counts.sum() == len(out.length)
+
+
+def test_probe_many():
+    urls = [
+        "tests/assets/testmulti-1m.mp4",
+        "tests/assets/nonexistent.mp4",
+        "tests/assets/testaudio-1m.mp3",
+    ]
+
+    results = list(probe.full_details_many(urls, jobs=2))
+    assert [r.index for r in results] == [0, 1, 2]
+    assert results[0].info == probe.full_details(urls[0])
+    assert results[1].info is None and results[1].error is not None
+    assert results[2].error is None
+
+    results = list(probe.query_many(iter(urls * 3), "a:0", ["codec_name"], 2, False))
+    assert sorted(r.index for r in results) == list(range(9))
+    assert all(r.info == [{"codec_name": "aac"}] for r in results if r.index == 3)
+
+    # stop early
+    it = probe.full_details_many(urls * 10, jobs=1)
+    next(it)
+    it.close()
+
+
+def test_buffer_windows(monkeypatch):
+    url = "tests/assets/testmulti-1m.mp4"  # moov box at the end
+    with open(url, "rb") as f:
+        data = f.read()
+
+    # moov relocated ahead of mdat: complete stream info from the pipe
+    assert probe.query(data, True, ["pix_fmt"]) == probe.query(url, True, ["pix_fmt"])
+
+    sizes = []
+    ffprobe = probe.ffprobe
+
+    def counted_ffprobe(args, **kwargs):
+        sizes.append(len(kwargs["input"]))
+        return ffprobe(args, **kwargs)
+
+    monkeypatch.setattr(probe, "ffprobe", counted_ffprobe)
+
+    # only a bounded prefix is piped in
+    probe.run(data, {"stream": ["codec_name"]}, probesize=100000)
+    assert sizes[0] < len(data)
+
+    # window grows until the stream info is complete or the whole data is used
+    sizes.clear()
+    probe.run(data, {"stream": ["pix_fmt"]}, probesize=32)
+    assert sizes == sorted(sizes) and sizes[-1] == len(data)
+
+
+@pytest.mark.parametrize(
+    "ext,options",
+    [
+        ("wav", {"c:a": "pcm_s16le"}),
+        ("wav", {"c:a": "pcm_f32le", "ac": 6}),
+        ("flac", {"sample_fmt": "s32"}),
+        ("mp4", {}),
+        ("mov", {"c:v": "libx264", "an": None}),
+        ("mkv", {}),
+        ("webm", {}),
+        ("y4m", {"pix_fmt": "yuv444p", "an": None}),
+    ],
+)
+def test_basic_from_headers(tmp_path, monkeypatch, ext, options):
+    from ffmpegio import _headers, ffmpegprocess
+
+    url = str(tmp_path / f"test.{ext}")
+    inputs = [
+        ("testsrc=r=30000/1001:d=0.5:s=160x120", {"f": "lavfi"}),
+        ("sine=d=0.5:r=44100", {"f": "lavfi"}),
+    ]
+    if ext in ("wav", "flac"):
+        inputs = inputs[1:]
+    ffmpegprocess.run({"inputs": inputs, "outputs": [(url, options)]}, overwrite=True)
+
+    def run_all():
+        out = []
+        for func in (
+            probe.format_basic,
+            probe.streams_basic,
+            probe.video_streams_basic,
+            probe.audio_streams_basic,
+        ):
+            try:
+                out.append(func(url))
+            except ValueError as e:  # no video/audio stream
+                out.append(str(e))
+        return out
+
+    native = run_all()
+
+    # the container headers alone resolve the format and streams_basic queries
+    with monkeypatch.context() as m:
+        m.setattr(probe, "query", None)
+        assert native[0] == probe.format_basic(url)
+        assert native[1] == probe.streams_basic(url)
+
+    monkeypatch.setattr(_headers, "probe", lambda path: None)
+    assert native == run_all()
+
+
 if __name__ == "__main__":
     test_all()
     pass
@@ -0,0 +1,72 @@
+import pytest
+
+import ffmpegio as ff
+from ffmpegio.streams.latency import LatencyMonitor
+
+
+def test_latency_monitor():
+    mon = LatencyMonitor()
+    mon.set_rates(30, 15)  # 2:1 decimation
+
+    for i in range(4):
+        mon.on_write(1, timestamp=i)
+    mon.on_read(1, timestamp=10)  # completes 2 input frames
+    assert mon.latencies == [10, 9]
+    mon.on_read(1, timestamp=20)
+    assert mon.latencies == [10, 9, 18, 17]
+
+    s = mon.summary()
+    assert s["count"] == 4 and s["min"] == 9 and s["max"] == 18
+    assert s["median"] == 10
+
+    counts, edges = mon.histogram(3)
+    assert counts == [2, 0, 2]
+    assert len(edges) == 4 and edges[0] == 9 and edges[-1] == 18
+
+    counts, edges = mon.histogram([0, 10, 20])
+    assert counts == [1, 3]
+
+    with pytest.raises(ValueError):
+        mon.histogram([1, 0])
+
+    mon.reset()
+    assert mon.summary()["count"] == 0
+
+
+def test_low_latency_filter():
+    w, h = 32, 24
+    frame = {"buffer": bytes(w * h * 3), "shape": (1, h, w, 3), "dtype": "|u1"}
+
+    with ff.open("hflip", "fv", 30, blocksize=1, low_latency=True) as f:
+        for _ in range(10):
+            f.write(frame)
+            assert f.read(1)["shape"] == (1, h, w, 3)
+
+        args = f._args["ffmpeg_args"]
+        in_opts = args["inputs"][0][1]
+        assert in_opts["probesize"] == 32 and in_opts["analyzeduration"] == 0
+        assert "fflags" not in in_opts  # nobuffer drops the probed raw frames
+        assert args["outputs"][0][1]["flush_packets"] == 1
+        assert f.latency.summary()["count"] == 10
+
+    with ff.open("hflip", "fv", 30) as f:
+        assert f.latency is None
+
+
+def test_low_latency_reader():
+    def read_all(**kwargs):
+        with ff.open(url, "rv", t=2, **kwargs) as f:
+            n = 0
+            while True:
+                frames = f.read(30)
+                if not frames["shape"][0]:
+                    break
+                n += frames["shape"][0]
+            in_opts = f._args["ffmpeg_args"]["inputs"][0][1]
+            return n, f.latency, in_opts
+
+    url = "tests/assets/testvideo-1m.mp4"
+    n, latency, in_opts = read_all(low_latency=True)
+    assert n == read_all()[0] == 60
+    assert latency is None  # no written blocks to measure
+    assert in_opts["probesize"] == 32 and "fflags" not in in_opts
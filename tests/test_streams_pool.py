@@ -0,0 +1,79 @@
+from concurrent.futures import ThreadPoolExecutor
+from time import sleep
+
+import numpy as np
+
+import ffmpegio as ff
+from ffmpegio.streams import FilterPool
+
+
+def _video(i, n=2, h=24, w=32):
+    x = np.full((n, h, w, 3), i, np.uint8)
+    x[:, :, 0, :] = 255 - i
+    return {"buffer": x.tobytes(), "shape": x.shape, "dtype": x.dtype.str}
+
+
+def _to_numpy(blob):
+    return np.frombuffer(blob["buffer"], blob["dtype"]).reshape(blob["shape"])
+
+
+def test_video_filter_pool():
+    with FilterPool(idle_timeout=None) as pool:
+        for i in range(5):
+            x = _video(i)
+            r, y = ff.video.filter("hflip", 30, x, pool=pool)
+            assert r == 30
+            assert np.array_equal(_to_numpy(y), _to_numpy(x)[:, :, ::-1, :])
+        assert len(pool) == 1
+
+        # different input format starts another process
+        ff.video.filter("hflip", 30, _video(0, h=16), pool=pool)
+        assert len(pool) == 2
+
+        assert pool.evict_idle(0) == 2
+        assert len(pool) == 0
+
+
+def test_filter_pool_idle_reaper():
+    with FilterPool(idle_timeout=0.5) as pool:
+        ff.video.filter("hflip", 30, _video(0), pool=pool)
+        assert len(pool) == 1
+        sleep(2.5)  # reaper checks every second
+        assert len(pool) == 0
+
+
+def test_video_filter_pool_concurrent():
+    def job(i):
+        x = _video(i, n=i % 3 + 1)
+        _, y = ff.video.filter("hflip", 30, x, pool=pool, squeeze=False)
+        return np.array_equal(_to_numpy(y), _to_numpy(x)[:, :, ::-1, :])
+
+    with FilterPool(max_workers=2) as pool:
+        with ThreadPoolExecutor(4) as executor:
+            assert all(executor.map(job, range(24)))
+        assert len(pool) <= 2
+
+
+def test_audio_filter_pool():
+    x = np.arange(-3000, 3000, dtype=np.int16).reshape(-1, 2)
+    x = {"buffer": x.tobytes(), "shape": x.shape, "dtype": x.dtype.str}
+    r0, y0 = ff.audio.filter("volume=0.5", 8000, x)
+    with FilterPool() as pool:
+        for _ in range(3):
+            r, y = ff.audio.filter("volume=0.5", 8000, x, pool=pool)
+            assert r == r0
+            assert y["shape"] == y0["shape"]
+            assert y["buffer"] == y0["buffer"]
+
+
+def test_image_filter_pool():
+    x = _video(10, n=1)
+    x = {**x, "shape": x["shape"][1:]}
+    with FilterPool() as pool:
+        y = ff.image.filter("hflip", x, pool=pool)
+        z = ff.image.filter("format=gray", x, pool=pool)
+    assert np.array_equal(_to_numpy(y), _to_numpy(x)[:, ::-1, :])
+
+    # same output shapes as without the pool
+    assert y["shape"] == ff.image.filter("hflip", x)["shape"] == (24, 32, 3)
+    assert z["shape"] == ff.image.filter("format=gray", x)["shape"] == (24, 32)
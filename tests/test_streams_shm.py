@@ -0,0 +1,99 @@
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import sha1
+
+import pytest
+
+import ffmpegio as ff
+from ffmpegio.streams import SharedFrameRing, SharedMemoryFFmpegReader
+
+url = "tests/assets/testmulti-1m.mp4"
+
+_ring = None  # worker's ring buffer
+
+
+def _attach(spec):
+    global _ring
+    _ring = SharedFrameRing.attach(spec)
+
+
+def _work(slot, n):
+    with _ring.view(slot, n) as buf:
+        digest = sha1(buf).hexdigest()
+    _ring.release(slot)
+    return digest
+
+
+def test_shared_frame_ring():
+    with SharedFrameRing.create(3, 2, (4, 5, 3), "|u1") as ring:
+        assert ring.slot_nbytes == 2 * 4 * 5 * 3
+        slots = [ring.acquire() for _ in range(3)]
+        assert slots == [0, 1, 2] and ring.num_in_use == 3
+
+        with ring.view(1) as buf:
+            buf[:] = bytes(range(len(buf)))
+
+        # attach as a worker would
+        with SharedFrameRing.attach(ring.spec) as worker:
+            with worker.view(1, 1) as buf:
+                assert bytes(buf) == bytes(range(60))
+            worker.release(1)
+
+        assert not ring.in_use(1)
+        assert ring.acquire() == 1
+
+
+def test_shared_memory_reader():
+    fs, ref = ff.video.read(url, t=1, pix_fmt="gray")
+    nref = ref["shape"][0]
+
+    frames = []
+    with ff.open(url, "rv", t=1, pix_fmt="gray", shm_slots=2, blocksize=4) as reader:
+        assert isinstance(reader, SharedMemoryFFmpegReader)
+        ring = reader.ring
+        for slot, n in reader:
+            assert n <= 4
+            with ring.view(slot, n) as buf:
+                frames.append(bytes(buf))
+            reader.release(slot)
+        with pytest.raises(ff.FFmpegioError):
+            reader.read(1)
+
+    assert reader.ring is None
+    assert b"".join(frames) == ref["buffer"]
+    assert len(frames) == -(-nref // 4)
+
+
+def test_shared_memory_reader_early_close():
+    with ff.open(url, "rv", shm_slots=2) as reader:
+        slot, n = reader.read_slot()
+        assert n == 1
+    assert reader.closed
+
+
+def test_shared_memory_reader_invalid_slots(monkeypatch):
+    def popen(*args, **kwargs):
+        raise AssertionError("FFmpeg must not be started")
+
+    monkeypatch.setattr(ff.ffmpegprocess, "Popen", popen)
+    with pytest.raises(ValueError):
+        ff.open(url, "rv", shm_slots=0)
+
+
+def test_shared_memory_reader_workers():
+    fs, ref = ff.video.read(url, t=1, pix_fmt="gray")
+    nbytes = len(ref["buffer"]) // ref["shape"][0]
+    expected = [
+        sha1(ref["buffer"][i : i + 3 * nbytes]).hexdigest()
+        for i in range(0, len(ref["buffer"]), 3 * nbytes)
+    ]
+
+    with ff.open(url, "rv", t=1, pix_fmt="gray", shm_slots=4, blocksize=3) as reader:
+        with ProcessPoolExecutor(
+            2, mp.get_context("spawn"), _attach, (reader.ring.spec,)
+        ) as executor:
+            futures = [executor.submit(_work, *item) for item in reader]
+            digests = [f.result() for f in futures]
+        assert reader.ring.num_in_use == 0
+
+    assert digests == expected
@@ -86,6 +86,26 @@ def test_read():
     # assert np.array_equal(D, C)
 
 
+def test_read_renditions():
+    url = "tests/assets/testvideo-1m.mp4"
+
+    renditions = [
+        {"s": (64, 48)},
+        {"s": (32, 24), "pix_fmt": "gray"},
+        {"vf": "crop=100:50"},
+    ]
+    rates, data = video.read_renditions(url, renditions, vframes=3, vf="hflip")
+    assert len(rates) == len(data) == 3
+    assert [x["shape"] for x in data] == [(3, 48, 64, 3), (3, 24, 32), (3, 50, 100, 3)]
+
+    # identical to reading each rendition separately
+    for opts, x in zip(renditions, data):
+        vf = ",".join(["hflip", opts.pop("vf")] if "vf" in opts else ["hflip"])
+        fs, y = video.read(url, vframes=3, vf=vf, **opts)
+        assert rates[0] == fs
+        assert x["buffer"] == y["buffer"]
+
+
 def test_filter():
     r_in, input = video.create("life", life_color="Red", t_in=1)
     print("input", input["shape"], input["dtype"])